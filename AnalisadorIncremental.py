@@ -0,0 +1,237 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from AnalisadorLexico import AnalisadorLexico, IndiceLinhas, Token, TokenType
+from AnalisadorSLR import AnalisadorSLR
+from ast_nodes import *
+
+class DivisorDeclaracoes:
+    """Reconhece, token a token, onde começa cada declaração de topo.
+
+    Uma declaração começa em 'funcao' ou num 'inicio' fora de qualquer bloco
+    (e que não seja o corpo de uma função já aberta); os pares inicio/fim são
+    contados para saber quando a declaração se fecha.
+    """
+    __slots__ = ('profundidade', 'cabecalho')
+
+    def __init__(self, estado: Tuple[int, bool] = (0, False)):
+        self.profundidade, self.cabecalho = estado
+
+    @property
+    def estado(self) -> Tuple[int, bool]:
+        return self.profundidade, self.cabecalho
+
+    def inicia(self, tipo: TokenType) -> bool:
+        """Consome o tipo do próximo token; True se ele abre uma declaração"""
+        if tipo == TokenType.FUNCAO:
+            self.profundidade = 0
+            self.cabecalho = True
+            return True
+        if tipo == TokenType.INICIO:
+            nova = self.profundidade == 0 and not self.cabecalho
+            self.profundidade += 1
+            self.cabecalho = False
+            return nova
+        if tipo == TokenType.FIM and self.profundidade:
+            self.profundidade -= 1
+        return False
+
+def analisar_declaracao(tokens: Iterable[Token], quantidade: int, eof: Token):
+    """Analisa uma declaração de topo isolada; devolve (declaração ou None, parser).
+
+    tokens traz os quantidade tokens da declaração seguidos do primeiro token
+    da seguinte (ou do EOF), o mesmo que o parser veria no arquivo inteiro.
+    Um erro depois desse ponto pertence à declaração seguinte e é ignorado.
+    """
+    declaracoes = []
+
+    def fluxo():
+        for token in tokens:
+            yield token
+            if token.tipo == TokenType.EOF:
+                return
+        # Com a declaração já entregue, o erro no EOF é descartado e não
+        # precisa do índice de linhas
+        yield Token(TokenType.EOF, '', eof.inicio, IndiceLinhas()) if declaracoes else eof
+
+    parser = AnalisadorSLR(fluxo(), ao_declarar=declaracoes.append, max_erros=1)
+    parser.analisar()
+    if len(declaracoes) == 1 and parser.pos >= quantidade:
+        return declaracoes[0], parser
+    return None, parser
+
+@dataclass(slots=True)
+class Segmento:
+    """Trecho do código com uma declaração de topo.
+
+    Vai do fim do último token do segmento anterior até o fim do seu último
+    token. Os tokens guardam (tipo, lexema, offset relativo a inicio), de modo
+    que uma edição antes do segmento só desloca inicio e fim.
+    """
+    inicio: int
+    fim: int
+    tokens: List[Tuple[TokenType, str, int]] = field(default_factory=list)
+    erros_lexicos: int = 0
+    estado: Tuple[int, bool] = (0, False)  # do DivisorDeclaracoes após o último token
+    no: object = None  # declaração reconhecida; None se houve erro (ou no segmento final, sem tokens)
+
+class AnalisadorIncremental:
+    """Mantém tokens e AST de um código que é editado aos poucos.
+
+    O código é dividido em segmentos, um por declaração de topo, e o último
+    segmento (sem tokens) cobre o que sobra até o fim do texto. Uma edição
+    relê só a partir do segmento que ela toca e para assim que uma fronteira
+    de declaração coincide com a de um segmento antigo fora da edição; daí em
+    diante tokens e subárvores são reaproveitados. Cada segmento é analisado
+    sozinho, o que dá o mesmo resultado da análise do arquivo inteiro porque
+    o estado do parser entre duas declarações de topo é sempre o mesmo.
+    """
+
+    def __init__(self, codigo_fonte: str = ''):
+        self.codigo = ''
+        self.segmentos: List[Segmento] = [Segmento(0, 0)]
+        self.ast: Optional[Programa] = Programa([])
+        self.caracteres_relidos = 0  # custo da última edição
+        self.segmentos_reanalisados = 0
+        self.editar(0, 0, codigo_fonte)
+
+    def editar(self, offset: int, removidos: int, inserido: str) -> Optional[Programa]:
+        """Troca codigo[offset:offset + removidos] por inserido e reanalisa.
+
+        Devolve o novo Programa, ou None se o código tiver erro léxico ou
+        sintático (como compilar_codigo, que não aceita um código com erro
+        léxico mesmo que os tokens restantes formem um programa válido).
+        """
+        if offset < 0 or removidos < 0 or offset + removidos > len(self.codigo):
+            raise ValueError(f"Edição fora do código: offset {offset}, {removidos} removidos")
+        codigo = self.codigo[:offset] + inserido + self.codigo[offset + removidos:]
+        delta = len(inserido) - removidos
+        segmentos = self.segmentos
+
+        # Segmentos tocados: do primeiro que termina em offset ou depois ao
+        # último que começa em offset + removidos ou antes
+        i = bisect_left([s.fim for s in segmentos], offset)
+        j = bisect_right([s.inicio for s in segmentos], offset + removidos) - 1
+        mantidos = segmentos[:i]
+
+        lexer = AnalisadorLexico(codigo)
+        lexer.pos = inicio = segmentos[i].inicio
+        divisor = DivisorDeclaracoes(mantidos[-1].estado if mantidos else (0, False))
+        novos: List[Segmento] = []
+        atual = Segmento(inicio, inicio)
+        fim_anterior = inicio
+        erros_vistos = 0
+        k = j + 1  # próximo segmento antigo onde a releitura pode parar
+        sincronizado = False
+
+        for token in lexer.varrer_regex():
+            if divisor.inicia(token.tipo):
+                if atual.tokens:
+                    # Fronteira em fim_anterior: igual à de um segmento antigo
+                    # depois da edição, o resto do código não muda
+                    while k < len(segmentos) and segmentos[k].inicio + delta < fim_anterior:
+                        k += 1
+                    if k < len(segmentos) and segmentos[k].inicio + delta == fim_anterior:
+                        sincronizado = True
+                        break
+                    atual.fim = fim_anterior
+                    novos.append(atual)
+                    atual = Segmento(fim_anterior, fim_anterior)
+            elif not atual.tokens and not novos and mantidos:
+                # O token continua a declaração anterior, que volta a ser lida
+                atual = mantidos.pop()
+                atual.no = None
+            atual.erros_lexicos += len(lexer.erros) - erros_vistos
+            erros_vistos = len(lexer.erros)
+            atual.tokens.append((token.tipo, token.lexema, token.inicio - atual.inicio))
+            atual.estado = divisor.estado
+            fim_anterior = token.inicio + len(token.lexema)
+            if token.tipo == TokenType.CONST_STRING:
+                fim_anterior += 2  # aspas
+
+        if sincronizado:
+            atual.fim = fim_anterior
+            novos.append(atual)
+            restantes = segmentos[k:]
+            for segmento in restantes:
+                segmento.inicio += delta
+                segmento.fim += delta
+        else:
+            if atual.tokens:
+                atual.fim = fim_anterior
+                novos.append(atual)
+                atual = Segmento(fim_anterior, fim_anterior, estado=divisor.estado)
+            atual.fim = len(codigo)
+            atual.erros_lexicos += len(lexer.erros) - erros_vistos
+            restantes = [atual]
+
+        self.codigo = codigo
+        self.segmentos = mantidos + novos + restantes
+        self.caracteres_relidos = fim_anterior - inicio
+        self.segmentos_reanalisados = 0
+        linhas = IndiceLinhas(codigo)
+        for indice in range(len(mantidos), len(mantidos) + len(novos)):
+            self.segmentos[indice].no, _ = self.analisar_segmento(indice, linhas)
+            self.segmentos_reanalisados += 1
+
+        if any(s.erros_lexicos or (s.tokens and s.no is None) for s in self.segmentos):
+            self.ast = None
+        else:
+            self.ast = Programa([s.no for s in self.segmentos if s.tokens])
+        return self.ast
+
+    def analisar_segmento(self, indice: int, linhas: Optional[IndiceLinhas] = None):
+        """Analisa o segmento sozinho; devolve (declaração ou None, parser).
+
+        Depois dos tokens do segmento vem o primeiro token do seguinte (ou o
+        EOF), o mesmo que o parser veria no arquivo inteiro.
+        """
+        if linhas is None:
+            linhas = IndiceLinhas(self.codigo)
+        segmento = self.segmentos[indice]
+        seguinte = self.segmentos[indice + 1] if indice + 1 < len(self.segmentos) else None
+        base = segmento.inicio
+        tokens = [Token(tipo, lexema, base + offset, linhas) for tipo, lexema, offset in segmento.tokens]
+        if seguinte is not None and seguinte.tokens:
+            tipo, lexema, offset = seguinte.tokens[0]
+            tokens.append(Token(tipo, lexema, seguinte.inicio + offset, linhas))
+        return analisar_declaracao(tokens, len(segmento.tokens),
+                                   Token(TokenType.EOF, '', len(self.codigo), linhas))
+
+    @property
+    def tokens(self) -> List[Token]:
+        """Lista de tokens do código inteiro, como AnalisadorLexico.analisar"""
+        linhas = IndiceLinhas(self.codigo)
+        tokens = [Token(tipo, lexema, s.inicio + offset, linhas)
+                  for s in self.segmentos for tipo, lexema, offset in s.tokens]
+        tokens.append(Token(TokenType.EOF, '', len(self.codigo), linhas))
+        return tokens
+
+    @property
+    def erros_lexicos(self) -> List[str]:
+        """Erros léxicos, relendo só os segmentos que têm algum"""
+        lexer = AnalisadorLexico(self.codigo)
+        for segmento in self.segmentos:
+            if segmento.erros_lexicos:
+                lexer.pos = segmento.inicio
+                restantes = len(segmento.tokens)
+                for _ in lexer.varrer_regex():
+                    restantes -= 1
+                    if restantes <= 0:
+                        break
+        return lexer.erros
+
+    @property
+    def erros_sintaticos(self) -> List[str]:
+        """Erro do primeiro segmento que falha, como na análise completa.
+
+        Com erros léxicos a lista é vazia: compilar_codigo nem chega à análise
+        sintática.
+        """
+        if any(segmento.erros_lexicos for segmento in self.segmentos):
+            return []
+        for indice, segmento in enumerate(self.segmentos):
+            if segmento.tokens and segmento.no is None:
+                return self.analisar_segmento(indice)[1].erros
+        return []
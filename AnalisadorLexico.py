@@ -1,6 +1,11 @@
 
-from dataclasses import dataclass
-from typing import List, Optional
+import codecs
+import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, List, Optional, Tuple
 from enum import Enum
 
 class TokenType(Enum):
@@ -45,60 +50,458 @@ class TokenType(Enum):
     IDENTIFICADOR = 'IDENTIFICADOR'
     EOF = 'EOF'
 
+# Índice denso de cada TokenType: é a coluna da tabela ACTION do parser
+for _indice, _tipo in enumerate(TokenType):
+    _tipo.indice = _indice
+del _indice, _tipo
+
+class IndiceLinhas:
+    """Offsets de início de cada linha do código-fonte.
+
+    Linha e coluna são calculadas só quando pedidas (mensagens de erro,
+    impressão de tokens), por busca binária nesta tabela. Com o código
+    inteiro disponível a tabela é montada na primeira consulta; na leitura
+    em fluxo, cada bloco é registrado ao chegar.
+    """
+
+    def __init__(self, codigo: Optional[str] = None):
+        self.codigo = codigo
+        self.inicios = array('q', [0])
+        self.lidos = 0
+
+    def registrar(self, bloco: str):
+        """Registra as quebras de linha do próximo trecho do código"""
+        inicios = self.inicios
+        base = self.lidos
+        i = bloco.find('\n')
+        while i >= 0:
+            inicios.append(base + i + 1)
+            i = bloco.find('\n', i + 1)
+        self.lidos += len(bloco)
+
+    def linha(self, offset: int) -> int:
+        if self.codigo is not None:
+            codigo, self.codigo = self.codigo, None
+            self.registrar(codigo)
+        return bisect_right(self.inicios, offset)
+
+    def coluna(self, offset: int) -> int:
+        return offset - self.inicios[self.linha(offset) - 1] + 1
+
+    def posicao(self, offset: int) -> Tuple[int, int]:
+        linha = self.linha(offset)
+        return linha, offset - self.inicios[linha - 1] + 1
+
 @dataclass
 class Token:
     tipo: TokenType
     lexema: str
-    linha: int
-    coluna: int
+    inicio: int  # offset do primeiro caractere do token (as aspas, em strings)
+    linhas: IndiceLinhas = field(repr=False, compare=False)
+
+    @property
+    def linha(self) -> int:
+        return self.linhas.linha(self.inicio)
+
+    @property
+    def coluna(self) -> int:
+        return self.linhas.coluna(self.inicio)
+
+# TokenType a partir do código inteiro (TokenType.indice)
+TIPOS_POR_INDICE = tuple(TokenType)
+
+class TokenStream(Sequence):
+    """Tokens guardados em colunas paralelas (struct-of-arrays).
+
+    Cada token ocupa um código de tipo (TokenType.indice) e os offsets de
+    início/fim no código-fonte. O lexema é fatiado do código só quando
+    pedido, e o acesso por índice devolve um Token equivalente ao da lista de
+    AnalisadorLexico.analisar.
+    """
+
+    def __init__(self, codigo: str, linhas: IndiceLinhas):
+        self.codigo = codigo
+        self.linhas = linhas
+        self.tipos = array('B')
+        self.inicios = array('i')
+        self.fins = array('i')
+
+    def adicionar(self, tipo: int, inicio: int, fim: int):
+        self.tipos.append(tipo)
+        self.inicios.append(inicio)
+        self.fins.append(fim)
+
+    def __len__(self):
+        return len(self.tipos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self[i] for i in range(*indice.indices(len(self)))]
+        if indice < 0:
+            indice += len(self)
+        return Token(TIPOS_POR_INDICE[self.tipos[indice]], self.lexema(indice),
+                     self.inicios[indice], self.linhas)
+
+    def __iter__(self):
+        codigo = self.codigo
+        linhas = self.linhas
+        string = TokenType.CONST_STRING.indice
+        for tipo, inicio, fim in zip(self.tipos, self.inicios, self.fins):
+            lexema = codigo[inicio + 1:fim - 1] if tipo == string else codigo[inicio:fim]
+            yield Token(TIPOS_POR_INDICE[tipo], lexema, inicio, linhas)
+
+    def tipo(self, indice: int) -> TokenType:
+        return TIPOS_POR_INDICE[self.tipos[indice]]
+
+    def lexema(self, indice: int) -> str:
+        inicio, fim = self.inicios[indice], self.fins[indice]
+        if self.tipos[indice] == TokenType.CONST_STRING.indice:
+            return self.codigo[inicio + 1:fim - 1]
+        return self.codigo[inicio:fim]
+
+    def tamanho_bytes(self) -> int:
+        """Bytes ocupados pelas colunas (sem contar o código-fonte)"""
+        colunas = (self.tipos, self.inicios, self.fins)
+        return sum(c.itemsize * len(c) for c in colunas)
+
+PALAVRAS_RESERVADAS = {
+    'se': TokenType.SE,
+    'senao': TokenType.SENAO,
+    'para': TokenType.PARA,
+    'faca': TokenType.FACA,
+    'enquanto': TokenType.ENQUANTO,
+    'escreva': TokenType.ESCREVA,
+    'leia': TokenType.LEIA,
+    'inteiro': TokenType.INTEIRO,
+    'flutuante': TokenType.FLUTUANTE,
+    'logico': TokenType.LOGICO,
+    'cadeia': TokenType.CADEIA,
+    'inicio': TokenType.INICIO,
+    'fim': TokenType.FIM,
+    'funcao': TokenType.FUNCAO,
+    'retorne': TokenType.RETORNE,
+    'verdadeiro': TokenType.CONST_BOOL,
+    'falso': TokenType.CONST_BOOL,
+}
+
+OPERADORES = {
+    '+': TokenType.ADICAO,
+    '-': TokenType.SUBTRACAO,
+    '*': TokenType.MULTIPLICACAO,
+    '/': TokenType.DIVISAO,
+    '(': TokenType.ABRE_PAREN,
+    ')': TokenType.FECHA_PAREN,
+    '[': TokenType.ABRE_COLCH,
+    ']': TokenType.FECHA_COLCH,
+    '>': TokenType.MAIOR,
+    '<': TokenType.MENOR,
+    '>=': TokenType.MAIOR_IGUAL,
+    '<=': TokenType.MENOR_IGUAL,
+    '==': TokenType.IGUAL,
+    '!=': TokenType.DIFERENTE,
+    ':=': TokenType.ATRIBUICAO,
+    '&': TokenType.CONCATENACAO,
+    '++': TokenType.INCREMENTO,
+    '--': TokenType.DECREMENTO,
+    ',': TokenType.VIRGULA,
+}
+
+OPERADORES_DUPLOS = frozenset(op for op in OPERADORES if len(op) == 2)
+
+# Padrão único do motor 'regex': espaços (inclusive quebras de linha) à
+# esquerda seguidos de um token. Cobre o caso ASCII; qualquer caractere fora
+# dele (OUTRO) é tratado pelo motor por caracteres, garantindo o mesmo resultado
+PADRAO_TOKENS = re.compile(r'''
+    \s*
+    (?:
+        (?P<PALAVRA>[A-Za-z_]\w*)
+      | (?P<NUMERO>-?[0-9]+(?:\.[0-9]*)?)
+      | (?P<COMENTARIO>//[^\n]*)
+      | (?P<OPERADOR>>=|<=|==|!=|\+\+|--|:=|[-+*/()\[\]><&,])
+      | (?P<STRING>"[^"\n]*")
+      | (?P<STRING_ABERTA>"[^"\n]*)
+      | (?P<OUTRO>.)
+      | (?P<FIM>\Z)
+    )
+''', re.VERBOSE)
+
+MOTORES = ('regex', 'caracteres')
+
+TAMANHO_BLOCO = 1 << 16
+
+def ler_blocos(fonte, tamanho_bloco: int = TAMANHO_BLOCO, encoding: str = 'utf-8') -> Iterator[str]:
+    """Converte a fonte em blocos de texto lidos sob demanda.
+
+    Aceita str, bytes/mmap (qualquer objeto com protocolo de buffer), arquivos
+    abertos em modo texto ou binário e iteráveis de blocos str ou bytes. Bytes
+    são decodificados de forma incremental, então um caractere multibyte
+    partido entre blocos é tratado corretamente.
+    """
+    decodificador = codecs.getincrementaldecoder(encoding)()
+
+    def texto(bloco):
+        return bloco if isinstance(bloco, str) else decodificador.decode(bloco)
+
+    if isinstance(fonte, str):
+        yield fonte
+    elif hasattr(fonte, 'read'):
+        while True:
+            bloco = fonte.read(tamanho_bloco)
+            if not bloco:
+                break
+            yield texto(bloco)
+    else:
+        try:
+            memoria = memoryview(fonte)
+        except TypeError:
+            for bloco in fonte:
+                yield texto(bloco)
+        else:
+            with memoria:
+                for inicio in range(0, len(memoria), tamanho_bloco):
+                    yield decodificador.decode(memoria[inicio:inicio + tamanho_bloco])
+    final = decodificador.decode(b'', final=True)
+    if final:
+        yield final
+
+def formatar_token(token: Token) -> str:
+    """Linha de um token na listagem de imprimir_tokens"""
+    return f"Token: {token.tipo.name}, Lexema: {token.lexema}, Linha: {token.linha}, Coluna: {token.coluna}"
 
 class AnalisadorLexico:
-    def __init__(self, codigo_fonte: str):
+    def __init__(self, codigo_fonte: str, motor: str = 'regex'):
+        if motor not in MOTORES:
+            raise ValueError(f"Motor léxico desconhecido: {motor!r}")
         self.codigo = codigo_fonte  # Remova o + '\0'
+        self.blocos: Optional[Iterable[str]] = None
+        self.motor = motor
         self.pos = 0
-        self.linha = 1
-        self.coluna = 1
+        self.base = 0  # offset de self.codigo[0] no fonte (muda na leitura em fluxo)
+        self.linhas = IndiceLinhas(codigo_fonte)
         self.tokens: List[Token] = []
         self.erros: List[str] = []
 
+    @classmethod
+    def de_fluxo(cls, fonte, tamanho_bloco: int = TAMANHO_BLOCO, motor: str = 'regex') -> 'AnalisadorLexico':
+        """Cria um analisador que lê a fonte em blocos (ver ler_blocos).
+
+        Com o motor 'regex', gerar_tokens mantém em memória apenas o bloco
+        corrente; self.codigo passa a ser esse buffer, não o arquivo inteiro.
+        """
+        lexer = cls('', motor)
+        lexer.blocos = ler_blocos(fonte, tamanho_bloco)
+        lexer.linhas = IndiceLinhas()
+        return lexer
+
+    def ler_tudo(self):
+        """Junta os blocos de de_fluxo em self.codigo"""
+        if self.blocos is not None:
+            self.codigo = ''.join(self.blocos)
+            self.blocos = None
+            self.linhas = IndiceLinhas(self.codigo)
+
     def analisar(self) -> List[Token]:
-        while self.pos < len(self.codigo):
-            char = self.codigo[self.pos]
-            if char.isspace():
-                if char == '\n':
-                    self.linha += 1
-                    self.coluna = 1
-                else:
-                    self.coluna += 1
-                self.pos += 1
-                continue
-            if char == '/' and self.peek() == '/':
-                self.consumir_comentario()
-                continue
-            if char.isalpha() or char == '_':
-                lexema = self.consumir_identificador()
-                tipo = self.get_keyword_type(lexema)
-                self.tokens.append(Token(tipo, lexema, self.linha, self.coluna - len(lexema)))
-                continue
-            if char.isdigit() or (char == '-' and self.peek().isdigit()):
-                lexema, tipo = self.consumir_numero()
-                self.tokens.append(Token(tipo, lexema, self.linha, self.coluna - len(lexema)))
+        if self.motor == 'regex':
+            self.tokens.extend(self.varrer_regex())
+        else:
+            self.ler_tudo()
+            while self.pos < len(self.codigo):
+                self.consumir_proximo()
+        self.tokens.append(Token(TokenType.EOF, '', self.base + self.pos, self.linhas))
+        return self.tokens
+
+    def analisar_compacto(self) -> TokenStream:
+        """Como analisar, mas devolve os tokens num TokenStream.
+
+        Usa o mesmo padrão do motor 'regex' sem criar um objeto Token por
+        token; a fonte é lida inteira (self.codigo ou os blocos de de_fluxo).
+        """
+        self.ler_tudo()
+        codigo = self.codigo
+        tamanho = len(codigo)
+        fluxo = TokenStream(codigo, self.linhas)
+        tipos = fluxo.tipos.append
+        inicios = fluxo.inicios.append
+        fins = fluxo.fins.append
+        casar = PADRAO_TOKENS.match
+        palavras = {lexema: tipo.indice for lexema, tipo in PALAVRAS_RESERVADAS.items()}
+        operadores = {lexema: tipo.indice for lexema, tipo in OPERADORES.items()}
+        identificador = TokenType.IDENTIFICADOR.indice
+        const_inteiro = TokenType.CONST_INTEIRO.indice
+        const_float = TokenType.CONST_FLOAT.indice
+        const_string = TokenType.CONST_STRING.indice
+        pos = self.pos
+
+        while pos < tamanho:
+            m = casar(codigo, pos)
+            grupo = m.lastgroup
+            inicio = m.start(grupo)
+            fim = m.end()
+            if grupo == 'PALAVRA':
+                tipos(palavras.get(m.group(grupo), identificador))
+            elif grupo == 'OPERADOR' and not (fim < tamanho and codigo[fim] > '\x7f' and codigo[inicio] == '-'):
+                tipos(operadores[m.group(grupo)])
+            elif grupo == 'NUMERO' and not (fim < tamanho and codigo[fim] > '\x7f'):
+                tipos(const_float if '.' in m.group(grupo) else const_inteiro)
+            elif grupo == 'STRING':
+                tipos(const_string)
+            elif grupo == 'FIM':
+                pos = fim
+                break
+            elif grupo == 'COMENTARIO':
+                pos = fim
                 continue
-            if char == '"':
-                lexema = self.consumir_string()
-                if lexema is not None:
-                    self.tokens.append(Token(TokenType.CONST_STRING, lexema, self.linha, self.coluna - len(lexema) - 2))
+            elif grupo == 'STRING_ABERTA':
+                self.erros.append(f"String não fechada na linha {self.linhas.linha(inicio)}")
+                pos = fim
                 continue
-            op = self.consumir_operador()
-            if op:
-                tipo = self.get_op_type(op)
-                self.tokens.append(Token(tipo, op, self.linha, self.coluna - len(op)))
+            else:
+                # Caso fora do padrão ASCII: delega ao motor por caracteres
+                self.pos = inicio
+                tokens, self.tokens = self.tokens, []
+                self.consumir_proximo()
+                novos, self.tokens = self.tokens, tokens
+                pos = self.pos
+                for token in novos:
+                    extra = 2 if token.tipo == TokenType.CONST_STRING else 0
+                    fluxo.adicionar(token.tipo.indice, token.inicio, token.inicio + len(token.lexema) + extra)
                 continue
-            self.erros.append(f"Caractere inválido '{char}' na linha {self.linha}, coluna {self.coluna}")
+            inicios(inicio)
+            fins(fim)
+            pos = fim
+
+        self.pos = pos
+        fluxo.adicionar(TokenType.EOF.indice, pos, pos)
+        self.tokens = fluxo
+        return fluxo
+
+    def gerar_tokens(self) -> Iterator[Token]:
+        """Gera os tokens sob demanda, terminando com EOF, sem guardá-los"""
+        if self.motor != 'regex':
+            yield from self.analisar()
+            return
+        yield from self.varrer_regex()
+        yield Token(TokenType.EOF, '', self.base + self.pos, self.linhas)
+
+    def consumir_proximo(self):
+        """Consome um espaço, comentário, token ou caractere inválido"""
+        char = self.codigo[self.pos]
+        inicio = self.base + self.pos
+        if char.isspace():
             self.pos += 1
-            self.coluna += 1
-        self.tokens.append(Token(TokenType.EOF, '', self.linha, self.coluna))
-        return self.tokens
+            return
+        if char == '/' and self.peek() == '/':
+            self.consumir_comentario()
+            return
+        if char.isalpha() or char == '_':
+            lexema = self.consumir_identificador()
+            tipo = self.get_keyword_type(lexema)
+            self.tokens.append(Token(tipo, lexema, inicio, self.linhas))
+            return
+        if char.isdigit() or (char == '-' and self.peek().isdigit()):
+            lexema, tipo = self.consumir_numero()
+            self.tokens.append(Token(tipo, lexema, inicio, self.linhas))
+            return
+        if char == '"':
+            lexema = self.consumir_string()
+            if lexema is not None:
+                self.tokens.append(Token(TokenType.CONST_STRING, lexema, inicio, self.linhas))
+            return
+        op = self.consumir_operador()
+        if op:
+            tipo = self.get_op_type(op)
+            self.tokens.append(Token(tipo, op, inicio, self.linhas))
+            return
+        linha, coluna = self.linhas.posicao(inicio)
+        self.erros.append(f"Caractere inválido '{char}' na linha {linha}, coluna {coluna}")
+        self.pos += 1
+
+    def varrer_regex(self) -> Iterator[Token]:
+        """Motor de varredura com um único padrão compilado (PADRAO_TOKENS).
+
+        Lê self.blocos (ou self.codigo inteiro) e gera os tokens sem o EOF.
+        Um casamento que termina no fim do buffer pode continuar no próximo
+        bloco, então o buffer é completado antes de aceitá-lo. Trechos que o
+        padrão não cobre (caracteres não ASCII em início de token ou colados
+        a um número) são delegados a consumir_proximo.
+        """
+        em_fluxo = self.blocos is not None
+        blocos = iter(self.blocos if em_fluxo else (self.codigo,))
+        casar = PADRAO_TOKENS.match
+        palavras = PALAVRAS_RESERVADAS
+        operadores = OPERADORES
+        identificador = TokenType.IDENTIFICADOR
+        const_inteiro = TokenType.CONST_INTEIRO
+        const_float = TokenType.CONST_FLOAT
+        const_string = TokenType.CONST_STRING
+        linhas = self.linhas
+        codigo = '' if em_fluxo else self.codigo
+        pos = self.pos
+        base = self.base
+        final = False
+
+        while not final:
+            bloco = next(blocos, None)
+            if bloco is None:
+                final = True
+            elif em_fluxo:
+                linhas.registrar(bloco)
+                base += pos
+                codigo = codigo[pos:] + bloco
+                pos = 0
+            self.codigo = codigo
+            self.base = base
+            tamanho = len(codigo)
+
+            while pos < tamanho:
+                m = casar(codigo, pos)
+                fim = m.end()
+                if fim == tamanho and not final:
+                    break  # o token pode continuar no próximo bloco
+                grupo = m.lastgroup
+                inicio = m.start(grupo)
+                if grupo == 'PALAVRA':
+                    lexema = m.group(grupo)
+                    yield Token(palavras.get(lexema, identificador), lexema, base + inicio, linhas)
+                    pos = fim
+                    continue
+                if grupo == 'OPERADOR' and not (fim < tamanho and codigo[fim] > '\x7f' and codigo[inicio] == '-'):
+                    lexema = m.group(grupo)
+                    yield Token(operadores[lexema], lexema, base + inicio, linhas)
+                    pos = fim
+                    continue
+                if grupo == 'NUMERO' and not (fim < tamanho and codigo[fim] > '\x7f'):
+                    lexema = m.group(grupo)
+                    tipo = const_float if '.' in lexema else const_inteiro
+                    yield Token(tipo, lexema, base + inicio, linhas)
+                    pos = fim
+                    continue
+                if grupo == 'STRING':
+                    yield Token(const_string, codigo[inicio + 1:fim - 1], base + inicio, linhas)
+                    pos = fim
+                    continue
+                if grupo == 'FIM':
+                    pos = fim
+                    break
+                if grupo == 'COMENTARIO':
+                    pos = fim
+                    continue
+                if grupo == 'STRING_ABERTA':
+                    self.erros.append(f"String não fechada na linha {linhas.linha(base + inicio)}")
+                    pos = fim
+                    continue
+                # Caso fora do padrão ASCII: delega ao motor por caracteres,
+                # que nunca passa de uma quebra de linha
+                if not final and codigo.find('\n', inicio) < 0:
+                    break
+                self.pos = inicio
+                tokens, self.tokens = self.tokens, []
+                self.consumir_proximo()
+                novos, self.tokens = self.tokens, tokens
+                yield from novos
+                pos = self.pos
+
+        self.pos = pos
 
     def peek(self):
         if self.pos + 1 < len(self.codigo):
@@ -106,58 +509,30 @@ class AnalisadorLexico:
         return '\0'
 
     def consumir_comentario(self):
-        while self.pos < len(self.codigo) and self.codigo[self.pos] != '\n':
-            self.pos += 1
-        if self.pos < len(self.codigo) and self.codigo[self.pos] == '\n':
-            self.linha += 1
-            self.coluna = 1
-            self.pos += 1
+        fim = self.codigo.find('\n', self.pos)
+        self.pos = len(self.codigo) if fim < 0 else fim + 1
 
     def consumir_identificador(self):
         start = self.pos
         while self.pos < len(self.codigo) and (self.codigo[self.pos].isalnum() or self.codigo[self.pos] == '_'):
             self.pos += 1
-            self.coluna += 1
         return self.codigo[start:self.pos]
 
     def get_keyword_type(self, lexema):
-        keywords = {
-            'se': TokenType.SE,
-            'senao': TokenType.SENAO,
-            'para': TokenType.PARA,
-            'faca': TokenType.FACA,
-            'enquanto': TokenType.ENQUANTO,
-            'escreva': TokenType.ESCREVA,
-            'leia': TokenType.LEIA,
-            'inteiro': TokenType.INTEIRO,
-            'flutuante': TokenType.FLUTUANTE,
-            'logico': TokenType.LOGICO,
-            'cadeia': TokenType.CADEIA,
-            'inicio': TokenType.INICIO,
-            'fim': TokenType.FIM,
-            'funcao': TokenType.FUNCAO,
-            'retorne': TokenType.RETORNE,
-            'verdadeiro': TokenType.CONST_BOOL,
-            'falso': TokenType.CONST_BOOL,
-        }
-        return keywords.get(lexema, TokenType.IDENTIFICADOR)
+        return PALAVRAS_RESERVADAS.get(lexema, TokenType.IDENTIFICADOR)
 
     def consumir_numero(self):
         start = self.pos
         is_float = False
         if self.codigo[self.pos] == '-':
             self.pos += 1
-            self.coluna += 1
         while self.pos < len(self.codigo) and self.codigo[self.pos].isdigit():
             self.pos += 1
-            self.coluna += 1
         if self.pos < len(self.codigo) and self.codigo[self.pos] == '.':
             is_float = True
             self.pos += 1
-            self.coluna += 1
             while self.pos < len(self.codigo) and self.codigo[self.pos].isdigit():
                 self.pos += 1
-                self.coluna += 1
         lexema = self.codigo[start:self.pos]
         tipo = TokenType.CONST_FLOAT if is_float else TokenType.CONST_INTEIRO
         return lexema, tipo
@@ -165,64 +540,35 @@ class AnalisadorLexico:
     def consumir_string(self):
         start = self.pos
         self.pos += 1
-        self.coluna += 1
         while self.pos < len(self.codigo) and self.codigo[self.pos] != '"':
             if self.codigo[self.pos] == '\n':
-                self.erros.append(f"String não fechada na linha {self.linha}")
-                return None
+                break
             self.pos += 1
-            self.coluna += 1
         if self.pos >= len(self.codigo) or self.codigo[self.pos] != '"':
-            self.erros.append(f"String não fechada na linha {self.linha}")
+            self.erros.append(f"String não fechada na linha {self.linhas.linha(self.base + start)}")
             return None
         lexema = self.codigo[start+1:self.pos]
         self.pos += 1
-        self.coluna += 1
         return lexema
 
     def consumir_operador(self):
         char = self.codigo[self.pos]
         next_char = self.peek()
         two_char = char + next_char
-        two_char_ops = {'>=': True, '<=': True, '==': True, '!=': True, '++': True, '--': True, ':=': True}
-        if two_char in two_char_ops:
+        if two_char in OPERADORES_DUPLOS:
             self.pos += 2
-            self.coluna += 2
             return two_char
-        one_char_ops = {'+': True, '-': True, '*': True, '/': True, '(': True, ')': True, '[': True, ']': True, '>': True, '<': True, '&': True, ',': True}
-        if char in one_char_ops:
+        if char in OPERADORES:
             self.pos += 1
-            self.coluna += 1
             return char
         return None
 
     def get_op_type(self, op):
-        ops = {
-            '+': TokenType.ADICAO,
-            '-': TokenType.SUBTRACAO,
-            '*': TokenType.MULTIPLICACAO,
-            '/': TokenType.DIVISAO,
-            '(': TokenType.ABRE_PAREN,
-            ')': TokenType.FECHA_PAREN,
-            '[': TokenType.ABRE_COLCH,
-            ']': TokenType.FECHA_COLCH,
-            '>': TokenType.MAIOR,
-            '<': TokenType.MENOR,
-            '>=': TokenType.MAIOR_IGUAL,
-            '<=': TokenType.MENOR_IGUAL,
-            '==': TokenType.IGUAL,
-            '!=': TokenType.DIFERENTE,
-            ':=': TokenType.ATRIBUICAO,
-            '&': TokenType.CONCATENACAO,
-            '++': TokenType.INCREMENTO,
-            '--': TokenType.DECREMENTO,
-            ',': TokenType.VIRGULA,
-        }
-        return ops.get(op)
+        return OPERADORES.get(op)
 
     def imprimir_tokens(self):
         for token in self.tokens[:-1]:
-            print(f"Token: {token.tipo.name}, Lexema: {token.lexema}, Linha: {token.linha}, Coluna: {token.coluna}")
+            print(formatar_token(token))
 
     def imprimir_erros(self):
         for erro in self.erros:
@@ -0,0 +1,120 @@
+import os
+import re
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from AnalisadorIncremental import DivisorDeclaracoes, analisar_declaracao
+from AnalisadorLexico import AnalisadorLexico, IndiceLinhas, Token, TokenStream, TokenType, TIPOS_POR_INDICE
+from AnalisadorSLR import AnalisadorSLR, formatar_erros
+from ast_nodes import *
+
+# Só funcao, inicio e fim mudam o estado do DivisorDeclaracoes
+PADRAO_DELIMITADORES = re.compile(b'[' + b''.join(
+    re.escape(bytes([tipo.indice])) for tipo in (TokenType.FUNCAO, TokenType.INICIO, TokenType.FIM)) + b']')
+
+def varrer_limites(fluxo: TokenStream) -> List[int]:
+    """Índices dos tokens que abrem cada declaração de topo (o primeiro é 0).
+
+    As fronteiras são as do DivisorDeclaracoes, sobre as colunas de um
+    TokenStream. A busca pelos delimitadores é feita pelo re nos bytes da
+    coluna de tipos, então só eles passam pelo laço em Python.
+    """
+    tipos = fluxo.tipos
+    divisor = DivisorDeclaracoes()
+    return [0] + [m.start() for m in PADRAO_DELIMITADORES.finditer(tipos.tobytes())
+                  if divisor.inicia(TIPOS_POR_INDICE[tipos[m.start()]]) and m.start()]
+
+# Estado de cada processo do pool, preenchido por _preparar_trabalhador
+_codigo = ''
+_linhas: Optional[IndiceLinhas] = None
+
+def _preparar_trabalhador(codigo: str):
+    """Recebe o código-fonte uma vez por processo e carrega as tabelas SLR"""
+    global _codigo, _linhas
+    _codigo = codigo
+    _linhas = IndiceLinhas(codigo)
+    AnalisadorSLR([])
+
+def _analisar_trecho(tarefa) -> List[tuple]:
+    """Analisa as declarações de um trecho de tokens; devolve (declaração, erros) de cada uma.
+
+    A tarefa traz as colunas de tipos/inícios/fins do trecho, que termina no
+    primeiro token depois dele (ou no EOF), e o índice em que começa cada
+    declaração dentro do trecho.
+    """
+    tipos, inicios, fins, limites = tarefa
+    eof = Token(TokenType.EOF, '', len(_codigo), _linhas)
+    resultados = []
+    for inicio, fim in zip(limites, limites[1:]):
+        fluxo = TokenStream(_codigo, _linhas)
+        fluxo.tipos, fluxo.inicios, fluxo.fins = tipos[inicio:fim + 1], inicios[inicio:fim + 1], fins[inicio:fim + 1]
+        no, parser = analisar_declaracao(fluxo, fim - inicio, eof)
+        resultados.append((no, [] if no is not None else parser.erros))
+    return resultados
+
+class AnalisadorParalelo:
+    """Análise de um arquivo grande com as declarações de topo repartidas entre processos.
+
+    Uma varredura dos tipos de token acha onde começa cada declaração de topo
+    (ver varrer_limites); grupos de declarações consecutivas são
+    analisados em paralelo, cada declaração isoladamente, e os resultados
+    voltam na ordem do código. Cada declaração para no seu primeiro erro,
+    mas erros de declarações diferentes são todos reportados.
+    """
+
+    def __init__(self, codigo_fonte: str, jobs: int = 0, tokens_por_tarefa: int = 20000):
+        self.codigo = codigo_fonte
+        self.jobs = jobs or os.cpu_count() or 1
+        self.tokens_por_tarefa = tokens_por_tarefa
+        self.declaracoes: List[Optional[No]] = []  # None nas declarações com erro
+        self.erros: List[str] = []
+
+    def dividir_tarefas(self, fluxo: TokenStream) -> List[tuple]:
+        """Agrupa declarações consecutivas em tarefas de ~tokens_por_tarefa tokens"""
+        limites = varrer_limites(fluxo)
+        ultimo = len(fluxo) - 1  # EOF
+        if ultimo == 0:
+            return []
+        limites.append(ultimo)
+        tarefas = []
+        primeira = 0
+        for atual in range(1, len(limites)):
+            if limites[atual] - limites[primeira] >= self.tokens_por_tarefa or atual == len(limites) - 1:
+                a, b = limites[primeira], limites[atual]
+                tarefas.append((fluxo.tipos[a:b + 1], fluxo.inicios[a:b + 1], fluxo.fins[a:b + 1],
+                                array('i', (limite - a for limite in limites[primeira:atual + 1]))))
+                primeira = atual
+        return tarefas
+
+    def analisar(self) -> Optional[Programa]:
+        """Executa as análises léxica e sintática; None se houver erros"""
+        lexer = AnalisadorLexico(self.codigo)
+        fluxo = lexer.analisar_compacto()
+        if lexer.erros:
+            self.erros = lexer.erros
+            return None
+
+        tarefas = self.dividir_tarefas(fluxo)
+        if self.jobs <= 1 or len(tarefas) <= 1:
+            _preparar_trabalhador(self.codigo)
+            resultados = map(_analisar_trecho, tarefas)
+            self._reunir(resultados)
+        else:
+            with ProcessPoolExecutor(max_workers=self.jobs, initializer=_preparar_trabalhador,
+                                     initargs=(self.codigo,)) as executor:
+                self._reunir(executor.map(_analisar_trecho, tarefas))
+
+        if self.erros:
+            return None
+        return Programa(self.declaracoes)
+
+    def _reunir(self, resultados):
+        for resultado in resultados:
+            for no, erros in resultado:
+                self.declaracoes.append(no)
+                self.erros.extend(erros)
+
+    def imprimir_erros(self):
+        """Imprime os erros encontrados, no mesmo formato do AnalisadorSLR"""
+        print('\n'.join(formatar_erros(self.erros)))
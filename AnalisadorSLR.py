@@ -1,5 +1,15 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from sys import intern
+from array import array
+from collections import Counter
 from dataclasses import dataclass
-from typing import List, Dict, Set, Tuple, Optional
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Iterable, List, Dict, Sequence, Set, Tuple, Optional
 from enum import Enum
 from AnalisadorLexico import Token, TokenType
 from ast_nodes import *
@@ -15,19 +25,417 @@ class ActionEntry:
     action: Action
     value: Optional[int] = None  # estado para shift, ou número da regra para reduce
 
+# Nós de literais são compartilhados entre ocorrências iguais (e entre
+# análises); o cache é limitado para não crescer sem fim num processo longo
+@lru_cache(maxsize=4096)
+def literal_inteiro(lexema: str) -> Numero:
+    return Numero(int(lexema))
+
+@lru_cache(maxsize=4096)
+def literal_flutuante(lexema: str) -> Numero:
+    return Numero(float(lexema))
+
+@lru_cache(maxsize=4096)
+def literal_string(lexema: str) -> String:
+    return String(lexema)
+
+# Erros sintáticos reportados por padrão antes de a análise parar. Com 1 ela
+# para no primeiro erro, sem recuperação (fail-fast)
+MAX_ERROS = 10
+
+# Versão do formato das tabelas; incrementar ao mudar a construção delas
+VERSAO_TABELAS = 2
+
+# Códigos inteiros da tabela ACTION compactada: > 0 é shift para o estado
+# (codigo - 1), 0 é erro, ACEITAR é a redução da regra 0 e < -1 reduz a regra
+# (-codigo - 1)
+ERRO = 0
+ACEITAR = -1
+
+def codificar_acao(entrada: ActionEntry) -> int:
+    """Converte um ActionEntry no código inteiro da tabela compactada"""
+    if entrada.action is Action.SHIFT:
+        return entrada.value + 1
+    if entrada.action is Action.REDUCE:
+        return -entrada.value - 1
+    if entrada.action is Action.ACCEPT:
+        return ACEITAR
+    return ERRO
+
+def compactar_linhas(linhas: List[Dict[int, int]], colunas: int):
+    """Compacta linhas esparsas por deslocamento de linhas (comb vector).
+
+    Cada linha i recebe uma base tal que suas entradas caibam em posições
+    livres de um único vetor. A consulta é proximo[base[i] + c] quando
+    verificacao[base[i] + c] == i; caso contrário vale o padrão da linha.
+    """
+    base = array('i', [0] * len(linhas))
+    proximo = array('i')
+    verificacao = array('i')
+    ordem = sorted(range(len(linhas)), key=lambda i: -len(linhas[i]))
+    for i in ordem:
+        entradas = sorted(linhas[i].items())
+        deslocamento = 0
+        while True:
+            fim = deslocamento + colunas
+            if len(verificacao) < fim:
+                verificacao.extend([-1] * (fim - len(verificacao)))
+                proximo.extend([0] * (fim - len(proximo)))
+            if all(verificacao[deslocamento + c] == -1 for c, _ in entradas):
+                break
+            deslocamento += 1
+        base[i] = deslocamento
+        for c, valor in entradas:
+            verificacao[deslocamento + c] = i
+            proximo[deslocamento + c] = valor
+    return base, proximo, verificacao
+
+def formatar_erros(erros: List[str]) -> List[str]:
+    """Linhas do relatório de erros sintáticos de imprimir_erros"""
+    if not erros:
+        return ["✓ Nenhum erro sintático encontrado"]
+    return [f"✗ {len(erros)} erro(s) sintático(s) encontrado(s):"] + [f"  - {erro}" for erro in erros]
+
+class PilhaMedida(list):
+    """Pilha de estados que registra o maior tamanho atingido"""
+    __slots__ = ('maximo',)
+
+    def __init__(self, itens=()):
+        super().__init__(itens)
+        self.maximo = len(self)
+
+    def append(self, item):
+        list.append(self, item)
+        if len(self) > self.maximo:
+            self.maximo = len(self)
+
+def _descartar(valores) -> None:
+    return None
+
+# Ação semântica de cada produção: (método do construtor, posições dos
+# valores da produção que ele recebe); com método None a ação devolve o valor
+# da posição. ConstrutorAST monta nós de ast_nodes e ast_arena.ConstrutorArena
+# os nós da arena, com os mesmos métodos. As regras de TIPO, OP_COMP e dos
+# operadores aritméticos são genéricas (ver construcao)
+CONSTRUCOES = {
+    ('PROGRAMA', ('DECLARACOES',)): ('programa', (0,)),
+    ('DECLARACOES', ('DECLARACOES', 'DECLARACAO')): ('anexar', (0, 1)),
+    ('DECLARACOES', ()): ('lista', ()),
+    ('BLOCO_PRINCIPAL', ('INICIO', 'COMANDOS', 'FIM')): ('bloco', (0, 1)),
+    ('DECLARACAO_FUNCAO', ('FUNCAO', 'TIPO', 'IDENTIFICADOR', 'ABRE_PAREN', 'PARAMETROS', 'FECHA_PAREN', 'INICIO', 'COMANDOS', 'FIM')):
+        ('declaracao_funcao', (0, 1, 2, 3, 4, 6, 7)),
+    ('PARAMETROS', ()): ('lista', ()),
+    ('LISTA_PARAMETROS', ('TIPO', 'IDENTIFICADOR')): ('primeiro_parametro', (0, 1)),
+    ('LISTA_PARAMETROS', ('LISTA_PARAMETROS', 'VIRGULA', 'TIPO', 'IDENTIFICADOR')): ('anexar_parametro', (0, 2, 3)),
+    ('COMANDOS', ('COMANDOS', 'COMANDO')): ('anexar', (0, 1)),
+    ('COMANDOS', ()): ('lista', ()),
+    ('DECLARACAO_VAR', ('TIPO', 'IDENTIFICADOR')): ('declaracao_variavel', (0, 1)),
+    ('DECLARACAO_VAR', ('TIPO', 'IDENTIFICADOR', 'ATRIBUICAO', 'EXPRESSAO')): ('declaracao_variavel', (0, 1, 3)),
+    ('COMANDO_ATRIBUICAO', ('IDENTIFICADOR', 'ATRIBUICAO', 'EXPRESSAO')): ('atribuicao', (0, 2)),
+    ('COMANDO_SE', ('SE', 'EXPRESSAO', 'INICIO', 'COMANDOS', 'FIM')): ('comando_se', (0, 1, 2, 3)),
+    ('COMANDO_SE', ('SE', 'EXPRESSAO', 'INICIO', 'COMANDOS', 'FIM', 'SENAO', 'INICIO', 'COMANDOS', 'FIM')):
+        ('comando_se', (0, 1, 2, 3, 6, 7)),
+    ('COMANDO_ENQUANTO', ('ENQUANTO', 'EXPRESSAO', 'FACA', 'INICIO', 'COMANDOS', 'FIM')):
+        ('comando_enquanto', (0, 1, 3, 4)),
+    ('COMANDO_PARA', ('PARA', 'COMANDO_ATRIBUICAO', 'FACA', 'EXPRESSAO', 'FACA', 'COMANDO_ATRIBUICAO', 'FACA', 'INICIO', 'COMANDOS', 'FIM')):
+        ('comando_para', (0, 1, 3, 5, 7, 8)),
+    ('COMANDO_ESCREVA', ('ESCREVA', 'ABRE_PAREN', 'EXPRESSAO', 'FECHA_PAREN')): ('comando_escreva', (0, 2)),
+    ('COMANDO_LEIA', ('LEIA', 'ABRE_PAREN', 'IDENTIFICADOR', 'FECHA_PAREN')): ('comando_leia', (0, 2)),
+    ('CHAMADA_FUNCAO', ('IDENTIFICADOR', 'ABRE_PAREN', 'ARGUMENTOS', 'FECHA_PAREN')): ('chamada_funcao', (0, 2)),
+    ('ARGUMENTOS', ()): ('lista', ()),
+    ('LISTA_ARGUMENTOS', ('EXPRESSAO',)): ('lista_de', (0,)),
+    ('LISTA_ARGUMENTOS', ('LISTA_ARGUMENTOS', 'VIRGULA', 'EXPRESSAO')): ('anexar', (0, 2)),
+    ('RETORNE_CMD', ('RETORNE', 'EXPRESSAO')): ('retorne', (0, 1)),
+    ('RETORNE_CMD', ('RETORNE',)): ('retorne', (0,)),
+    ('EXPR_COMP', ('EXPR_ARIT', 'OP_COMP', 'EXPR_ARIT')): ('comparacao', (0, 1, 2)),
+    ('FATOR', ('CONST_INTEIRO',)): ('inteiro', (0,)),
+    ('FATOR', ('CONST_FLOAT',)): ('flutuante', (0,)),
+    ('FATOR', ('CONST_STRING',)): ('string', (0,)),
+    ('FATOR', ('CONST_BOOL',)): ('booleano', (0,)),
+    ('FATOR', ('IDENTIFICADOR',)): ('identificador', (0,)),
+    ('FATOR', ('ABRE_PAREN', 'EXPRESSAO', 'FECHA_PAREN')): (None, (1,)),
+    ('FATOR', ('SUBTRACAO', 'FATOR')): ('unaria', (0, 1)),
+}
+
+def construcao(nao_terminal: str, producao: Sequence[str]) -> Optional[Tuple[Optional[str], Tuple[int, ...]]]:
+    """Entrada de CONSTRUCOES da regra; None se ela só repassa o valor do filho"""
+    entrada = CONSTRUCOES.get((nao_terminal, tuple(producao)))
+    if entrada is not None:
+        return entrada
+    if nao_terminal in ('TIPO', 'OP_COMP'):
+        return ('lexema', (0,))
+    if len(producao) == 3 and producao[0] == nao_terminal:
+        return ('binaria', (0, 1, 2))  # EXPR_ARIT/TERMO com operador à esquerda
+    return None  # regra unitária (ou S')
+
+def criar_acoes_semanticas(gramatica, construtor) -> List[Optional[Callable]]:
+    """Ações de redução, alinhadas com a gramática, que chamam os métodos de construtor.
+
+    Cada ação recebe a lista de valores da produção (tokens para terminais).
+    Regras unitárias ficam com None e repassam o valor do filho sem chamada alguma.
+    """
+    acoes = []
+    for nao_terminal, producao in gramatica:
+        entrada = construcao(nao_terminal, producao)
+        if entrada is None:
+            acoes.append(None)
+            continue
+        nome, posicoes = entrada
+        acoes.append(_acao(None if nome is None else getattr(construtor, nome), posicoes))
+    return acoes
+
+def _acao(metodo: Optional[Callable], posicoes: Tuple[int, ...]) -> Callable:
+    if metodo is None:
+        return itemgetter(*posicoes)
+    if not posicoes:
+        return lambda v: metodo()
+    if len(posicoes) == 1:
+        posicao, = posicoes
+        return lambda v: metodo(v[posicao])
+    valores = itemgetter(*posicoes)
+    return lambda v: metodo(*valores(v))
+
+class ConstrutorAST:
+    """Métodos de CONSTRUCOES que montam os nós de ast_nodes.
+
+    TIPO e OP_COMP produzem o lexema (internado) do terminal; nomes também
+    são internados.
+    """
+
+    def programa(self, declaracoes):
+        return Programa(declaracoes)
+
+    def lista(self):
+        return []
+
+    def lista_de(self, item):
+        return [item]
+
+    def anexar(self, lista, item):
+        lista.append(item)
+        return lista
+
+    def bloco(self, inicio, comandos):
+        return comandos
+
+    def declaracao_funcao(self, funcao, tipo, nome, abre_paren, parametros, inicio, corpo):
+        return DeclaracaoFuncao(tipo, intern(nome.lexema), parametros, corpo)
+
+    def primeiro_parametro(self, tipo, nome):
+        return [(tipo, intern(nome.lexema))]
+
+    def anexar_parametro(self, parametros, tipo, nome):
+        parametros.append((tipo, intern(nome.lexema)))
+        return parametros
+
+    def declaracao_variavel(self, tipo, nome, valor_inicial=None):
+        return DeclaracaoVariavel(tipo, intern(nome.lexema), valor_inicial)
+
+    def atribuicao(self, nome, valor):
+        return Atribuicao(intern(nome.lexema), valor)
+
+    def comando_se(self, se, condicao, inicio, bloco_se, inicio_senao=None, bloco_senao=None):
+        return ComandoSe(condicao, bloco_se, bloco_senao)
+
+    def comando_enquanto(self, enquanto, condicao, inicio, corpo):
+        return ('ENQUANTO', condicao, corpo)
+
+    def comando_para(self, para, inicializacao, condicao, incremento, inicio, corpo):
+        return ('PARA', inicializacao, condicao, incremento, corpo)
+
+    def comando_escreva(self, escreva, expressao):
+        return ComandoEscreva(expressao)
+
+    def comando_leia(self, leia, nome):
+        return ComandoLeia(intern(nome.lexema))
+
+    def chamada_funcao(self, nome, argumentos):
+        return ChamadaFuncao(intern(nome.lexema), argumentos)
+
+    def retorne(self, retorne, valor=None):
+        return Retorne(valor)
+
+    def lexema(self, token):
+        return intern(token.lexema)
+
+    def comparacao(self, esquerda, operador, direita):
+        return ExpressaoBinaria(esquerda, operador, direita)
+
+    def binaria(self, esquerda, operador, direita):
+        return ExpressaoBinaria(esquerda, intern(operador.lexema), direita)
+
+    def unaria(self, menos, operando):
+        return ExpressaoUnaria('-', operando)
+
+    def inteiro(self, token):
+        return literal_inteiro(token.lexema)
+
+    def flutuante(self, token):
+        return literal_flutuante(token.lexema)
+
+    def string(self, token):
+        return literal_string(token.lexema)
+
+    def booleano(self, token):
+        return VERDADEIRO if token.lexema == 'verdadeiro' else FALSO
+
+    def identificador(self, token):
+        return Identificador(intern(token.lexema))
+
 class AnalisadorSLR:
-    def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+    # Não-terminais usados na recuperação de erros (modo pânico): a análise
+    # volta ao último estado que espera um deles e descarta tokens até um do
+    # seu FOLLOW
+    SINCRONIZACAO = ('COMANDO', 'DECLARACAO')
+
+    # Atributos produzidos por definir_gramatica/construir_tabelas que são
+    # compartilhados entre instâncias e gravados no cache em disco
+    CAMPOS_TABELAS = ('gramatica', 'nao_terminais', 'terminais', 'first', 'follow',
+                      'action_table', 'goto_table', 'conflitos',
+                      'indice_nao_terminal', 'regra_lhs', 'regra_tamanho',
+                      'action_base', 'action_proximo', 'action_verificacao', 'action_padrao',
+                      'goto_base', 'goto_proximo', 'goto_verificacao', 'goto_padrao')
+
+    # Diretório do cache em disco; SLR_CACHE_DIR='' desativa a gravação
+    diretorio_cache = os.environ.get(
+        'SLR_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '__pycache__'))
+
+    def __init__(self, tokens: Iterable[Token], ao_declarar: Optional[Callable[[No], None]] = None,
+                 arena: Optional['ArenaAST'] = None, max_erros: Optional[int] = MAX_ERROS):
+        # tokens pode ser uma lista ou um iterador (ex.: AnalisadorLexico.gerar_tokens),
+        # consumido sob demanda durante a análise. max_erros é o número de erros
+        # após o qual a análise para (None = sem limite); com mais de 1 ela se
+        # recupera de cada erro (ver _sincronizar), e com 1 para no primeiro
+        self.fluxo = not isinstance(tokens, Sequence)
+        self.tokens = iter(tokens) if self.fluxo else tokens
+        self.token: Optional[Token] = None  # último token lido, em modo fluxo
         self.pos = 0
         self.pilha = [0]  # Pilha de estados
         self.pilha_simbolos = []  # Pilha de símbolos/valores
         self.erros = []
-        
-        # Definir gramática
+        self.max_erros = max_erros
+        self.interrompida = False  # parou por ter atingido max_erros
+        # Contadores da última análise (ver metricas.Metricas)
+        self.deslocamentos = 0
+        self.reducoes = 0
+        self.profundidade_maxima = 0  # só com medir_pilha
+        self.medir_pilha = False
+        
+        # Gramática e tabelas SLR (construídas uma vez por processo)
+        self.carregar_tabelas()
+
+        if arena is not None:
+            self.usar_arena(arena)
+        if ao_declarar is not None:
+            self.entregar_declaracoes(ao_declarar)
+
+    def usar_arena(self, arena: 'ArenaAST'):
+        """Monta a AST em arena (ast_arena.ArenaAST); analisar() devolve o handle da raiz"""
+        self.arena = arena
+        self.acoes_semanticas = arena.acoes_semanticas(self.gramatica)
+
+    def entregar_declaracoes(self, ao_declarar: Callable[[No], None]):
+        """Repassa cada declaração de topo a ao_declarar assim que é reduzida.
+
+        As declarações não ficam em Programa.declaracoes, de modo que a memória
+        usada pela análise depende só da profundidade da pilha.
+        """
+        def declarar(v):
+            ao_declarar(v[1])
+            return v[0]
+
+        regra = self.gramatica.index(('DECLARACOES', ['DECLARACOES', 'DECLARACAO']))
+        self.acoes_semanticas = list(self.acoes_semanticas)
+        self.acoes_semanticas[regra] = declarar
+
+    def tabelas_recuperacao(self) -> dict:
+        """Tabelas da análise com recuperação de erros, construídas uma vez por processo.
+
+        A ACTION é compactada sem reduções padrão: o erro é detectado antes de
+        qualquer redução indevida, e a pilha é a do ponto do erro. Em
+        'sincronizacao' ficam, por estado, os pares (destino do GOTO, colunas
+        do FOLLOW) dos não-terminais de SINCRONIZACAO.
+        """
+        cls = type(self)
+        tabelas = cls.__dict__.get('_recuperacao')
+        if tabelas is None:
+            linhas = [{TokenType[t].indice: codificar_acao(e) for t, e in acoes.items()}
+                      for _, acoes in sorted(self.action_table.items())]
+            base, proximo, verificacao = compactar_linhas(linhas, len(TokenType))
+            sincronizacao = {}
+            for estado, gotos in self.goto_table.items():
+                for nao_terminal in self.SINCRONIZACAO:
+                    if nao_terminal in gotos:
+                        follow = frozenset(TokenType[t].indice for t in self.follow[nao_terminal])
+                        sincronizacao.setdefault(estado, []).append((gotos[nao_terminal], follow))
+            tabelas = cls._recuperacao = {
+                'action_base': base, 'action_proximo': proximo, 'action_verificacao': verificacao,
+                'action_padrao': array('i', [ERRO] * len(linhas)), 'sincronizacao': sincronizacao,
+                'atalhos_unitarios': {},
+            }
+        return tabelas
+
+    def carregar_tabelas(self):
+        """Associa à instância as tabelas compartilhadas da classe"""
+        cls = type(self)
+        tabelas = cls.__dict__.get('_tabelas')
+        if tabelas is None:
+            tabelas = self._obter_tabelas()
+            cls._tabelas = tabelas
+        self.__dict__.update(tabelas)
+
+    def _obter_tabelas(self) -> dict:
+        """Lê as tabelas do cache em disco ou as constrói e grava"""
         self.definir_gramatica()
-        
-        # Construir tabelas SLR
-        self.construir_tabelas()
+        chave = self.hash_gramatica()
+        caminho = None
+        tabelas = None
+        if self.diretorio_cache:
+            caminho = os.path.join(self.diretorio_cache, f'tabelas_slr-{chave[:16]}.pickle')
+            tabelas = self._ler_cache(caminho, chave)
+        if tabelas is None:
+            self.construir_tabelas()
+            tabelas = {campo: getattr(self, campo) for campo in self.CAMPOS_TABELAS}
+            if caminho:
+                self._gravar_cache(caminho, chave, tabelas)
+        tabelas['acoes_semanticas'] = self.acoes_semanticas
+        tabelas['atalhos_unitarios'] = {}  # preenchido sob demanda (ver _cadeia_unitaria)
+        return tabelas
+
+    def hash_gramatica(self) -> str:
+        """Hash da gramática, da ordem dos TokenType e da versão das tabelas"""
+        chave = (VERSAO_TABELAS, self.gramatica, [tipo.name for tipo in TokenType])
+        return hashlib.sha256(repr(chave).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _ler_cache(caminho: str, chave: str) -> Optional[dict]:
+        """Carrega tabelas do disco; None se ausentes, corrompidas ou de outra gramática"""
+        try:
+            with open(caminho, 'rb') as arquivo:
+                conteudo = pickle.load(arquivo)
+        except Exception:  # arquivo truncado ou adulterado: pickle.load pode levantar quase tudo
+            return None
+        if not isinstance(conteudo, dict) or conteudo.get('chave') != chave:
+            return None
+        tabelas = conteudo.get('tabelas')
+        return tabelas if isinstance(tabelas, dict) else None
+
+    @staticmethod
+    def _gravar_cache(caminho: str, chave: str, tabelas: dict):
+        """Grava as tabelas de forma atômica e remove caches de gramáticas antigas"""
+        diretorio = os.path.dirname(caminho)
+        try:
+            os.makedirs(diretorio, exist_ok=True)
+            fd, temporario = tempfile.mkstemp(dir=diretorio, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as arquivo:
+                pickle.dump({'chave': chave, 'tabelas': tabelas}, arquivo, pickle.HIGHEST_PROTOCOL)
+            os.replace(temporario, caminho)
+            for nome in os.listdir(diretorio):
+                antigo = os.path.join(diretorio, nome)
+                if nome.startswith('tabelas_slr-') and antigo != caminho:
+                    os.remove(antigo)
+        except OSError:
+            pass  # cache em disco é opcional
     
     def definir_gramatica(self):
         """Define a gramática da linguagem"""
@@ -36,9 +444,9 @@ class AnalisadorSLR:
             # 0: S' -> PROGRAMA
             ("S'", ['PROGRAMA']),
             
-            # 1-2: PROGRAMA
+            # 1-3: PROGRAMA (listas com recursão à esquerda mantêm a pilha rasa)
             ('PROGRAMA', ['DECLARACOES']),
-            ('DECLARACOES', ['DECLARACAO', 'DECLARACOES']),
+            ('DECLARACOES', ['DECLARACOES', 'DECLARACAO']),
             ('DECLARACOES', []),
             
             # 4-6: DECLARACAO
@@ -55,13 +463,13 @@ class AnalisadorSLR:
             ('PARAMETROS', ['LISTA_PARAMETROS']),
             ('PARAMETROS', []),
             ('LISTA_PARAMETROS', ['TIPO', 'IDENTIFICADOR']),
-            ('LISTA_PARAMETROS', ['TIPO', 'IDENTIFICADOR', 'VIRGULA', 'LISTA_PARAMETROS']),
+            ('LISTA_PARAMETROS', ['LISTA_PARAMETROS', 'VIRGULA', 'TIPO', 'IDENTIFICADOR']),
             
             # 12-22: COMANDOS
-            ('COMANDOS', ['COMANDO', 'COMANDOS']),
+            ('COMANDOS', ['COMANDOS', 'COMANDO']),
             ('COMANDOS', []),
             ('COMANDO', ['DECLARACAO_VAR']),
-            ('COMANDO', ['ATRIBUICAO']),
+            ('COMANDO', ['COMANDO_ATRIBUICAO']),
             ('COMANDO', ['COMANDO_SE']),
             ('COMANDO', ['COMANDO_ENQUANTO']),
             ('COMANDO', ['COMANDO_PARA']),
@@ -74,8 +482,8 @@ class AnalisadorSLR:
             ('DECLARACAO_VAR', ['TIPO', 'IDENTIFICADOR']),
             ('DECLARACAO_VAR', ['TIPO', 'IDENTIFICADOR', 'ATRIBUICAO', 'EXPRESSAO']),
             
-            # 25: ATRIBUICAO
-            ('ATRIBUICAO', ['IDENTIFICADOR', 'ATRIBUICAO', 'EXPRESSAO']),
+            # 25: COMANDO_ATRIBUICAO (o terminal ':=' se chama ATRIBUICAO)
+            ('COMANDO_ATRIBUICAO', ['IDENTIFICADOR', 'ATRIBUICAO', 'EXPRESSAO']),
             
             # 26-27: COMANDO_SE
             ('COMANDO_SE', ['SE', 'EXPRESSAO', 'INICIO', 'COMANDOS', 'FIM']),
@@ -85,7 +493,7 @@ class AnalisadorSLR:
             ('COMANDO_ENQUANTO', ['ENQUANTO', 'EXPRESSAO', 'FACA', 'INICIO', 'COMANDOS', 'FIM']),
             
             # 29: COMANDO_PARA
-            ('COMANDO_PARA', ['PARA', 'ATRIBUICAO', 'FACA', 'EXPRESSAO', 'FACA', 'ATRIBUICAO', 'FACA', 'INICIO', 'COMANDOS', 'FIM']),
+            ('COMANDO_PARA', ['PARA', 'COMANDO_ATRIBUICAO', 'FACA', 'EXPRESSAO', 'FACA', 'COMANDO_ATRIBUICAO', 'FACA', 'INICIO', 'COMANDOS', 'FIM']),
             
             # 30: COMANDO_ESCREVA
             ('COMANDO_ESCREVA', ['ESCREVA', 'ABRE_PAREN', 'EXPRESSAO', 'FECHA_PAREN']),
@@ -98,7 +506,7 @@ class AnalisadorSLR:
             ('ARGUMENTOS', ['LISTA_ARGUMENTOS']),
             ('ARGUMENTOS', []),
             ('LISTA_ARGUMENTOS', ['EXPRESSAO']),
-            ('LISTA_ARGUMENTOS', ['EXPRESSAO', 'VIRGULA', 'LISTA_ARGUMENTOS']),
+            ('LISTA_ARGUMENTOS', ['LISTA_ARGUMENTOS', 'VIRGULA', 'EXPRESSAO']),
             
             # 37: RETORNE
             ('RETORNE_CMD', ['RETORNE', 'EXPRESSAO']),
@@ -149,21 +557,200 @@ class AnalisadorSLR:
         self.nao_terminais = set()
         for regra in self.gramatica:
             self.nao_terminais.add(regra[0])
-    
+
+        # Terminais (nomes de TokenType); EOF faz o papel de '$'
+        self.terminais = {'EOF'}
+        for _, producao in self.gramatica:
+            for simbolo in producao:
+                if simbolo not in self.nao_terminais:
+                    self.terminais.add(simbolo)
+
+        self.definir_acoes_semanticas()
+
+    def definir_acoes_semanticas(self):
+        """Associa a cada regra a função que monta o nó da AST na redução (ver CONSTRUCOES)"""
+        self.acoes_semanticas = criar_acoes_semanticas(self.gramatica, ConstrutorAST())
+
     def construir_tabelas(self):
         """Constrói as tabelas ACTION e GOTO do SLR"""
 
         self.action_table = {}
         self.goto_table = {}
-        
-        # Inicializar tabelas básicas
+        self.conflitos = []
+
+        self.calcular_first()
+        self.calcular_follow()
+        self.construir_colecao_lr0()
         self._inicializar_tabelas()
-    
+        self.compactar_tabelas()
+
+    def calcular_first(self):
+        """Calcula FIRST de cada não-terminal ('' representa ε)"""
+        self.first = {nt: set() for nt in self.nao_terminais}
+        mudou = True
+        while mudou:
+            mudou = False
+            for nao_terminal, producao in self.gramatica:
+                antes = len(self.first[nao_terminal])
+                self.first[nao_terminal] |= self.first_sequencia(producao)
+                if len(self.first[nao_terminal]) != antes:
+                    mudou = True
+
+    def first_sequencia(self, simbolos) -> Set[str]:
+        """FIRST de uma sequência de símbolos"""
+        resultado = set()
+        for simbolo in simbolos:
+            if simbolo not in self.nao_terminais:
+                resultado.add(simbolo)
+                return resultado
+            resultado |= self.first[simbolo] - {''}
+            if '' not in self.first[simbolo]:
+                return resultado
+        resultado.add('')
+        return resultado
+
+    def calcular_follow(self):
+        """Calcula FOLLOW de cada não-terminal"""
+        self.follow = {nt: set() for nt in self.nao_terminais}
+        self.follow[self.gramatica[0][0]].add('EOF')
+        mudou = True
+        while mudou:
+            mudou = False
+            for nao_terminal, producao in self.gramatica:
+                for i, simbolo in enumerate(producao):
+                    if simbolo not in self.nao_terminais:
+                        continue
+                    antes = len(self.follow[simbolo])
+                    resto = self.first_sequencia(producao[i + 1:])
+                    self.follow[simbolo] |= resto - {''}
+                    if '' in resto:
+                        self.follow[simbolo] |= self.follow[nao_terminal]
+                    if len(self.follow[simbolo]) != antes:
+                        mudou = True
+
+    def fechamento(self, itens) -> frozenset:
+        """CLOSURE de um conjunto de itens LR(0) (regra, ponto)"""
+        resultado = set(itens)
+        pendentes = list(itens)
+        while pendentes:
+            regra, ponto = pendentes.pop()
+            producao = self.gramatica[regra][1]
+            if ponto < len(producao) and producao[ponto] in self.nao_terminais:
+                for i, (nao_terminal, _) in enumerate(self.gramatica):
+                    if nao_terminal == producao[ponto] and (i, 0) not in resultado:
+                        resultado.add((i, 0))
+                        pendentes.append((i, 0))
+        return frozenset(resultado)
+
+    def construir_colecao_lr0(self):
+        """Constrói a coleção canônica de conjuntos de itens LR(0)"""
+        inicial = self.fechamento([(0, 0)])
+        self.estados = [inicial]
+        self.transicoes = {}  # (estado, símbolo) -> estado
+        indices = {inicial: 0}
+        i = 0
+        while i < len(self.estados):
+            avancos = {}
+            for regra, ponto in self.estados[i]:
+                producao = self.gramatica[regra][1]
+                if ponto < len(producao):
+                    avancos.setdefault(producao[ponto], []).append((regra, ponto + 1))
+            for simbolo in sorted(avancos):
+                destino = self.fechamento(avancos[simbolo])
+                if destino not in indices:
+                    indices[destino] = len(self.estados)
+                    self.estados.append(destino)
+                self.transicoes[(i, simbolo)] = indices[destino]
+            i += 1
+
     def _inicializar_tabelas(self):
-        """Inicializa tabelas ACTION e GOTO simplificadas"""
+        """Preenche ACTION e GOTO a partir da coleção LR(0) e dos FOLLOW.
+
+        Conflitos shift/reduce são resolvidos a favor do shift (caso de
+        'retorne' seguido de expressão); reduce/reduce, a favor da regra de
+        menor número. Ambos ficam registrados em self.conflitos.
+        """
+        for estado in range(len(self.estados)):
+            self.action_table[estado] = {}
+            self.goto_table[estado] = {}
+
+        for (estado, simbolo), destino in self.transicoes.items():
+            if simbolo in self.nao_terminais:
+                self.goto_table[estado][simbolo] = destino
+            else:
+                self.action_table[estado][simbolo] = ActionEntry(Action.SHIFT, destino)
+
+        for estado, itens in enumerate(self.estados):
+            acoes = self.action_table[estado]
+            for regra, ponto in sorted(itens):
+                nao_terminal, producao = self.gramatica[regra]
+                if ponto < len(producao):
+                    continue
+                if regra == 0:
+                    acoes['EOF'] = ActionEntry(Action.ACCEPT)
+                    continue
+                for terminal in sorted(self.follow[nao_terminal]):
+                    existente = acoes.get(terminal)
+                    if existente is None:
+                        acoes[terminal] = ActionEntry(Action.REDUCE, regra)
+                    elif existente.action != Action.REDUCE or existente.value != regra:
+                        self.conflitos.append((estado, terminal, existente, regra))
+
+    def compactar_tabelas(self):
+        """Gera as tabelas ACTION/GOTO inteiras e compactadas usadas no parse.
+
+        Terminais são indexados por TokenType.indice e não-terminais por
+        self.indice_nao_terminal. Em cada estado a redução mais frequente vira
+        a ação padrão (default reduction) e sai da linha; no GOTO, cada
+        não-terminal tem como padrão o destino mais comum.
+        """
+        colunas = len(TokenType)
+        self.indice_nao_terminal = {nt: i for i, nt in enumerate(sorted(self.nao_terminais))}
+        self.regra_lhs = array('i', [self.indice_nao_terminal[nt] for nt, _ in self.gramatica])
+        self.regra_tamanho = array('i', [len(producao) for _, producao in self.gramatica])
+
+        linhas = []
+        self.action_padrao = array('i', [ERRO] * len(self.action_table))
+        for estado, acoes in sorted(self.action_table.items()):
+            linha = {TokenType[t].indice: codificar_acao(e) for t, e in acoes.items()}
+            reducoes = Counter(c for c in linha.values() if c < ACEITAR)
+            if reducoes:
+                padrao = max(reducoes, key=lambda c: (reducoes[c], c))
+                self.action_padrao[estado] = padrao
+                linha = {c: v for c, v in linha.items() if v != padrao}
+            linhas.append(linha)
+        self.action_base, self.action_proximo, self.action_verificacao = compactar_linhas(linhas, colunas)
+
+        linhas = []
+        self.goto_padrao = array('i', [0] * len(self.indice_nao_terminal))
+        for nao_terminal, i in self.indice_nao_terminal.items():
+            destinos = {e: g[nao_terminal] for e, g in self.goto_table.items() if nao_terminal in g}
+            if destinos:
+                contagem = Counter(destinos.values())
+                padrao = max(contagem, key=lambda d: (contagem[d], -d))
+                self.goto_padrao[i] = padrao
+                destinos = {e: d for e, d in destinos.items() if d != padrao}
+            linhas.append(destinos)
+        self.goto_base, self.goto_proximo, self.goto_verificacao = compactar_linhas(linhas, len(self.action_table))
+
+    def tamanho_tabelas(self) -> Dict[str, int]:
+        """Bytes ocupados pelas tabelas em dicionário e pelas compactadas"""
+        def tamanho(obj):
+            total = sys.getsizeof(obj)
+            if isinstance(obj, dict):
+                for chave, valor in obj.items():
+                    total += tamanho(chave) + tamanho(valor)
+            elif isinstance(obj, ActionEntry):
+                total += sys.getsizeof(obj.__dict__)
+            return total
+
+        compactas = ('action_base', 'action_proximo', 'action_verificacao', 'action_padrao',
+                     'goto_base', 'goto_proximo', 'goto_verificacao', 'goto_padrao')
+        return {
+            'dict': tamanho(self.action_table) + tamanho(self.goto_table),
+            'array': sum(sys.getsizeof(getattr(self, campo)) for campo in compactas),
+        }
 
-        pass
-    
     def analisar(self):
         """Executa a análise SLR"""
         try:
@@ -171,380 +758,193 @@ class AnalisadorSLR:
         except Exception as e:
             self.erros.append(f"Erro durante análise SLR: {str(e)}")
             return None
-    
+
     def _analisar_slr(self):
-        """Implementação do algoritmo SLR"""
-        
-        # Reiniciar posição
+        """Implementação do algoritmo SLR: laço shift/reduce sobre as pilhas"""
         self.pos = 0
-        
-        # Analisar programa
-        return self.parse_programa()
-    
+        self.pilha = pilha = PilhaMedida([0]) if self.medir_pilha else [0]
+        self.pilha_simbolos = simbolos = []
+
+        if self.max_erros == 1:
+            action_base = self.action_base
+            action_proximo = self.action_proximo
+            action_verificacao = self.action_verificacao
+            action_padrao = self.action_padrao
+            atalhos = self.atalhos_unitarios
+        else:
+            recuperacao = self.tabelas_recuperacao()
+            action_base = recuperacao['action_base']
+            action_proximo = recuperacao['action_proximo']
+            action_verificacao = recuperacao['action_verificacao']
+            action_padrao = recuperacao['action_padrao']
+            atalhos = recuperacao['atalhos_unitarios']
+        action = (action_base, action_proximo, action_verificacao, action_padrao)
+        goto_base = self.goto_base
+        goto_proximo = self.goto_proximo
+        goto_verificacao = self.goto_verificacao
+        goto_padrao = self.goto_padrao
+        regra_lhs = self.regra_lhs
+        regra_tamanho = self.regra_tamanho
+        acoes_semanticas = self.acoes_semanticas
+        proximo = iter(self.tokens).__next__
+        pos = 0
+        self.token = token = proximo()
+        coluna = token.tipo.indice
+        estado = 0
+        estado_lookahead = 0  # estado antes das reduções padrão, para o diagnóstico
+        reducoes = 0
+        silencio = 0  # deslocamentos que faltam para voltar a reportar erros
+
+        while True:
+            i = action_base[estado] + coluna
+            codigo = action_proximo[i] if action_verificacao[i] == estado else action_padrao[estado]
+
+            if codigo > 0:
+                estado = estado_lookahead = codigo - 1
+                pilha.append(estado)
+                simbolos.append(token)
+                pos += 1
+                if silencio:
+                    silencio -= 1
+                token = proximo()  # EOF nunca é deslocado, então há sempre um próximo
+                coluna = token.tipo.indice
+            elif codigo < ACEITAR:
+                regra = -codigo - 1
+                acao = acoes_semanticas[regra]
+                if acao is None:
+                    # Regra unitária: o valor no topo permanece, só o estado muda.
+                    # A cadeia de unitárias que se segue (ex.: FATOR -> TERMO ->
+                    # EXPR_ARIT -> EXPR_COMP após um operando) só depende do
+                    # estado abaixo do topo e do lookahead, e é feita de uma vez
+                    chave = (estado, pilha[-2], coluna)
+                    atalho = atalhos.get(chave)
+                    if atalho is None:
+                        atalho = atalhos[chave] = self._cadeia_unitaria(regra, pilha[-2], coluna, action)
+                    estado, passos = atalho
+                    pilha[-1] = estado
+                    reducoes += passos
+                    continue
+                reducoes += 1
+                tamanho = regra_tamanho[regra]
+                if tamanho:
+                    valores = simbolos[-tamanho:]
+                    del simbolos[-tamanho:]
+                    del pilha[-tamanho:]
+                    simbolos.append(acao(valores))
+                    anterior = pilha[-1]
+                else:
+                    simbolos.append(acao(()))
+                    anterior = estado
+                nao_terminal = regra_lhs[regra]
+                j = goto_base[nao_terminal] + anterior
+                estado = goto_proximo[j] if goto_verificacao[j] == nao_terminal else goto_padrao[nao_terminal]
+                pilha.append(estado)
+            elif codigo == ACEITAR:
+                self._encerrar(pos, token, reducoes, pilha)
+                return None if self.erros else simbolos[-1]
+            elif silencio:
+                # Erro logo após uma recuperação: descarta o token sem reportar
+                if token.tipo == TokenType.EOF:
+                    self._encerrar(pos, token, reducoes, pilha)
+                    return None
+                token = proximo()
+                coluna = token.tipo.indice
+            else:
+                self.erro_sintatico(token, estado_lookahead)
+                if self.max_erros is not None and len(self.erros) >= self.max_erros:
+                    self.interrompida = True
+                    self._encerrar(pos, token, reducoes, pilha)
+                    return None
+                # Com erro a AST é descartada, então as ações não montam mais nós
+                acoes_semanticas = [None if acao is None else _descartar for acao in acoes_semanticas]
+                destino = self._sincronizar(pilha, simbolos, coluna)
+                while destino < 0:
+                    if token.tipo == TokenType.EOF:
+                        self._encerrar(pos, token, reducoes, pilha)
+                        return None
+                    token = proximo()
+                    coluna = token.tipo.indice
+                    if action_verificacao[action_base[estado] + coluna] == estado:
+                        destino = estado  # o próprio estado do erro aceita o token
+                    else:
+                        destino = self._sincronizar(pilha, simbolos, coluna)
+                estado = estado_lookahead = destino
+                silencio = 3
+
+    def _cadeia_unitaria(self, regra: int, anterior: int, coluna: int, action: tuple) -> Tuple[int, int]:
+        """Aplica a regra unitária e as que vierem em seguida com o mesmo lookahead.
+
+        Numa redução unitária o estado abaixo do topo (anterior) não muda, então
+        a cadeia inteira é função de (estado, anterior, coluna). Devolve o
+        estado ao fim da cadeia e o número de reduções feitas.
+        """
+        base, proximo, verificacao, padrao = action
+        passos = 0
+        while True:
+            nao_terminal = self.regra_lhs[regra]
+            j = self.goto_base[nao_terminal] + anterior
+            estado = self.goto_proximo[j] if self.goto_verificacao[j] == nao_terminal else self.goto_padrao[nao_terminal]
+            passos += 1
+            i = base[estado] + coluna
+            codigo = proximo[i] if verificacao[i] == estado else padrao[estado]
+            if codigo >= ACEITAR or self.acoes_semanticas[-codigo - 1] is not None:
+                return estado, passos
+            regra = -codigo - 1
+
+    def _encerrar(self, pos: int, token: Token, reducoes: int, pilha: list):
+        self.pos = self.deslocamentos = pos
+        self.token = token
+        self.reducoes = reducoes
+        self.profundidade_maxima = getattr(pilha, 'maximo', 0)
+
+    def _sincronizar(self, pilha: list, simbolos: list, coluna: int) -> int:
+        """Recuperação em modo pânico para o token de coluna dada.
+
+        Procura, do topo para a base da pilha, um estado com GOTO num
+        não-terminal de SINCRONIZACAO cujo FOLLOW contenha o token; desempilha
+        até ele e empilha o GOTO com valor None, como se o não-terminal tivesse
+        sido reconhecido. Devolve o novo estado, ou -1 se nenhum serve.
+        """
+        sincronizacao = self.tabelas_recuperacao()['sincronizacao']
+        for profundidade in range(len(pilha) - 1, -1, -1):
+            for destino, follow in sincronizacao.get(pilha[profundidade], ()):
+                if coluna in follow:
+                    del pilha[profundidade + 1:]
+                    del simbolos[profundidade:]
+                    pilha.append(destino)
+                    simbolos.append(None)
+                    return destino
+        return -1
+
     def token_atual(self) -> Token:
         """Retorna o token atual"""
+        if self.fluxo:
+            return self.token
         if self.pos < len(self.tokens):
             return self.tokens[self.pos]
         return self.tokens[-1]  # EOF
-    
+
     def avancar(self):
         """Avança para o próximo token"""
-        if self.pos < len(self.tokens) - 1:
+        if self.fluxo:
+            if self.token is None or self.token.tipo != TokenType.EOF:
+                self.token = next(self.tokens)
+                self.pos += 1
+        elif self.pos < len(self.tokens) - 1:
             self.pos += 1
-    
-    def esperar(self, tipo: TokenType) -> bool:
-        """Verifica se o token atual é do tipo esperado"""
-        if self.token_atual().tipo == tipo:
-            self.avancar()
-            return True
+
+    def esperados(self, estado: int) -> List[str]:
+        """Terminais aceitos pela tabela ACTION no estado dado"""
+        return [TokenType[t].value for t in sorted(self.action_table[estado])]
+
+    def erro_sintatico(self, token: Token, estado: int):
+        """Registra um erro sintático com os terminais esperados"""
+        encontrado = token.lexema if token.tipo != TokenType.EOF else 'EOF'
         self.erros.append(
-            f"Erro sintático na linha {self.token_atual().linha}: "
-            f"Esperado '{tipo.value}', encontrado '{self.token_atual().lexema}'"
+            f"Erro sintático na linha {token.linha}: "
+            f"encontrado '{encontrado}', esperado um de: {', '.join(self.esperados(estado))}"
         )
-        return False
-    
-    # ===== Métodos de parsing (simulando comportamento SLR) =====
-    
-    def parse_programa(self) -> Programa:
-        """PROGRAMA -> DECLARACOES"""
-        declaracoes = []
-        
-        while self.token_atual().tipo != TokenType.EOF:
-            if self.token_atual().tipo == TokenType.FUNCAO:
-                declaracoes.append(self.parse_declaracao_funcao())
-            elif self.token_atual().tipo == TokenType.INICIO:
-                declaracoes.append(self.parse_bloco_principal())
-            else:
-                self.erros.append(
-                    f"Erro sintático na linha {self.token_atual().linha}: "
-                    f"Declaração inválida"
-                )
-                self.avancar()
-        
-        return Programa(declaracoes)
-    
-    def parse_bloco_principal(self):
-        """BLOCO_PRINCIPAL -> inicio COMANDOS fim"""
-        self.esperar(TokenType.INICIO)
-        comandos = self.parse_comandos()
-        self.esperar(TokenType.FIM)
-        return comandos
-    
-    def parse_declaracao_funcao(self) -> DeclaracaoFuncao:
-        """DECLARACAO_FUNCAO -> funcao TIPO id ( PARAMETROS ) inicio COMANDOS fim"""
-        self.esperar(TokenType.FUNCAO)
-        
-        tipo_retorno = self.parse_tipo()
-        nome = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        
-        self.esperar(TokenType.ABRE_PAREN)
-        parametros = self.parse_parametros()
-        self.esperar(TokenType.FECHA_PAREN)
-        
-        self.esperar(TokenType.INICIO)
-        corpo = self.parse_comandos()
-        self.esperar(TokenType.FIM)
-        
-        return DeclaracaoFuncao(tipo_retorno, nome, parametros, corpo)
-    
-    def parse_parametros(self) -> List[tuple]:
-        """PARAMETROS -> LISTA_PARAMETROS | ε"""
-        parametros = []
-        
-        if self.token_atual().tipo in [TokenType.INTEIRO, TokenType.FLUTUANTE, 
-                                        TokenType.LOGICO, TokenType.CADEIA]:
-            parametros = self.parse_lista_parametros()
-        
-        return parametros
-    
-    def parse_lista_parametros(self) -> List[tuple]:
-        """LISTA_PARAMETROS -> TIPO id | TIPO id , LISTA_PARAMETROS"""
-        parametros = []
-        
-        tipo = self.parse_tipo()
-        nome = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        parametros.append((tipo, nome))
-        
-        while self.token_atual().tipo == TokenType.VIRGULA:
-            self.avancar()
-            tipo = self.parse_tipo()
-            nome = self.token_atual().lexema
-            self.esperar(TokenType.IDENTIFICADOR)
-            parametros.append((tipo, nome))
-        
-        return parametros
-    
-    def parse_comandos(self) -> List[No]:
-        """COMANDOS -> COMANDO COMANDOS | ε"""
-        comandos = []
-        
-        while self.token_atual().tipo not in [TokenType.FIM, TokenType.EOF]:
-            comando = self.parse_comando()
-            if comando:
-                comandos.append(comando)
-            else:
-                break
-        
-        return comandos
-    
-    def parse_comando(self) -> Optional[No]:
-        """COMANDO -> DECLARACAO_VAR | ATRIBUICAO | COMANDO_SE | ..."""
-        tipo_token = self.token_atual().tipo
-        
-        if tipo_token in [TokenType.INTEIRO, TokenType.FLUTUANTE, 
-                          TokenType.LOGICO, TokenType.CADEIA]:
-            return self.parse_declaracao_var()
-        elif tipo_token == TokenType.IDENTIFICADOR:
-            return self.parse_atribuicao_ou_chamada()
-        elif tipo_token == TokenType.SE:
-            return self.parse_comando_se()
-        elif tipo_token == TokenType.ENQUANTO:
-            return self.parse_comando_enquanto()
-        elif tipo_token == TokenType.PARA:
-            return self.parse_comando_para()
-        elif tipo_token == TokenType.ESCREVA:
-            return self.parse_comando_escreva()
-        elif tipo_token == TokenType.LEIA:
-            return self.parse_comando_leia()
-        elif tipo_token == TokenType.RETORNE:
-            return self.parse_retorne()
-        else:
-            return None
-    
-    def parse_declaracao_var(self) -> DeclaracaoVariavel:
-        """DECLARACAO_VAR -> TIPO id | TIPO id := EXPRESSAO"""
-        tipo = self.parse_tipo()
-        nome = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        
-        valor_inicial = None
-        if self.token_atual().tipo == TokenType.ATRIBUICAO:
-            self.avancar()
-            valor_inicial = self.parse_expressao()
-        
-        return DeclaracaoVariavel(tipo, nome, valor_inicial)
-    
-    def parse_atribuicao_ou_chamada(self):
-        """ATRIBUICAO -> id := EXPRESSAO | CHAMADA_FUNCAO"""
-        nome = self.token_atual().lexema
-        self.avancar()
-        
-        if self.token_atual().tipo == TokenType.ATRIBUICAO:
-            self.avancar()
-            valor = self.parse_expressao()
-            return Atribuicao(nome, valor)
-        elif self.token_atual().tipo == TokenType.ABRE_PAREN:
-            self.avancar()
-            argumentos = self.parse_argumentos()
-            self.esperar(TokenType.FECHA_PAREN)
-            return ChamadaFuncao(nome, argumentos)
-        else:
-            self.erros.append(
-                f"Erro sintático na linha {self.token_atual().linha}: "
-                f"Esperado ':=' ou '('"
-            )
-            return None
-    
-    def parse_comando_se(self) -> ComandoSe:
-        """COMANDO_SE -> se EXPRESSAO inicio COMANDOS fim [senao inicio COMANDOS fim]"""
-        self.esperar(TokenType.SE)
-        condicao = self.parse_expressao()
-        self.esperar(TokenType.INICIO)
-        bloco_se = self.parse_comandos()
-        self.esperar(TokenType.FIM)
-        
-        bloco_senao = None
-        if self.token_atual().tipo == TokenType.SENAO:
-            self.avancar()
-            self.esperar(TokenType.INICIO)
-            bloco_senao = self.parse_comandos()
-            self.esperar(TokenType.FIM)
-        
-        return ComandoSe(condicao, bloco_se, bloco_senao)
-    
-    def parse_comando_enquanto(self):
-        """COMANDO_ENQUANTO -> enquanto EXPRESSAO faca inicio COMANDOS fim"""
-        self.esperar(TokenType.ENQUANTO)
-        condicao = self.parse_expressao()
-        self.esperar(TokenType.FACA)
-        self.esperar(TokenType.INICIO)
-        corpo = self.parse_comandos()
-        self.esperar(TokenType.FIM)
-        return ('ENQUANTO', condicao, corpo)
-    
-    def parse_comando_para(self):
-        """COMANDO_PARA -> para ATRIBUICAO faca EXPRESSAO faca ATRIBUICAO faca inicio COMANDOS fim"""
-        self.esperar(TokenType.PARA)
-        
-        # Inicialização
-        nome_var = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        self.esperar(TokenType.ATRIBUICAO)
-        valor_inicial = self.parse_expressao()
-        inicializacao = Atribuicao(nome_var, valor_inicial)
-        
-        self.esperar(TokenType.FACA)
-        
-        # Condição
-        condicao = self.parse_expressao()
-        
-        self.esperar(TokenType.FACA)
-        
-        # Incremento
-        nome_var_inc = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        self.esperar(TokenType.ATRIBUICAO)
-        valor_inc = self.parse_expressao()
-        incremento = Atribuicao(nome_var_inc, valor_inc)
-        
-        self.esperar(TokenType.FACA)
-        self.esperar(TokenType.INICIO)
-        corpo = self.parse_comandos()
-        self.esperar(TokenType.FIM)
-        
-        return ('PARA', inicializacao, condicao, incremento, corpo)
-    
-    def parse_comando_escreva(self) -> ComandoEscreva:
-        """COMANDO_ESCREVA -> escreva ( EXPRESSAO )"""
-        self.esperar(TokenType.ESCREVA)
-        self.esperar(TokenType.ABRE_PAREN)
-        expressao = self.parse_expressao()
-        self.esperar(TokenType.FECHA_PAREN)
-        return ComandoEscreva(expressao)
-    
-    def parse_comando_leia(self) -> ComandoLeia:
-        """COMANDO_LEIA -> leia ( id )"""
-        self.esperar(TokenType.LEIA)
-        self.esperar(TokenType.ABRE_PAREN)
-        variavel = self.token_atual().lexema
-        self.esperar(TokenType.IDENTIFICADOR)
-        self.esperar(TokenType.FECHA_PAREN)
-        return ComandoLeia(variavel)
-    
-    def parse_argumentos(self) -> List[No]:
-        """ARGUMENTOS -> LISTA_ARGUMENTOS | ε"""
-        argumentos = []
-        
-        if self.token_atual().tipo != TokenType.FECHA_PAREN:
-            argumentos.append(self.parse_expressao())
-            
-            while self.token_atual().tipo == TokenType.VIRGULA:
-                self.avancar()
-                argumentos.append(self.parse_expressao())
-        
-        return argumentos
-    
-    def parse_retorne(self) -> Retorne:
-        """RETORNE_CMD -> retorne EXPRESSAO | retorne"""
-        self.esperar(TokenType.RETORNE)
-        
-        valor = None
-        if self.token_atual().tipo not in [TokenType.FIM, TokenType.EOF]:
-            valor = self.parse_expressao()
-        
-        return Retorne(valor)
-    
-    def parse_tipo(self) -> str:
-        """TIPO -> inteiro | flutuante | logico | cadeia"""
-        tipo = self.token_atual().lexema
-        if self.token_atual().tipo in [TokenType.INTEIRO, TokenType.FLUTUANTE,
-                                        TokenType.LOGICO, TokenType.CADEIA]:
-            self.avancar()
-            return tipo
-        self.erros.append(f"Erro: tipo esperado na linha {self.token_atual().linha}")
-        return "erro"
-    
-    def parse_expressao(self) -> No:
-        """EXPRESSAO -> EXPR_COMP"""
-        return self.parse_expr_comparacao()
-    
-    def parse_expr_comparacao(self) -> No:
-        """EXPR_COMP -> EXPR_ARIT [OP_COMP EXPR_ARIT]"""
-        esquerda = self.parse_expr_aritmetica()
-        
-        if self.token_atual().tipo in [TokenType.MAIOR, TokenType.MENOR,
-                                        TokenType.MAIOR_IGUAL, TokenType.MENOR_IGUAL,
-                                        TokenType.IGUAL, TokenType.DIFERENTE]:
-            operador = self.token_atual().lexema
-            self.avancar()
-            direita = self.parse_expr_aritmetica()
-            return ExpressaoBinaria(esquerda, operador, direita)
-        
-        return esquerda
-    
-    def parse_expr_aritmetica(self) -> No:
-        """EXPR_ARIT -> TERMO ((+ | -) TERMO)*"""
-        esquerda = self.parse_termo()
-        
-        while self.token_atual().tipo in [TokenType.ADICAO, TokenType.SUBTRACAO]:
-            operador = self.token_atual().lexema
-            self.avancar()
-            direita = self.parse_termo()
-            esquerda = ExpressaoBinaria(esquerda, operador, direita)
-        
-        return esquerda
-    
-    def parse_termo(self) -> No:
-        """TERMO -> FATOR ((* | /) FATOR)*"""
-        esquerda = self.parse_fator()
-        
-        while self.token_atual().tipo in [TokenType.MULTIPLICACAO, TokenType.DIVISAO]:
-            operador = self.token_atual().lexema
-            self.avancar()
-            direita = self.parse_fator()
-            esquerda = ExpressaoBinaria(esquerda, operador, direita)
-        
-        return esquerda
-    
-    def parse_fator(self) -> No:
-        """FATOR -> CONST | id | CHAMADA | ( EXPRESSAO ) | - FATOR"""
-        token = self.token_atual()
-        
-        if token.tipo == TokenType.CONST_INTEIRO:
-            self.avancar()
-            return Numero(int(token.lexema))
-        elif token.tipo == TokenType.CONST_FLOAT:
-            self.avancar()
-            return Numero(float(token.lexema))
-        elif token.tipo == TokenType.CONST_STRING:
-            self.avancar()
-            return String(token.lexema)
-        elif token.tipo == TokenType.CONST_BOOL:
-            self.avancar()
-            return Booleano(token.lexema == 'verdadeiro')
-        elif token.tipo == TokenType.IDENTIFICADOR:
-            nome = token.lexema
-            self.avancar()
-            if self.token_atual().tipo == TokenType.ABRE_PAREN:
-                self.avancar()
-                argumentos = self.parse_argumentos()
-                self.esperar(TokenType.FECHA_PAREN)
-                return ChamadaFuncao(nome, argumentos)
-            return Identificador(nome)
-        elif token.tipo == TokenType.ABRE_PAREN:
-            self.avancar()
-            expr = self.parse_expressao()
-            self.esperar(TokenType.FECHA_PAREN)
-            return expr
-        elif token.tipo == TokenType.SUBTRACAO:
-            self.avancar()
-            operando = self.parse_fator()
-            return ExpressaoUnaria('-', operando)
-        else:
-            self.erros.append(
-                f"Erro sintático na linha {token.linha}: "
-                f"Fator inválido '{token.lexema}'"
-            )
-            self.avancar()
-            return Numero(0)
-    
+
     def imprimir_erros(self):
         """Imprime os erros encontrados"""
-        if not self.erros:
-            print("✓ Nenhum erro sintático encontrado")
-        else:
-            print(f"✗ {len(self.erros)} erro(s) sintático(s) encontrado(s):")
-            for erro in self.erros:
-                print(f"  - {erro}")
+        print('\n'.join(formatar_erros(self.erros)))
@@ -0,0 +1,486 @@
+from array import array
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from AnalisadorSLR import criar_acoes_semanticas
+from ast_nodes import *
+
+try:
+    import numpy as np
+except ImportError:  # consultas caem para laços em Python
+    np = None
+
+# Tipos de nó da arena; os nomes seguem as classes de ast_nodes
+PROGRAMA = 0
+BLOCO = 1
+DECLARACAO_FUNCAO = 2
+PARAMETROS = 3
+PARAMETRO = 4
+DECLARACAO_VARIAVEL = 5
+ATRIBUICAO = 6
+EXPRESSAO_BINARIA = 7
+EXPRESSAO_UNARIA = 8
+NUMERO = 9
+IDENTIFICADOR = 10
+STRING = 11
+BOOLEANO = 12
+COMANDO_ESCREVA = 13
+COMANDO_LEIA = 14
+COMANDO_SE = 15
+CHAMADA_FUNCAO = 16
+RETORNE = 17
+COMANDO_ENQUANTO = 18
+COMANDO_PARA = 19
+
+NOMES_TIPOS = ('Programa', 'Bloco', 'DeclaracaoFuncao', 'Parametros', 'Parametro',
+               'DeclaracaoVariavel', 'Atribuicao', 'ExpressaoBinaria', 'ExpressaoUnaria',
+               'Numero', 'Identificador', 'String', 'Booleano', 'ComandoEscreva',
+               'ComandoLeia', 'ComandoSe', 'ChamadaFuncao', 'Retorne', 'ENQUANTO', 'PARA')
+
+# Códigos da coluna de operadores
+OPERADORES_ARENA = ('+', '-', '*', '/', '>', '<', '>=', '<=', '==', '!=')
+CODIGO_OPERADOR = {op: i for i, op in enumerate(OPERADORES_ARENA)}
+SEM_OPERADOR = 0xFF
+
+# Campos de cada tipo, com os mesmos nomes de ast_nodes: (nome, origem), em
+# que origem é um índice de filho, 'filhos' (lista), 'filhos_desde_2'
+# (bloco opcional), 'valor', 'extra' ou 'operador'
+CAMPOS = {
+    PROGRAMA: (('declaracoes', 'filhos'),),
+    DECLARACAO_FUNCAO: (('tipo_retorno', 'extra'), ('nome', 'valor'), ('parametros', 0), ('corpo', 1)),
+    PARAMETRO: (('tipo', 'extra'), ('nome', 'valor')),
+    DECLARACAO_VARIAVEL: (('tipo', 'extra'), ('nome', 'valor'), ('valor_inicial', 'opcional')),
+    ATRIBUICAO: (('nome', 'valor'), ('valor', 0)),
+    EXPRESSAO_BINARIA: (('esquerda', 0), ('operador', 'operador'), ('direita', 1)),
+    EXPRESSAO_UNARIA: (('operador', 'operador'), ('operando', 0)),
+    NUMERO: (('valor', 'valor'),),
+    IDENTIFICADOR: (('nome', 'valor'),),
+    STRING: (('valor', 'valor'),),
+    BOOLEANO: (('valor', 'valor'),),
+    COMANDO_ESCREVA: (('expressao', 0),),
+    COMANDO_LEIA: (('variavel', 'valor'),),
+    COMANDO_SE: (('condicao', 0), ('bloco_se', 1), ('bloco_senao', 'opcional_2')),
+    CHAMADA_FUNCAO: (('nome', 'valor'), ('argumentos', 'filhos')),
+    RETORNE: (('valor', 'opcional'),),
+    COMANDO_ENQUANTO: (('condicao', 0), ('corpo', 1)),
+    COMANDO_PARA: (('inicializacao', 0), ('condicao', 1), ('incremento', 2), ('corpo', 3)),
+}
+
+class ArenaAST:
+    """AST em colunas: cada nó é um índice (handle) em arrays tipados.
+
+    Colunas por nó: tipo, operador, valor (índice no pool de literais e
+    nomes), extra (nome do tipo declarado), offset no código-fonte e a faixa
+    [primeiro, primeiro + quantidade) de seus filhos em self.filhos. Os nós
+    são criados de baixo para cima, então filhos têm handles menores que o
+    pai e passes sobre a árvore inteira são varreduras lineares das colunas.
+    """
+
+    def __init__(self):
+        self.tipos = array('B')
+        self.operadores = array('B')
+        self.valores = array('i')
+        self.extras = array('i')
+        self.offsets = array('i')
+        self.primeiros = array('i')
+        self.quantidades = array('i')
+        self.filhos = array('i')
+        self.literais: List = []
+        self._indice_literal: Dict = {}
+        self.raiz = -1  # handle do Programa, quando houver
+
+    def __len__(self):
+        return len(self.tipos)
+
+    # ===== Construção =====
+
+    def literal(self, valor) -> int:
+        """Índice de valor no pool (nomes e literais iguais são guardados uma vez)"""
+        chave = (type(valor), valor)
+        indice = self._indice_literal.get(chave)
+        if indice is None:
+            indice = self._indice_literal[chave] = len(self.literais)
+            self.literais.append(valor)
+        return indice
+
+    def adicionar(self, tipo: int, filhos=(), valor=None, extra=None,
+                  operador: Optional[str] = None, offset: int = -1) -> int:
+        """Cria um nó e devolve seu handle"""
+        self.tipos.append(tipo)
+        self.operadores.append(SEM_OPERADOR if operador is None else CODIGO_OPERADOR[operador])
+        self.valores.append(-1 if valor is None else self.literal(valor))
+        self.extras.append(-1 if extra is None else self.literal(extra))
+        self.offsets.append(offset)
+        self.primeiros.append(len(self.filhos))
+        self.quantidades.append(len(filhos))
+        self.filhos.extend(filhos)
+        return len(self.tipos) - 1
+
+    @classmethod
+    def de_ast(cls, programa: Programa) -> 'ArenaAST':
+        """Converte uma AST de ast_nodes (sem offsets) para a arena"""
+        arena = cls()
+        arena.raiz = arena.adicionar_ast(programa)
+        return arena
+
+    def adicionar_ast(self, raiz) -> int:
+        """Adiciona a subárvore de raiz (pós-ordem com pilha explícita)"""
+        resultados = []
+        pilha = [(raiz, False)]
+        while pilha:
+            no, visitado = pilha.pop()
+            if not visitado:
+                pilha.append((no, True))
+                for filho in reversed(self._filhos_ast(no)):
+                    pilha.append((filho, False))
+                continue
+            quantidade = len(self._filhos_ast(no))
+            filhos = resultados[len(resultados) - quantidade:]
+            del resultados[len(resultados) - quantidade:]
+            resultados.append(self._adicionar_no_ast(no, filhos))
+        return resultados[0]
+
+    @staticmethod
+    def _filhos_ast(no) -> list:
+        """Subárvores de um nó de ast_nodes, na ordem das colunas de filhos"""
+        if isinstance(no, list):
+            return no
+        if isinstance(no, tuple):
+            if no[0] == 'ENQUANTO':
+                return [no[1], no[2]]
+            if no[0] == 'PARA':
+                return [no[1], no[2], no[3], no[4]]
+            if no[0] == 'PARAMETROS':
+                return no[1]
+            return []  # parâmetro (tipo, nome)
+        if isinstance(no, Programa):
+            return no.declaracoes
+        if isinstance(no, DeclaracaoFuncao):
+            # Marca a lista de parâmetros para não confundi-la com um bloco
+            return [('PARAMETROS', no.parametros), no.corpo]
+        if isinstance(no, (DeclaracaoVariavel, Retorne)):
+            valor = no.valor_inicial if isinstance(no, DeclaracaoVariavel) else no.valor
+            return [] if valor is None else [valor]
+        if isinstance(no, Atribuicao):
+            return [no.valor]
+        if isinstance(no, ExpressaoBinaria):
+            return [no.esquerda, no.direita]
+        if isinstance(no, ExpressaoUnaria):
+            return [no.operando]
+        if isinstance(no, ComandoEscreva):
+            return [no.expressao]
+        if isinstance(no, ComandoSe):
+            blocos = [no.condicao, no.bloco_se]
+            return blocos if no.bloco_senao is None else blocos + [no.bloco_senao]
+        if isinstance(no, ChamadaFuncao):
+            return no.argumentos
+        return []
+
+    def _adicionar_no_ast(self, no, filhos: List[int]) -> int:
+        if isinstance(no, list):
+            return self.adicionar(BLOCO, filhos)
+        if isinstance(no, tuple):
+            if no[0] == 'PARAMETROS':
+                return self.adicionar(PARAMETROS, filhos)
+            if no[0] == 'ENQUANTO':
+                return self.adicionar(COMANDO_ENQUANTO, filhos)
+            if no[0] == 'PARA':
+                return self.adicionar(COMANDO_PARA, filhos)
+            return self.adicionar(PARAMETRO, valor=no[1], extra=no[0])
+        if isinstance(no, Programa):
+            return self.adicionar(PROGRAMA, filhos)
+        if isinstance(no, DeclaracaoFuncao):
+            return self.adicionar(DECLARACAO_FUNCAO, filhos, valor=no.nome, extra=no.tipo_retorno)
+        if isinstance(no, DeclaracaoVariavel):
+            return self.adicionar(DECLARACAO_VARIAVEL, filhos, valor=no.nome, extra=no.tipo)
+        if isinstance(no, Atribuicao):
+            return self.adicionar(ATRIBUICAO, filhos, valor=no.nome)
+        if isinstance(no, ExpressaoBinaria):
+            return self.adicionar(EXPRESSAO_BINARIA, filhos, operador=no.operador)
+        if isinstance(no, ExpressaoUnaria):
+            return self.adicionar(EXPRESSAO_UNARIA, filhos, operador=no.operador)
+        if isinstance(no, Numero):
+            return self.adicionar(NUMERO, valor=no.valor)
+        if isinstance(no, Identificador):
+            return self.adicionar(IDENTIFICADOR, valor=no.nome)
+        if isinstance(no, String):
+            return self.adicionar(STRING, valor=no.valor)
+        if isinstance(no, Booleano):
+            return self.adicionar(BOOLEANO, valor=no.valor)
+        if isinstance(no, ComandoEscreva):
+            return self.adicionar(COMANDO_ESCREVA, filhos)
+        if isinstance(no, ComandoLeia):
+            return self.adicionar(COMANDO_LEIA, valor=no.variavel)
+        if isinstance(no, ComandoSe):
+            return self.adicionar(COMANDO_SE, filhos)
+        if isinstance(no, ChamadaFuncao):
+            return self.adicionar(CHAMADA_FUNCAO, filhos, valor=no.nome)
+        if isinstance(no, Retorne):
+            return self.adicionar(RETORNE, filhos)
+        raise TypeError(f"Nó desconhecido: {type(no).__name__}")
+
+    def acoes_semanticas(self, gramatica) -> List[Optional[Callable]]:
+        """Ações de redução que montam a arena direto no AnalisadorSLR (ver ConstrutorArena)"""
+        return criar_acoes_semanticas(gramatica, ConstrutorArena(self))
+
+    # ===== Visões =====
+
+    def filhos_de(self, no: int) -> array:
+        inicio = self.primeiros[no]
+        return self.filhos[inicio:inicio + self.quantidades[no]]
+
+    def visao(self, no: int) -> 'VisaoNo':
+        return VisaoNo(self, no)
+
+    def para_ast(self, raiz: int):
+        """Materializa a subárvore de raiz em objetos de ast_nodes.
+
+        Como filhos têm handles menores que o pai, basta construir os nós da
+        subárvore em ordem crescente de handle, sem recursão.
+        """
+        subarvore = []
+        pendentes = [raiz]
+        while pendentes:
+            no = pendentes.pop()
+            subarvore.append(no)
+            pendentes.extend(self.filhos_de(no))
+        subarvore.sort()
+
+        objetos = {}
+        literais = self.literais
+        for no in subarvore:
+            tipo = self.tipos[no]
+            filhos = [objetos.pop(f) for f in self.filhos_de(no)]
+            valor = literais[self.valores[no]] if self.valores[no] >= 0 else None
+            extra = literais[self.extras[no]] if self.extras[no] >= 0 else None
+            operador = OPERADORES_ARENA[self.operadores[no]] if self.operadores[no] != SEM_OPERADOR else None
+            if tipo == PROGRAMA:
+                obj = Programa(filhos)
+            elif tipo in (BLOCO, PARAMETROS):
+                obj = filhos
+            elif tipo == PARAMETRO:
+                obj = (extra, valor)
+            elif tipo == DECLARACAO_FUNCAO:
+                obj = DeclaracaoFuncao(extra, valor, filhos[0], filhos[1])
+            elif tipo == DECLARACAO_VARIAVEL:
+                obj = DeclaracaoVariavel(extra, valor, filhos[0] if filhos else None)
+            elif tipo == ATRIBUICAO:
+                obj = Atribuicao(valor, filhos[0])
+            elif tipo == EXPRESSAO_BINARIA:
+                obj = ExpressaoBinaria(filhos[0], operador, filhos[1])
+            elif tipo == EXPRESSAO_UNARIA:
+                obj = ExpressaoUnaria(operador, filhos[0])
+            elif tipo == NUMERO:
+                obj = Numero(valor)
+            elif tipo == IDENTIFICADOR:
+                obj = Identificador(valor)
+            elif tipo == STRING:
+                obj = String(valor)
+            elif tipo == BOOLEANO:
+                obj = VERDADEIRO if valor else FALSO
+            elif tipo == COMANDO_ESCREVA:
+                obj = ComandoEscreva(filhos[0])
+            elif tipo == COMANDO_LEIA:
+                obj = ComandoLeia(valor)
+            elif tipo == COMANDO_SE:
+                obj = ComandoSe(filhos[0], filhos[1], filhos[2] if len(filhos) > 2 else None)
+            elif tipo == CHAMADA_FUNCAO:
+                obj = ChamadaFuncao(valor, filhos)
+            elif tipo == RETORNE:
+                obj = Retorne(filhos[0] if filhos else None)
+            elif tipo == COMANDO_ENQUANTO:
+                obj = ('ENQUANTO', filhos[0], filhos[1])
+            else:
+                obj = ('PARA', filhos[0], filhos[1], filhos[2], filhos[3])
+            objetos[no] = obj
+        return objetos[raiz]
+
+    # ===== Consultas por varredura das colunas =====
+
+    def nos_do_tipo(self, tipo: int) -> List[int]:
+        """Handles de todos os nós de um tipo"""
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.tipos, dtype=np.uint8) == tipo).tolist()
+        return [i for i, t in enumerate(self.tipos) if t == tipo]
+
+    def chamadas(self, nome: str) -> List[int]:
+        """Handles de todas as chamadas à função nome"""
+        indice = self._indice_literal.get((str, nome))
+        if indice is None:
+            return []
+        if np is not None:
+            tipos = np.frombuffer(self.tipos, dtype=np.uint8)
+            valores = np.frombuffer(self.valores, dtype=np.int32)
+            return np.flatnonzero((tipos == CHAMADA_FUNCAO) & (valores == indice)).tolist()
+        return [i for i, (t, v) in enumerate(zip(self.tipos, self.valores))
+                if t == CHAMADA_FUNCAO and v == indice]
+
+    def contar_operadores(self, tipo: int = EXPRESSAO_BINARIA) -> Dict[str, int]:
+        """Quantidade de nós do tipo dado por operador"""
+        if np is not None:
+            tipos = np.frombuffer(self.tipos, dtype=np.uint8)
+            operadores = np.frombuffer(self.operadores, dtype=np.uint8)[tipos == tipo]
+            contagem = np.bincount(operadores, minlength=len(OPERADORES_ARENA))
+            return {op: int(n) for op, n in zip(OPERADORES_ARENA, contagem) if n}
+        contagem = Counter(op for t, op in zip(self.tipos, self.operadores) if t == tipo)
+        return {OPERADORES_ARENA[op]: n for op, n in sorted(contagem.items())}
+
+    def contar_tipos(self) -> Dict[str, int]:
+        """Quantidade de nós por tipo"""
+        contagem = Counter(self.tipos)
+        return {NOMES_TIPOS[t]: n for t, n in sorted(contagem.items())}
+
+class ConstrutorArena:
+    """Métodos de AnalisadorSLR.CONSTRUCOES que montam os nós na arena.
+
+    Os valores na pilha passam a ser handles (e listas de handles); TIPO e
+    OP_COMP produzem (lexema, offset) do terminal, e o offset de cada nó é o
+    do seu primeiro token.
+    """
+    __slots__ = ('arena', 'novo', 'offsets')
+
+    def __init__(self, arena: ArenaAST):
+        self.arena = arena
+        self.novo = arena.adicionar
+        self.offsets = arena.offsets
+
+    def programa(self, declaracoes):
+        self.arena.raiz = self.novo(PROGRAMA, declaracoes,
+                                    offset=self.offsets[declaracoes[0]] if declaracoes else 0)
+        return self.arena.raiz
+
+    def lista(self):
+        return []
+
+    def lista_de(self, item):
+        return [item]
+
+    def anexar(self, lista, item):
+        lista.append(item)
+        return lista
+
+    def bloco(self, inicio, comandos):
+        return self.novo(BLOCO, comandos, offset=inicio.inicio)
+
+    def declaracao_funcao(self, funcao, tipo, nome, abre_paren, parametros, inicio, corpo):
+        novo = self.novo
+        return novo(DECLARACAO_FUNCAO,
+                    (novo(PARAMETROS, parametros, offset=abre_paren.inicio), novo(BLOCO, corpo, offset=inicio.inicio)),
+                    valor=nome.lexema, extra=tipo[0], offset=funcao.inicio)
+
+    def primeiro_parametro(self, tipo, nome):
+        return [self.novo(PARAMETRO, valor=nome.lexema, extra=tipo[0], offset=tipo[1])]
+
+    def anexar_parametro(self, parametros, tipo, nome):
+        parametros.append(self.novo(PARAMETRO, valor=nome.lexema, extra=tipo[0], offset=tipo[1]))
+        return parametros
+
+    def declaracao_variavel(self, tipo, nome, valor_inicial=None):
+        filhos = () if valor_inicial is None else (valor_inicial,)
+        return self.novo(DECLARACAO_VARIAVEL, filhos, valor=nome.lexema, extra=tipo[0], offset=tipo[1])
+
+    def atribuicao(self, nome, valor):
+        return self.novo(ATRIBUICAO, (valor,), valor=nome.lexema, offset=nome.inicio)
+
+    def comando_se(self, se, condicao, inicio, bloco_se, inicio_senao=None, bloco_senao=None):
+        novo = self.novo
+        blocos = (condicao, novo(BLOCO, bloco_se, offset=inicio.inicio))
+        if inicio_senao is not None:
+            blocos += (novo(BLOCO, bloco_senao, offset=inicio_senao.inicio),)
+        return novo(COMANDO_SE, blocos, offset=se.inicio)
+
+    def comando_enquanto(self, enquanto, condicao, inicio, corpo):
+        novo = self.novo
+        return novo(COMANDO_ENQUANTO, (condicao, novo(BLOCO, corpo, offset=inicio.inicio)), offset=enquanto.inicio)
+
+    def comando_para(self, para, inicializacao, condicao, incremento, inicio, corpo):
+        novo = self.novo
+        return novo(COMANDO_PARA, (inicializacao, condicao, incremento, novo(BLOCO, corpo, offset=inicio.inicio)),
+                    offset=para.inicio)
+
+    def comando_escreva(self, escreva, expressao):
+        return self.novo(COMANDO_ESCREVA, (expressao,), offset=escreva.inicio)
+
+    def comando_leia(self, leia, nome):
+        return self.novo(COMANDO_LEIA, valor=nome.lexema, offset=leia.inicio)
+
+    def chamada_funcao(self, nome, argumentos):
+        return self.novo(CHAMADA_FUNCAO, argumentos, valor=nome.lexema, offset=nome.inicio)
+
+    def retorne(self, retorne, valor=None):
+        return self.novo(RETORNE, () if valor is None else (valor,), offset=retorne.inicio)
+
+    def lexema(self, token):
+        return (token.lexema, token.inicio)
+
+    def comparacao(self, esquerda, operador, direita):
+        return self.novo(EXPRESSAO_BINARIA, (esquerda, direita), operador=operador[0], offset=self.offsets[esquerda])
+
+    def binaria(self, esquerda, operador, direita):
+        return self.novo(EXPRESSAO_BINARIA, (esquerda, direita), operador=operador.lexema,
+                         offset=self.offsets[esquerda])
+
+    def unaria(self, menos, operando):
+        return self.novo(EXPRESSAO_UNARIA, (operando,), operador='-', offset=menos.inicio)
+
+    def inteiro(self, token):
+        return self.novo(NUMERO, valor=int(token.lexema), offset=token.inicio)
+
+    def flutuante(self, token):
+        return self.novo(NUMERO, valor=float(token.lexema), offset=token.inicio)
+
+    def string(self, token):
+        return self.novo(STRING, valor=token.lexema, offset=token.inicio)
+
+    def booleano(self, token):
+        return self.novo(BOOLEANO, valor=token.lexema == 'verdadeiro', offset=token.inicio)
+
+    def identificador(self, token):
+        return self.novo(IDENTIFICADOR, valor=token.lexema, offset=token.inicio)
+
+class VisaoNo:
+    """Visão de um nó da arena com os mesmos atributos da classe de ast_nodes"""
+    __slots__ = ('arena', 'no')
+
+    def __init__(self, arena: ArenaAST, no: int):
+        self.arena = arena
+        self.no = no
+
+    @property
+    def classe(self) -> str:
+        return NOMES_TIPOS[self.arena.tipos[self.no]]
+
+    @property
+    def offset(self) -> int:
+        return self.arena.offsets[self.no]
+
+    def __getattr__(self, nome):
+        arena, no = self.arena, self.no
+        tipo = arena.tipos[no]
+        for campo, origem in CAMPOS.get(tipo, ()):
+            if campo != nome:
+                continue
+            filhos = arena.filhos_de(no)
+            if origem == 'filhos':
+                return [VisaoNo(arena, f) for f in filhos]
+            if origem == 'valor':
+                return arena.literais[arena.valores[no]]
+            if origem == 'extra':
+                return arena.literais[arena.extras[no]]
+            if origem == 'operador':
+                return OPERADORES_ARENA[arena.operadores[no]]
+            if origem == 'opcional':
+                return VisaoNo(arena, filhos[0]) if filhos else None
+            if origem == 'opcional_2':
+                return VisaoNo(arena, filhos[2]) if len(filhos) > 2 else None
+            filho = filhos[origem]
+            if arena.tipos[filho] in (BLOCO, PARAMETROS):
+                return [VisaoNo(arena, f) for f in arena.filhos_de(filho)]
+            return VisaoNo(arena, filho)
+        raise AttributeError(f"{self.classe} não tem o campo {nome!r}")
+
+    def para_ast(self):
+        return self.arena.para_ast(self.no)
+
+    def __repr__(self):
+        return f"VisaoNo({self.classe}, {self.no})"
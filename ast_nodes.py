@@ -1,79 +1,106 @@
 from dataclasses import dataclass
 from typing import List, Optional, Union
 
-@dataclass
 class No:
-    """Classe base para nós da AST"""
-    pass
+    """Classe base para nós da AST.
 
-@dataclass
+    Os nós usam __slots__ (sem __dict__ por instância). O parser compartilha
+    nós de literais iguais (VERDADEIRO, FALSO, números e strings repetidos),
+    e por isso Numero, String e Booleano são congelados (frozen); os demais
+    nós também não devem ser modificados depois de criados. No não é uma
+    dataclass para que subclasses congeladas e mutáveis possam herdar dela.
+    """
+    __slots__ = ()
+
+@dataclass(slots=True)
 class Programa(No):
     declaracoes: List[No]
 
-@dataclass
+@dataclass(slots=True)
 class DeclaracaoVariavel(No):
     tipo: str
     nome: str
     valor_inicial: Optional[No] = None
 
-@dataclass
+@dataclass(slots=True)
 class DeclaracaoFuncao(No):
     tipo_retorno: str
     nome: str
     parametros: List[tuple] # [(tipo, nome), ...]
     corpo: List[No]
 
-@dataclass
+@dataclass(slots=True)
 class Atribuicao(No):
     nome: str
     valor: No
 
-@dataclass
+@dataclass(slots=True)
 class ExpressaoBinaria(No):
     esquerda: No
     operador: str
     direita: No
 
-@dataclass
+@dataclass(slots=True)
 class ExpressaoUnaria(No):
     operador: str
     operando: No
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Numero(No):
     valor: Union[int, float]
 
-@dataclass
+@dataclass(slots=True)
 class Identificador(No):
     nome: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class String(No):
     valor: str
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Booleano(No):
     valor: bool
 
-@dataclass
+@dataclass(slots=True)
 class ComandoEscreva(No):
     expressao: No
 
-@dataclass
+@dataclass(slots=True)
 class ComandoLeia(No):
     variavel: str
 
-@dataclass
+@dataclass(slots=True)
 class ComandoSe(No):
     condicao: No
     bloco_se: List[No]
     bloco_senao: Optional[List[No]] = None
 
-@dataclass
+@dataclass(slots=True)
 class ChamadaFuncao(No):
     nome: str
     argumentos: List[No]
 
-@dataclass
+@dataclass(slots=True)
 class Retorne(No):
     valor: Optional[No] = None
+
+# Literais lógicos compartilhados por toda a AST
+VERDADEIRO = Booleano(True)
+FALSO = Booleano(False)
+
+def percorrer(raiz):
+    """Nós (e tuplas ENQUANTO/PARA) sob raiz, em pré-ordem e sem recursão"""
+    pendentes = [raiz]
+    while pendentes:
+        item = pendentes.pop()
+        if isinstance(item, list):
+            pendentes.extend(reversed(item))
+        elif isinstance(item, tuple):
+            yield item
+            pendentes.extend(reversed(item[1:]))
+        elif isinstance(item, No):
+            yield item
+            for campo in reversed(item.__slots__):
+                valor = getattr(item, campo)
+                if isinstance(valor, (No, list, tuple)) and campo != 'parametros':
+                    pendentes.append(valor)
@@ -0,0 +1,7 @@
+"""Benchmarks do analisador léxico e do SLR e dos motores de execução.
+
+Uso: python -m benchmarks [--formas misto aninhado ...] [--tamanhos 1000 1000000]
+"""
+from benchmarks.gerador import FORMAS, Forma, gerar_programa
+from benchmarks.medicao import Medicao, medir, verificar_escala
+from benchmarks.execucao import PROGRAMA_FATORIAL, MedicaoExecucao, medir_execucao
@@ -0,0 +1,38 @@
+import argparse
+import sys
+
+from benchmarks.gerador import FORMAS, gerar_programa
+from benchmarks.medicao import medir, verificar_escala
+
+def principal(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks',
+                                     description="Mede o léxico e o SLR em programas sintéticos.")
+    parser.add_argument('--formas', nargs='+', choices=sorted(FORMAS), default=sorted(FORMAS))
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=[1000, 10000, 100000, 1000000],
+                        help="tamanhos em tokens (padrão: 1K a 1M)")
+    parser.add_argument('--limite', type=float, default=1.3,
+                        help="expoente máximo aceito em tempo ~ tokens^k (padrão: 1.3)")
+    parser.add_argument('--sem-memoria', action='store_true', help="não mede o pico de memória")
+    opcoes = parser.parse_args(argumentos)
+
+    print(f"{'forma':<12}{'tokens':>10}{'léxico ms':>12}{'SLR ms':>12}{'tokens/s':>12}{'pico MB':>10}")
+    medicoes = []
+    for forma in opcoes.formas:
+        for tamanho in sorted(opcoes.tamanhos):
+            codigo = gerar_programa(tamanho, FORMAS[forma])
+            m = medir(codigo, forma, memoria=not opcoes.sem_memoria)
+            medicoes.append(m)
+            print(f"{forma:<12}{m.tokens:>10}{m.segundos_lexico * 1000:>12.1f}"
+                  f"{m.segundos_sintatico * 1000:>12.1f}{m.tokens_por_segundo:>12,.0f}"
+                  f"{m.pico_memoria / 2**20:>10.1f}", flush=True)
+
+    try:
+        expoentes = verificar_escala(medicoes, opcoes.limite)
+    except AssertionError as e:
+        print(f"\n✗ {e}")
+        return 1
+    print("\n✓ Escala quase linear, expoentes: " + ", ".join(f"{f} {k:.2f}" for f, k in expoentes.items()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(principal())
@@ -0,0 +1,62 @@
+import time
+from dataclasses import dataclass
+from typing import Callable
+
+from compilador import compilar_codigo
+from executor import TAMANHO_MEMO, Executor
+from maquina import MaquinaVirtual, compilar_bytecode
+from transpilador import ProgramaPython, compilar_python
+
+# Programa de referência: chamadas recursivas, laço e aritmética
+PROGRAMA_FATORIAL = '''
+funcao inteiro fatorial(inteiro n) inicio
+    se n <= 1 inicio
+        retorne 1
+    fim senao inicio
+        retorne n * fatorial(n - 1)
+    fim
+fim
+
+inicio
+    inteiro i
+    inteiro total := 0
+    para i := 0 faca i < {repeticoes} faca i := i + 1 faca inicio
+        total := total + fatorial(12) / (i + 1)
+    fim
+fim
+'''
+
+@dataclass
+class MedicaoExecucao:
+    """Execução do mesmo programa pelo executor de closures, pela máquina virtual e transpilado"""
+    instrucoes: int  # executadas pela máquina virtual
+    segundos_executor: float
+    segundos_maquina: float
+    segundos_python: float
+    segundos_memo: float  # executor com cache de funções puras (começando vazio)
+
+    @property
+    def instrucoes_por_segundo(self) -> float:
+        return self.instrucoes / self.segundos_maquina
+
+def _melhor(executar: Callable[[], None], repeticoes: int) -> float:
+    melhor = float('inf')
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        executar()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor
+
+def medir_execucao(codigo: str, repeticoes: int = 3) -> MedicaoExecucao:
+    """Compila codigo uma vez para cada motor e mede só a execução (melhor tempo)"""
+    resultado = compilar_codigo(codigo)
+    if not resultado.ok:
+        raise ValueError(f"Programa de benchmark inválido: {resultado.erros[0]}")
+    executor = Executor(resultado.ast, memo=0)
+    maquina = MaquinaVirtual(compilar_bytecode(resultado.ast))
+    segundos_executor = _melhor(executor.executar, repeticoes)
+    segundos_maquina = _melhor(maquina.executar, repeticoes)
+    segundos_python = _melhor(ProgramaPython(compilar_python(resultado.ast)).executar, repeticoes)
+    segundos_memo = _melhor(lambda: Executor(resultado.ast, memo=TAMANHO_MEMO).executar(), repeticoes)
+    return MedicaoExecucao(maquina.instrucoes, segundos_executor, segundos_maquina, segundos_python,
+                           segundos_memo)
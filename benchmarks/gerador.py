@@ -0,0 +1,120 @@
+import random
+from dataclasses import dataclass
+from typing import List
+
+@dataclass(frozen=True)
+class Forma:
+    """Parâmetros de forma dos programas gerados"""
+    comandos_por_funcao: int = 8
+    profundidade_se: int = 2      # blocos se aninhados em cada comando se
+    termos_expressao: int = 4     # operandos por expressão aritmética
+    tamanho_string: int = 12      # caracteres de cada literal cadeia
+    parametros: int = 2
+
+FORMAS = {
+    'misto': Forma(),
+    'aninhado': Forma(comandos_por_funcao=3, profundidade_se=60),
+    'expressoes': Forma(comandos_por_funcao=4, termos_expressao=400),
+    'funcoes': Forma(comandos_por_funcao=1, parametros=4),
+    'strings': Forma(comandos_por_funcao=4, tamanho_string=20000),
+}
+
+TIPOS = ('inteiro', 'flutuante', 'logico', 'cadeia')
+OPERADORES = ('+', '-', '*', '/')
+COMPARACOES = ('>', '<', '>=', '<=', '==', '!=')
+
+class GeradorProgramas:
+    """Gera programas válidos pela gramática como listas de lexemas.
+
+    Os lexemas são unidos por espaços, então o número de tokens do programa
+    é conhecido sem passar pelo léxico.
+    """
+
+    def __init__(self, forma: Forma, semente: int = 0):
+        self.forma = forma
+        self.aleatorio = random.Random(semente)
+        self.lexemas: List[str] = []
+
+    def variavel(self) -> str:
+        return self.aleatorio.choice(('a', 'b', 'c', 'total', 'valor_1'))
+
+    def fator(self):
+        sorteio = self.aleatorio.random()
+        if sorteio < 0.45:
+            self.lexemas.append(self.variavel())
+        elif sorteio < 0.8:
+            self.lexemas.append(str(self.aleatorio.randint(0, 999)))
+        elif sorteio < 0.9:
+            self.lexemas.append(f'{self.aleatorio.randint(0, 99)}.{self.aleatorio.randint(0, 99)}')
+        else:
+            self.lexemas += ['(', self.variavel(), '+', '1', ')']
+
+    def expressao(self, termos: int):
+        self.fator()
+        for _ in range(termos - 1):
+            self.lexemas.append(self.aleatorio.choice(OPERADORES))
+            self.fator()
+
+    def condicao(self):
+        self.expressao(2)
+        self.lexemas.append(self.aleatorio.choice(COMPARACOES))
+        self.expressao(2)
+
+    def cadeia(self) -> str:
+        texto = 'abc def ' * (self.forma.tamanho_string // 8 + 1)
+        return '"' + texto[:self.forma.tamanho_string] + '"'
+
+    def se(self, profundidade: int):
+        self.lexemas.append('se')
+        self.condicao()
+        self.lexemas.append('inicio')
+        if profundidade > 1:
+            self.se(profundidade - 1)
+        else:
+            self.lexemas += [self.variavel(), ':=']
+            self.expressao(self.forma.termos_expressao)
+        self.lexemas += ['fim', 'senao', 'inicio', 'escreva', '(', self.cadeia(), ')', 'fim']
+
+    def comando(self, indice: int):
+        escolha = indice % 6
+        if escolha == 0:
+            self.lexemas += [self.aleatorio.choice(TIPOS), self.variavel(), ':=']
+            self.expressao(self.forma.termos_expressao)
+        elif escolha == 1:
+            self.se(self.forma.profundidade_se)
+        elif escolha == 2:
+            self.lexemas += ['enquanto']
+            self.condicao()
+            self.lexemas += ['faca', 'inicio', 'a', ':=', 'a', '+', '1', 'fim']
+        elif escolha == 3:
+            self.lexemas += ['para', 'i', ':=', '0', 'faca', 'i', '<', '10', 'faca',
+                             'i', ':=', 'i', '+', '1', 'faca', 'inicio', 'leia', '(', 'b', ')', 'fim']
+        elif escolha == 4:
+            self.lexemas += ['escreva', '(', self.cadeia(), ')']
+        else:
+            self.lexemas += ['f0', '(', 'a', ',', 'b', ')']
+
+    def funcao(self, indice: int):
+        self.lexemas += ['funcao', self.aleatorio.choice(TIPOS), f'f{indice}', '(']
+        for p in range(self.forma.parametros):
+            if p:
+                self.lexemas.append(',')
+            self.lexemas += [self.aleatorio.choice(TIPOS), f'p{p}']
+        self.lexemas += [')', 'inicio']
+        for c in range(self.forma.comandos_por_funcao):
+            self.comando(c)
+        self.lexemas += ['retorne', self.variavel(), 'fim']
+
+def gerar_programa(tokens: int, forma: Forma = FORMAS['misto'], semente: int = 0) -> str:
+    """Programa válido com pelo menos tokens tokens (sem contar o EOF).
+
+    Gera funções até passar do tamanho pedido e termina com o bloco principal.
+    """
+    gerador = GeradorProgramas(forma, semente)
+    indice = 0
+    while len(gerador.lexemas) < tokens:
+        gerador.funcao(indice)
+        gerador.lexemas[-1] += '\n'
+        indice += 1
+    gerador.lexemas += ['inicio', 'escreva', '(', 'f0', '(', '1', ',', '2', ')', ')', 'fim\n']
+    return ' '.join(gerador.lexemas)
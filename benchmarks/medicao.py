@@ -0,0 +1,94 @@
+import math
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Iterable, List
+
+from AnalisadorLexico import AnalisadorLexico
+from AnalisadorSLR import AnalisadorSLR
+
+@dataclass
+class Medicao:
+    """Tempos e memória de uma análise léxica + sintática"""
+    forma: str
+    tokens: int
+    caracteres: int
+    segundos_lexico: float
+    segundos_sintatico: float
+    pico_memoria: int = 0  # bytes alocados no pico (tracemalloc); 0 se não medido
+
+    @property
+    def segundos(self) -> float:
+        return self.segundos_lexico + self.segundos_sintatico
+
+    @property
+    def tokens_por_segundo(self) -> float:
+        return self.tokens / self.segundos
+
+def _analisar(codigo: str):
+    """Executa as duas fases e devolve (tokens, segundos do léxico, segundos do SLR)"""
+    inicio = time.perf_counter()
+    lexer = AnalisadorLexico(codigo)
+    tokens = lexer.analisar()
+    meio = time.perf_counter()
+    parser = AnalisadorSLR(tokens)
+    parser.analisar()
+    fim = time.perf_counter()
+    if lexer.erros or parser.erros:
+        raise ValueError(f"Programa de benchmark inválido: {(lexer.erros + parser.erros)[0]}")
+    return tokens, meio - inicio, fim - meio
+
+def medir(codigo: str, forma: str = '', tempo_minimo: float = 0.2, memoria: bool = True) -> Medicao:
+    """Mede léxico e SLR separadamente, com o melhor tempo de várias repetições.
+
+    Entradas pequenas são repetidas até somar tempo_minimo segundos. O pico
+    de memória vem de uma execução à parte, sob tracemalloc, que não entra
+    nos tempos. As tabelas SLR são carregadas antes e ficam fora da medição.
+    """
+    AnalisadorSLR([])
+    tokens, melhor_lexico, melhor_sintatico = _analisar(codigo)
+    decorrido = melhor_lexico + melhor_sintatico
+    while decorrido < tempo_minimo:
+        _, lexico, sintatico = _analisar(codigo)
+        melhor_lexico = min(melhor_lexico, lexico)
+        melhor_sintatico = min(melhor_sintatico, sintatico)
+        decorrido += lexico + sintatico
+    medicao = Medicao(forma, len(tokens) - 1, len(codigo), melhor_lexico, melhor_sintatico)
+    del tokens
+
+    if memoria:
+        tracemalloc.start()
+        try:
+            _analisar(codigo)
+            medicao.pico_memoria = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return medicao
+
+def verificar_escala(medicoes: Iterable[Medicao], limite: float = 1.3) -> Dict[str, float]:
+    """Confere que o tempo cresce quase linearmente com o número de tokens.
+
+    Para cada forma, ajusta log(tempo) = k·log(tokens) + c pelos mínimos
+    quadrados: k ≈ 1 é linear e k ≈ 2 é quadrático. Caches e coleta de lixo
+    deixam entradas grandes um pouco mais lentas por token, daí a folga do
+    limite. Um expoente acima de limite gera AssertionError; devolve os
+    expoentes por forma.
+    """
+    por_forma: Dict[str, List[Medicao]] = {}
+    for medicao in medicoes:
+        por_forma.setdefault(medicao.forma, []).append(medicao)
+    expoentes = {}
+    for forma, lista in por_forma.items():
+        if len(lista) < 2:
+            continue
+        xs = [math.log(m.tokens) for m in lista]
+        ys = [math.log(m.segundos) for m in lista]
+        media_x = sum(xs) / len(xs)
+        media_y = sum(ys) / len(ys)
+        expoentes[forma] = (sum((x - media_x) * (y - media_y) for x, y in zip(xs, ys))
+                            / sum((x - media_x) ** 2 for x in xs))
+    piores = {forma: k for forma, k in expoentes.items() if k > limite}
+    assert not piores, (
+        f"Escala não linear (expoente acima de {limite}): "
+        + ", ".join(f"{forma} {k:.2f}" for forma, k in piores.items()))
+    return expoentes
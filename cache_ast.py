@@ -0,0 +1,314 @@
+import copyreg
+import gc
+import hashlib
+import io
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Optional
+
+import AnalisadorLexico as modulo_lexico
+import AnalisadorSLR as modulo_slr
+import ast_nodes
+import compilador as modulo_compilador
+from AnalisadorLexico import IndiceLinhas, TokenStream
+from AnalisadorSLR import MAX_ERROS, AnalisadorSLR
+from ast_nodes import *
+from compilador import ResultadoCompilacao, compilar_codigo
+
+# Mudar ao alterar o formato das entradas
+VERSAO_CACHE_AST = 1
+MAGICO = b'SLRA'
+
+# Depois do MAGICO e da chave: quantidade de tokens e bytes do pickle comprimido
+CABECALHO = struct.Struct('<II')
+
+# Tamanho total padrão das entradas em disco
+TAMANHO_CACHE_AST = 128 * 1024 * 1024
+
+# Temporários de gravações interrompidas mais velhos que isso são removidos
+IDADE_TEMPORARIOS = 3600
+
+def _reduzir(no: No):
+    """Nó como (classe, argumentos): o pickle fica com metade do tamanho do padrão
+    (sem os nomes dos slots) e o unpickle chama o construtor direto"""
+    return type(no), tuple(getattr(no, campo) for campo in no.__slots__)
+
+def _reduzir_booleano(no: Booleano) -> str:
+    # Referência às constantes de ast_nodes, preservando o compartilhamento
+    return 'VERDADEIRO' if no.valor else 'FALSO'
+
+_REDUTORES = copyreg.dispatch_table.copy()
+for _classe in (Programa, DeclaracaoVariavel, DeclaracaoFuncao, Atribuicao, ExpressaoBinaria,
+                ExpressaoUnaria, Numero, Identificador, String, ComandoEscreva, ComandoLeia,
+                ComandoSe, ChamadaFuncao, Retorne):
+    _REDUTORES[_classe] = _reduzir
+_REDUTORES[Booleano] = _reduzir_booleano
+del _classe
+
+@contextmanager
+def _sem_gc():
+    """Desliga o coletor de ciclos ao criar muitos nós de uma vez.
+
+    Os nós não formam ciclos, mas cada alocação conta para as coletas da
+    geração 0, que varrem a árvore em construção; sem isso carregar uma AST
+    grande fica várias vezes mais lento.
+    """
+    ativo = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if ativo:
+            gc.enable()
+
+_versao_compilador: Optional[str] = None
+
+def versao_compilador() -> str:
+    """Hash da gramática SLR e do código que produz o que fica em cache: léxico,
+    ações semânticas do SLR, nós da AST e mensagens e recuperação de erros"""
+    global _versao_compilador
+    if _versao_compilador is None:
+        # As colunas de tokens são gravadas na ordem de bytes da máquina
+        hash_ = hashlib.sha256(f"{VERSAO_CACHE_AST}\0{sys.byteorder}\0"
+                               f"{AnalisadorSLR([]).hash_gramatica()}".encode())
+        hash_modulos(hash_, (modulo_lexico, modulo_slr, ast_nodes, modulo_compilador))
+        _versao_compilador = hash_.hexdigest()
+    return _versao_compilador
+
+def hash_modulos(hash_, modulos):
+    """Acrescenta a hash_ o código-fonte de cada módulo (ou o nome, sem arquivo)"""
+    for modulo in modulos:
+        try:
+            with open(modulo.__file__, 'rb') as arquivo:
+                hash_.update(arquivo.read())
+        except (OSError, TypeError, AttributeError):
+            hash_.update(modulo.__name__.encode())
+
+def diretorio_cache_usuario(subdiretorio: str) -> Optional[str]:
+    """Diretório de um cache em disco que cresce com o uso; None se desativado.
+
+    Fica em SLR_CACHE_DIR, se definida (vazia desativa, como para as
+    tabelas SLR), ou em slr/ sob $XDG_CACHE_HOME (~/.cache por padrão), e
+    não em __pycache__ ao lado do código: são até centenas de MiB que não
+    devem ir junto com a árvore de fontes.
+    """
+    base = os.environ.get('SLR_CACHE_DIR')
+    if base is None:
+        base = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'slr')
+    return os.path.join(base, subdiretorio) if base else None
+
+class CacheDisco:
+    """Entradas de cache em arquivos prefixo*.bin de um diretório, limitadas em tamanho.
+
+    As entradas somam no máximo maximo_disco bytes (aproximado, já que cada
+    processo só revarre o diretório de tempos em tempos): ao passar do
+    limite, as usadas há mais tempo (mtime, renovado por _usar a cada
+    acerto) são removidas até sobrar 90% dele. Vários processos podem usar
+    o mesmo diretório sem trava: gravações são atômicas (temporário +
+    os.replace) e quem lê trata entradas ausentes ou corrompidas como faltas.
+    """
+    prefixo = 'cache-'
+
+    def __init__(self, diretorio: Optional[str], maximo_disco: int):
+        self.diretorio = diretorio or None
+        self.maximo_disco = maximo_disco
+        self.removidas = 0
+        self._total: Optional[int] = None  # bytes em disco na última varredura + gravados depois
+        self._gravados = 0  # bytes gravados por este processo desde a última varredura
+
+    @staticmethod
+    def _usar(caminho: str):
+        try:
+            os.utime(caminho)  # usada agora: última a sair
+        except OSError:
+            pass
+
+    def _gravar_arquivo(self, caminho: str, dados: bytes):
+        """Grava de forma atômica e remove as entradas mais antigas se passar do limite"""
+        temporario = None
+        try:
+            os.makedirs(self.diretorio, exist_ok=True)
+            fd, temporario = tempfile.mkstemp(dir=self.diretorio, prefix=self.prefixo, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as arquivo:
+                arquivo.write(dados)
+            os.replace(temporario, caminho)
+        except OSError:
+            if temporario:
+                try:
+                    os.remove(temporario)
+                except OSError:
+                    pass
+            return  # cache em disco é opcional
+
+        # Outros processos também gravam: a cada oitavo do limite gravado
+        # por este, o diretório é varrido de novo
+        self._gravados += len(dados)
+        if self._total is None or self._gravados > self.maximo_disco // 8:
+            self._total = self.tamanho()
+            self._gravados = 0
+        else:
+            self._total += len(dados)
+        if self._total > self.maximo_disco:
+            self.limpar(int(self.maximo_disco * 0.9))
+
+    def tamanho(self) -> int:
+        """Bytes ocupados pelas entradas em disco"""
+        return sum(tamanho for _, tamanho, _ in self._entradas())
+
+    def _entradas(self) -> list:
+        """(mtime, tamanho, caminho) das entradas; remove temporários abandonados"""
+        entradas = []
+        if not self.diretorio:
+            return entradas
+        agora = time.time()
+        try:
+            iterador = os.scandir(self.diretorio)
+        except OSError:
+            return entradas
+        with iterador:
+            for entrada in iterador:
+                if not entrada.name.startswith(self.prefixo):
+                    continue
+                try:
+                    info = entrada.stat()
+                    if entrada.name.endswith('.tmp'):
+                        if agora - info.st_mtime > IDADE_TEMPORARIOS:
+                            os.remove(entrada.path)
+                    elif entrada.name.endswith('.bin'):
+                        entradas.append((info.st_mtime, info.st_size, entrada.path))
+                except OSError:
+                    pass  # removida por outro processo
+        return entradas
+
+    def limpar(self, limite: int = 0):
+        """Remove as entradas usadas há mais tempo até o total caber em limite bytes"""
+        entradas = sorted(self._entradas())
+        total = sum(tamanho for _, tamanho, _ in entradas)
+        for _, tamanho, caminho in entradas:
+            if total <= limite:
+                break
+            try:
+                os.remove(caminho)
+                self.removidas += 1
+            except OSError:
+                pass  # já removida por outro processo
+            total -= tamanho
+        self._total = total
+        self._gravados = 0
+
+class CacheAST(CacheDisco):
+    """Cache em disco de compilações, endereçado pelo conteúdo do código-fonte.
+
+    A chave é o hash do código, de max_erros e da versão do compilador
+    (gramática e código do frontend, ver versao_compilador). Cada entrada
+    guarda as colunas do TokenStream e, em pickle comprimido, o Programa e
+    os erros; um acerto devolve o mesmo ResultadoCompilacao sem passar pelo
+    AnalisadorLexico nem pelo AnalisadorSLR. As entradas somam no máximo
+    maximo bytes, com remoção das usadas há mais tempo (ver CacheDisco);
+    leituras validam cabeçalho e chave, e entradas corrompidas ou removidas
+    no meio contam como faltas.
+    """
+    prefixo = 'ast-'
+
+    def __init__(self, diretorio: Optional[str] = None, maximo: int = TAMANHO_CACHE_AST):
+        if diretorio is None:
+            diretorio = diretorio_cache_usuario('ast')
+        super().__init__(diretorio, maximo)
+        self.acertos = 0
+        self.faltas = 0
+
+    def chave(self, codigo_fonte: str, max_erros: Optional[int]) -> str:
+        conteudo = f"{versao_compilador()}\0{max_erros}\0{codigo_fonte}"
+        return hashlib.sha256(conteudo.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f'ast-{chave[:40]}.bin')
+
+    def compilar(self, codigo_fonte: str, max_erros: Optional[int] = MAX_ERROS) -> ResultadoCompilacao:
+        """Como compilador.compilar_codigo(codigo_fonte, compacto=True, max_erros=max_erros)"""
+        if not self.diretorio:
+            return compilar_codigo(codigo_fonte, compacto=True, max_erros=max_erros)
+        chave = self.chave(codigo_fonte, max_erros)
+        caminho = self.caminho(chave)
+        inicio = time.perf_counter()
+        resultado = self._ler(caminho, chave, codigo_fonte)
+        if resultado is not None:
+            self.acertos += 1
+            resultado.tempos['cache'] = time.perf_counter() - inicio
+            self._usar(caminho)
+            return resultado
+
+        self.faltas += 1
+        resultado = compilar_codigo(codigo_fonte, compacto=True, max_erros=max_erros)
+        self._gravar(caminho, chave, resultado)
+        return resultado
+
+    # ---------- formato ----------
+
+    @staticmethod
+    def serializar(chave: str, resultado: ResultadoCompilacao) -> bytes:
+        """Colunas do TokenStream cruas (carregam sem decodificação) e o resto em pickle + zlib"""
+        tokens = resultado.tokens
+        dados = io.BytesIO()
+        pickler = pickle.Pickler(dados, pickle.HIGHEST_PROTOCOL)
+        pickler.dispatch_table = _REDUTORES
+        pickler.dump((resultado.ast, resultado.erros_lexicos, resultado.erros_sintaticos,
+                      resultado.interrompida))
+        comprimido = zlib.compress(dados.getvalue(), 6)
+        return b''.join((MAGICO, bytes.fromhex(chave), CABECALHO.pack(len(tokens), len(comprimido)),
+                         tokens.tipos.tobytes(), tokens.inicios.tobytes(), tokens.fins.tobytes(),
+                         comprimido))
+
+    @staticmethod
+    def desserializar(dados: bytes, chave: str, codigo_fonte: str) -> Optional[ResultadoCompilacao]:
+        """ResultadoCompilacao de uma entrada; None se for de outra chave ou estiver corrompida"""
+        inicio = len(MAGICO) + 32 + CABECALHO.size
+        if len(dados) < inicio or not dados.startswith(MAGICO + bytes.fromhex(chave)):
+            return None
+        quantidade, comprimido = CABECALHO.unpack_from(dados, inicio - CABECALHO.size)
+        tokens = TokenStream(codigo_fonte, IndiceLinhas(codigo_fonte))
+        colunas = (tokens.tipos, tokens.inicios, tokens.fins)
+        if len(dados) != inicio + quantidade * sum(c.itemsize for c in colunas) + comprimido:
+            return None
+        visao = memoryview(dados)
+        for coluna in colunas:
+            fim = inicio + quantidade * coluna.itemsize
+            coluna.frombytes(visao[inicio:fim])
+            inicio = fim
+        try:
+            with _sem_gc():
+                ast, erros_lexicos, erros_sintaticos, interrompida = pickle.loads(zlib.decompress(visao[inicio:]))
+        except Exception:  # entrada corrompida ou de um formato antigo
+            return None
+        return ResultadoCompilacao(tokens, ast, erros_lexicos, erros_sintaticos,
+                                   interrompida=interrompida)
+
+    # ---------- disco ----------
+
+    def _ler(self, caminho: str, chave: str, codigo_fonte: str) -> Optional[ResultadoCompilacao]:
+        try:
+            with open(caminho, 'rb') as arquivo:
+                dados = arquivo.read()
+        except OSError:
+            return None
+        return self.desserializar(dados, chave, codigo_fonte)
+
+    def _gravar(self, caminho: str, chave: str, resultado: ResultadoCompilacao):
+        try:
+            dados = self.serializar(chave, resultado)
+        except RecursionError:
+            return  # AST aninhada demais para o pickle: fica sem cache
+        self._gravar_arquivo(caminho, dados)
+
+# Cache padrão do processo
+cache = CacheAST()
+
+def compilar_com_cache(codigo_fonte: str, max_erros: Optional[int] = MAX_ERROS) -> ResultadoCompilacao:
+    """compilar_codigo pelo cache padrão"""
+    return cache.compilar(codigo_fonte, max_erros)
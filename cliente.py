@@ -0,0 +1,139 @@
+"""Cliente do servidor de compilação (servidor.py).
+
+Só usa a biblioteca padrão e não importa o compilador: a partida do
+processo custa o mínimo do Python. Uso:
+
+    python cliente.py [--endereco unix:/tmp/slr.sock | 127.0.0.1:8765] arquivos...
+"""
+import argparse
+import itertools
+import json
+import os
+import socket
+import sys
+import tempfile
+from typing import List, Optional, Sequence, Tuple, Union
+
+# Endereço padrão: SLR_SERVIDOR ou um socket Unix por usuário no diretório temporário
+_usuario = os.getuid() if hasattr(os, 'getuid') else 0
+ENDERECO_PADRAO = os.environ.get(
+    'SLR_SERVIDOR', 'unix:' + os.path.join(tempfile.gettempdir(), f'slr-{_usuario}.sock'))
+
+# Erros por arquivo antes de desistir; o mesmo padrão de AnalisadorSLR.MAX_ERROS
+MAX_ERROS = 10
+
+class ErroCliente(Exception):
+    """Servidor indisponível ou resposta inválida"""
+
+def analisar_endereco(endereco: str) -> Tuple[str, Union[str, Tuple[str, int]]]:
+    """('unix', caminho) ou ('tcp', (host, porta)) a partir de 'unix:caminho' ou 'host:porta';
+    sem host, só a interface local (127.0.0.1)"""
+    if endereco.startswith('unix:'):
+        return 'unix', endereco[len('unix:'):]
+    host, separador, porta = endereco.rpartition(':')
+    if not separador or not porta.isdigit():
+        raise ValueError(f"Endereço inválido: '{endereco}' (use unix:caminho ou host:porta)")
+    return 'tcp', (host or '127.0.0.1', int(porta))
+
+class Cliente:
+    """Conexão com o servidor; as requisições são linhas JSON"""
+
+    def __init__(self, endereco: str = ENDERECO_PADRAO, tempo_limite: Optional[float] = None):
+        familia, destino = analisar_endereco(endereco)
+        self.familia = familia
+        try:
+            if familia == 'unix':
+                self.conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.conexao.settimeout(tempo_limite)
+                self.conexao.connect(destino)
+            else:
+                self.conexao = socket.create_connection(destino, timeout=tempo_limite)
+        except OSError as e:
+            raise ErroCliente(f"Servidor indisponível em {endereco}: {e}") from None
+        self.arquivo = self.conexao.makefile('rwb')
+        self.ids = itertools.count(1)
+
+    def requisitar(self, requisicao: dict) -> dict:
+        """Envia uma requisição e espera a resposta de mesmo id"""
+        requisicao = {'id': next(self.ids), **requisicao}
+        try:
+            self.arquivo.write(json.dumps(requisicao).encode('ascii') + b'\n')
+            self.arquivo.flush()
+            linha = self.arquivo.readline()
+        except OSError as e:
+            raise ErroCliente(f"Falha na comunicação com o servidor: {e}") from None
+        if not linha:
+            raise ErroCliente("O servidor fechou a conexão")
+        resposta = json.loads(linha)
+        if resposta.get('erro'):
+            raise ErroCliente(resposta['erro'])
+        return resposta
+
+    def compilar(self, arquivos: Sequence[Union[str, Tuple[str, str]]], max_erros: Optional[int] = MAX_ERROS) -> List[dict]:
+        """Diagnósticos de cada arquivo, na ordem pedida.
+
+        Cada item é um caminho ou um par (caminho, código) com o conteúdo,
+        por exemplo de um buffer não salvo. Pelo socket Unix o servidor lê
+        os caminhos; por TCP o cliente os lê e envia o código. Cada
+        resultado tem caminho, ok, tokens, tamanho, segundos, erros e em_cache.
+        """
+        itens = []
+        for arquivo in arquivos:
+            if isinstance(arquivo, str) and self.familia == 'unix':
+                itens.append({'caminho': os.path.abspath(arquivo)})
+            elif isinstance(arquivo, str):
+                try:
+                    with open(arquivo, encoding='utf-8') as fonte:
+                        itens.append({'caminho': arquivo, 'codigo': fonte.read()})
+                except (OSError, UnicodeDecodeError) as e:
+                    raise ErroCliente(f"Erro ao ler {arquivo}: {e}") from None
+            else:
+                itens.append({'caminho': arquivo[0], 'codigo': arquivo[1]})
+        return self.requisitar({'tipo': 'compilar', 'arquivos': itens, 'max_erros': max_erros})['resultados']
+
+    def estado(self) -> dict:
+        return self.requisitar({'tipo': 'estado'})
+
+    def fechar(self):
+        self.arquivo.close()
+        self.conexao.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+def principal(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compila arquivos pelo servidor de compilação.")
+    parser.add_argument('arquivos', nargs='+', help="arquivos fonte ou '-' para a entrada padrão")
+    parser.add_argument('--endereco', default=ENDERECO_PADRAO,
+                        help="unix:caminho ou host:porta do servidor (padrão: %(default)s)")
+    parser.add_argument('-e', '--max-erros', type=int, default=MAX_ERROS,
+                        help="erros sintáticos por arquivo antes de desistir; 1 para no "
+                             "primeiro (0 = sem limite; padrão: %(default)s)")
+    parser.add_argument('--json', action='store_true', help="imprime os resultados em JSON")
+    opcoes = parser.parse_args(argumentos)
+
+    arquivos = [('<stdin>', sys.stdin.read()) if arquivo == '-' else arquivo for arquivo in opcoes.arquivos]
+    try:
+        with Cliente(opcoes.endereco) as cliente:
+            resultados = cliente.compilar(arquivos, opcoes.max_erros or None)
+    except ErroCliente as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 2
+
+    if opcoes.json:
+        print(json.dumps(resultados, ensure_ascii=False, indent=2))
+    else:
+        for resultado in resultados:
+            if resultado['ok']:
+                print(f"✓ {resultado['caminho']} ({resultado['tokens']} tokens)")
+            else:
+                print(f"✗ {resultado['caminho']}")
+                for erro in resultado['erros']:
+                    print(f"  - {erro}")
+    return 0 if all(resultado['ok'] for resultado in resultados) else 1
+
+if __name__ == '__main__':
+    sys.exit(principal())
@@ -0,0 +1,132 @@
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, TextIO
+
+from AnalisadorLexico import AnalisadorLexico, Token, formatar_token
+from AnalisadorSLR import MAX_ERROS, AnalisadorSLR, formatar_erros
+from ast_nodes import *
+from metricas import Instrumentacao, Metricas
+
+@dataclass
+class ResultadoCompilacao:
+    """Tudo o que uma compilação produz, sem nada impresso"""
+    tokens: Sequence[Token]  # lista ou TokenStream, terminando no EOF
+    ast: Optional[Programa] = None
+    erros_lexicos: List[str] = field(default_factory=list)
+    erros_sintaticos: List[str] = field(default_factory=list)
+    tempos: Dict[str, float] = field(default_factory=dict)  # segundos por fase
+    metricas: Optional[Metricas] = None  # só com instrumentação
+    interrompida: bool = False  # análise sintática parou em max_erros
+
+    @property
+    def ok(self) -> bool:
+        return not self.erros_lexicos and not self.erros_sintaticos
+
+    @property
+    def erros(self) -> List[str]:
+        return self.erros_lexicos + self.erros_sintaticos
+
+def compilar_codigo(codigo_fonte: str, compacto: bool = False,
+                    instrumentacao: Optional[Instrumentacao] = None,
+                    max_erros: Optional[int] = MAX_ERROS, finalizar: bool = True) -> ResultadoCompilacao:
+    """Executa as análises léxica e sintática sem escrever no console.
+
+    Como em compilar, a análise sintática não é feita se houver erros
+    léxicos. Os tempos de 'lexico', 'tabelas' e 'sintatico' são sempre
+    medidos; com instrumentacao, as métricas completas vão em
+    resultado.metricas. Com finalizar=False quem chama faz iniciar() e
+    finalizar() da instrumentação, para medir também o que vem depois (como
+    a saída em compilar). max_erros é repassado ao AnalisadorSLR: acima de 1
+    ele se recupera dos erros e reporta até max_erros deles.
+    """
+    if instrumentacao is None:
+        return _compilar_codigo(codigo_fonte, compacto, None, max_erros)
+    if not finalizar:
+        resultado = _compilar_codigo(codigo_fonte, compacto, instrumentacao, max_erros)
+        resultado.metricas = instrumentacao.metricas
+        return resultado
+    instrumentacao.iniciar()
+    try:
+        resultado = _compilar_codigo(codigo_fonte, compacto, instrumentacao, max_erros)
+    finally:
+        metricas = instrumentacao.finalizar()
+    resultado.metricas = metricas
+    return resultado
+
+@contextmanager
+def _fase(tempos: Dict[str, float], instrumentacao: Optional[Instrumentacao], nome: str):
+    with instrumentacao.fase(nome) if instrumentacao else nullcontext():
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            tempos[nome] = time.perf_counter() - inicio
+
+def _compilar_codigo(codigo_fonte: str, compacto: bool,
+                     instrumentacao: Optional[Instrumentacao],
+                     max_erros: Optional[int]) -> ResultadoCompilacao:
+    tempos = {}
+    with _fase(tempos, instrumentacao, 'lexico'):
+        lexer = AnalisadorLexico(codigo_fonte)
+        tokens = lexer.analisar_compacto() if compacto else lexer.analisar()
+    resultado = ResultadoCompilacao(tokens, erros_lexicos=lexer.erros, tempos=tempos)
+    if instrumentacao:
+        instrumentacao.registrar_lexico(lexer)
+    if lexer.erros:
+        return resultado
+
+    with _fase(tempos, instrumentacao, 'tabelas'):
+        parser = AnalisadorSLR(tokens, max_erros=max_erros)
+    if instrumentacao:
+        instrumentacao.preparar_parser(parser)
+    with _fase(tempos, instrumentacao, 'sintatico'):
+        resultado.ast = parser.analisar()
+    resultado.erros_sintaticos = parser.erros
+    resultado.interrompida = parser.interrompida
+    if instrumentacao:
+        instrumentacao.registrar_sintatico(parser)
+    return resultado
+
+def renderizar(resultado: ResultadoCompilacao, destino: TextIO, mostrar_tokens: bool = True,
+               instrumentacao: Optional[Instrumentacao] = None):
+    """Escreve o relatório de compilar em destino, numa única escrita.
+
+    Com instrumentacao, a listagem dos tokens e a escrita contam na fase
+    'saida' e a formatação dos erros na fase 'erros'.
+    """
+    def fase(nome: str):
+        return instrumentacao.fase(nome) if instrumentacao else nullcontext()
+
+    linhas = [
+        "\n" + "=" * 70,
+        "COMPILADOR - ANÁLISE LÉXICA E SINTÁTICA",
+        "=" * 70,
+        "\n[FASE 1] Análise Léxica...",
+        f"✓ Total de tokens: {len(resultado.tokens) - 1}",
+    ]
+    if mostrar_tokens:
+        with fase('saida'):
+            linhas.append("\nTokens encontrados:")
+            linhas.extend(map(formatar_token, resultado.tokens[:-1]))
+
+    if resultado.erros_lexicos:
+        linhas.append(f"✗ Erros léxicos encontrados: {len(resultado.erros_lexicos)}")
+        linhas.append("\nErros léxicos:")
+        with fase('erros'):
+            linhas.extend(resultado.erros_lexicos)
+    else:
+        linhas.append("\n[FASE 2] Análise Sintática SLR...")
+        linhas.append("\nResultado da análise SLR:")
+        with fase('erros'):
+            linhas.extend(formatar_erros(resultado.erros_sintaticos))
+        if resultado.erros_sintaticos:
+            linhas.append(f"✗ Erros sintáticos encontrados: {len(resultado.erros_sintaticos)}")
+            if resultado.interrompida and len(resultado.erros_sintaticos) > 1:
+                linhas.append("✗ Análise interrompida no limite de erros")
+        else:
+            linhas.append("✓ Análise Sintática SLR concluída com sucesso!")
+
+    linhas.append('')
+    with fase('saida'):
+        destino.write('\n'.join(linhas))
@@ -0,0 +1,546 @@
+import math
+import operator
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, TextIO
+
+from ast_nodes import *
+
+class ErroSemantico(Exception):
+    """Erro encontrado ao compilar a AST (nome não declarado, aridade errada...)"""
+
+class ErroExecucao(Exception):
+    """Erro durante a execução do programa"""
+
+# Valor de uma variável declarada sem valor inicial (e do retorno de uma
+# função que termina sem retorne)
+VALORES_PADRAO = {'inteiro': 0, 'flutuante': 0.0, 'logico': False, 'cadeia': ''}
+
+def dividir(a, b):
+    """Divisão da linguagem: inteira (truncada em direção a zero) entre inteiros"""
+    if b == 0:
+        raise ErroExecucao("Divisão por zero")
+    if type(a) is int and type(b) is int:
+        quociente = a // b
+        if quociente < 0 and quociente * b != a:
+            quociente += 1
+        return quociente
+    return a / b
+
+OPERADORES = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul, '/': dividir,
+    '>': operator.gt, '<': operator.lt, '>=': operator.ge, '<=': operator.le,
+    '==': operator.eq, '!=': operator.ne,
+}
+
+def formatar_valor(valor) -> str:
+    """Texto escrito por escreva"""
+    if valor is True:
+        return 'verdadeiro'
+    if valor is False:
+        return 'falso'
+    return str(valor)
+
+def converter_entrada(texto: str, tipo: str):
+    """Converte uma linha lida por leia para o tipo da variável"""
+    texto = texto.rstrip('\n')
+    try:
+        if tipo == 'inteiro':
+            return int(texto)
+        if tipo == 'flutuante':
+            return float(texto)
+    except ValueError:
+        raise ErroExecucao(f"Entrada inválida para {tipo}: '{texto}'") from None
+    if tipo == 'logico':
+        return texto.strip() == 'verdadeiro'
+    return texto
+
+class Escopo:
+    """Slots das variáveis de um quadro: o global ou o de uma função.
+
+    As declarações não abrem escopo por bloco: cada nome declarado num corpo
+    de função (ou nos blocos principais) tem um slot fixo no quadro.
+    """
+    __slots__ = ('slots', 'tipos')
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self.tipos: Dict[str, str] = {}
+
+    def declarar(self, nome: str, tipo: str) -> int:
+        if nome not in self.slots:
+            self.slots[nome] = len(self.slots)
+        self.tipos[nome] = tipo
+        return self.slots[nome]
+
+    def coletar(self, comandos: List[No]):
+        """Declara as variáveis de comandos, inclusive dentro de se/enquanto/para"""
+        pendentes = [comandos]
+        while pendentes:
+            for comando in pendentes.pop():
+                if isinstance(comando, DeclaracaoVariavel):
+                    self.declarar(comando.nome, comando.tipo)
+                elif isinstance(comando, ComandoSe):
+                    pendentes.append(comando.bloco_se)
+                    if comando.bloco_senao:
+                        pendentes.append(comando.bloco_senao)
+                elif isinstance(comando, tuple):
+                    pendentes.append(comando[-1])
+
+    def __len__(self):
+        return len(self.slots)
+
+class Funcao:
+    """Função compilada; corpo é preenchido depois, o que permite recursão"""
+    __slots__ = ('declaracao', 'escopo', 'corpo', 'padrao', 'memo', 'cache_memo')
+
+    def __init__(self, declaracao: DeclaracaoFuncao):
+        self.declaracao = declaracao
+        self.escopo = Escopo()
+        for tipo, nome in declaracao.parametros:
+            self.escopo.declarar(nome, tipo)
+        self.escopo.coletar(declaracao.corpo)
+        self.corpo: Optional[Callable] = None
+        self.padrao = VALORES_PADRAO.get(declaracao.tipo_retorno)
+        self.memo: Optional[Callable] = None  # chamada com cache, se a função é pura
+        self.cache_memo: Optional[CacheMemo] = None
+
+def funcoes_puras(funcoes: Dict[str, Funcao]) -> Set[str]:
+    """Nomes das funções cujo resultado depende só dos argumentos.
+
+    Uma função é pura se não usa leia nem escreva, não lê nem escreve
+    variáveis globais e só chama funções puras (recursão, inclusive mútua, é
+    permitida).
+    """
+    chamadas: Dict[str, Set[str]] = {}
+    for nome, funcao in funcoes.items():
+        locais = funcao.escopo.slots
+        chamadas[nome] = set()
+        for no in percorrer(funcao.declaracao.corpo):
+            if isinstance(no, (ComandoLeia, ComandoEscreva)):
+                break
+            if isinstance(no, (Atribuicao, Identificador)) and no.nome not in locais:
+                break
+            if isinstance(no, ChamadaFuncao):
+                chamadas[nome].add(no.nome)
+        else:
+            continue
+        del chamadas[nome]
+
+    # Remove quem chama funções impuras até não mudar mais
+    mudou = True
+    while mudou:
+        mudou = False
+        for nome in list(chamadas):
+            if not chamadas[nome] <= chamadas.keys():
+                del chamadas[nome]
+                mudou = True
+    return set(chamadas)
+
+@dataclass
+class EstatisticasMemo:
+    """Uso do cache de resultados de uma função pura"""
+    acertos: int
+    faltas: int
+    tamanho: int
+    maximo: Optional[int]
+
+    @property
+    def taxa_acertos(self) -> float:
+        chamadas = self.acertos + self.faltas
+        return self.acertos / chamadas if chamadas else 0.0
+
+def chave_memo(valor) -> tuple:
+    """Chave de um argumento no cache de uma função pura.
+
+    O tipo separa f(1), f(1.0) e f(verdadeiro), e o sinal separa f(0.0) de
+    f(-0.0): esses valores são iguais e têm o mesmo hash, mas as funções
+    podem devolver resultados diferentes para eles (1 / x, por exemplo).
+    """
+    if type(valor) is float:
+        return (float, valor, math.copysign(1.0, valor))
+    return (type(valor), valor)
+
+_AUSENTE = object()  # resultado fora do cache
+
+class CacheMemo:
+    """LRU dos resultados de uma função pura (maximo None: sem limite)"""
+    __slots__ = ('resultados', 'maximo', 'acertos', 'faltas')
+
+    def __init__(self, maximo: Optional[int]):
+        self.resultados: OrderedDict = OrderedDict()
+        self.maximo = maximo
+        self.acertos = 0
+        self.faltas = 0
+
+    def estatisticas(self) -> EstatisticasMemo:
+        return EstatisticasMemo(self.acertos, self.faltas, len(self.resultados), self.maximo)
+
+    def limpar(self):
+        self.resultados.clear()
+        self.acertos = self.faltas = 0
+
+# Resultados guardados por função pura (padrão do argumento memo do Executor)
+TAMANHO_MEMO = 1024
+
+# Chamadas aninhadas aceitas pelos motores. A máquina virtual conta as suas
+# (maquina.LIMITE_CHAMADAS); o executor e o código transpilado usam a pilha
+# do Python, com uns 4 quadros por chamada, e rodam sob limite_recursao().
+LIMITE_CHAMADAS = 100000
+
+# Desde o 3.11 chamadas entre funções Python não consomem a pilha C; antes
+# disso consomem, e o limite fica menor para não estourar a pilha do processo.
+# O cache das funções puras (CacheMemo) é Python puro pelo mesmo motivo.
+LIMITE_RECURSAO = LIMITE_CHAMADAS * 5 if sys.version_info >= (3, 11) else 20000
+
+_trava_recursao = threading.Lock()
+_recursao_ativa = 0       # blocos limite_recursao em andamento, em qualquer thread
+_recursao_anterior = 0    # limite de antes do primeiro deles
+
+@contextmanager
+def limite_recursao(limite: int = LIMITE_RECURSAO):
+    """Eleva sys.setrecursionlimit para pelo menos limite durante o bloco.
+
+    Efeito colateral global: o limite vale para o processo inteiro, isto é,
+    para todas as threads e para qualquer código chamado de dentro do bloco
+    (como o write da saída), que com o limite alto pode esgotar a pilha C em
+    vez de levantar RecursionError. Blocos simultâneos em várias threads são
+    contados: o primeiro guarda o limite anterior e o último o restaura.
+    """
+    global _recursao_ativa, _recursao_anterior
+    with _trava_recursao:
+        if _recursao_ativa == 0:
+            _recursao_anterior = sys.getrecursionlimit()
+        _recursao_ativa += 1
+        if sys.getrecursionlimit() < limite:
+            sys.setrecursionlimit(limite)
+    try:
+        yield
+    finally:
+        with _trava_recursao:
+            _recursao_ativa -= 1
+            if _recursao_ativa == 0:
+                sys.setrecursionlimit(_recursao_anterior)
+
+# Um comando compilado recebe o quadro e devolve None, ou (valor,) quando
+# executa um retorne; uma expressão compilada recebe o quadro e devolve o valor
+Comando = Callable[[list], Optional[tuple]]
+Expressao = Callable[[list], object]
+
+class Executor:
+    """Compila a AST em closures aninhadas uma única vez e as executa.
+
+    Cada nó vira uma função Python que recebe o quadro (lista de slots) da
+    função em execução; variáveis são resolvidas em tempo de compilação para
+    um índice no quadro local ou na lista de globais. Assim a execução não
+    faz despacho por isinstance nem busca de nomes em dicionários.
+
+    Chamadas de funções puras (veja funcoes_puras) passam por um cache LRU
+    de memo resultados por função, mantido entre execuções; memo=None não
+    limita o cache e memo=0 o desliga. O cache não muda a saída nem a
+    profundidade de recursão alcançada, só evita recalcular chamadas.
+    """
+
+    def __init__(self, programa: Programa, memo: Optional[int] = TAMANHO_MEMO):
+        self.globais_escopo = Escopo()
+        self.globais: List[object] = []
+        self.funcoes: Dict[str, Funcao] = {}
+        self.saida: TextIO = sys.stdout
+        self.entrada: TextIO = sys.stdin
+
+        blocos = []
+        for declaracao in programa.declaracoes:
+            if isinstance(declaracao, DeclaracaoFuncao):
+                if declaracao.nome in self.funcoes:
+                    raise ErroSemantico(f"Função '{declaracao.nome}' declarada mais de uma vez")
+                self.funcoes[declaracao.nome] = Funcao(declaracao)
+            else:
+                self.globais_escopo.coletar(declaracao)
+                blocos.append(declaracao)
+
+        if memo != 0:
+            for nome in funcoes_puras(self.funcoes):
+                self.funcoes[nome].memo = self.memoizar(self.funcoes[nome], memo)
+
+        try:
+            for funcao in self.funcoes.values():
+                funcao.corpo = self.compilar_bloco(funcao.declaracao.corpo, funcao.escopo)
+            self.blocos = [self.compilar_bloco(bloco, self.globais_escopo) for bloco in blocos]
+        except RecursionError:
+            raise ErroSemantico("Programa aninhado demais para compilar") from None
+
+    def executar(self, saida: Optional[TextIO] = None, entrada: Optional[TextIO] = None):
+        """Executa os blocos principais em ordem; retorne num deles encerra o programa"""
+        self.saida = saida if saida is not None else sys.stdout
+        self.entrada = entrada if entrada is not None else sys.stdin
+        # Os blocos principais usam a própria lista de globais como quadro
+        self.globais[:] = [None] * len(self.globais_escopo)
+        globais = self.globais
+        try:
+            with limite_recursao():
+                for bloco in self.blocos:
+                    if bloco(globais) is not None:
+                        break
+        except RecursionError:
+            raise ErroExecucao("Recursão profunda demais") from None
+        except TypeError as e:
+            raise ErroExecucao(f"Operação inválida: {e}") from None
+
+    @staticmethod
+    def memoizar(funcao: Funcao, maximo: Optional[int]) -> Callable:
+        """Chamada de funcao, com a lista de argumentos, passando pelo cache de funcao.cache_memo.
+
+        As chaves vêm de chave_memo. Chamadas que terminam em erro não entram
+        no cache. O cache é Python puro, e não functools.lru_cache, para que a
+        recursão das funções memoizadas não consuma a pilha C.
+        """
+        cache = funcao.cache_memo = CacheMemo(maximo)
+        resultados = cache.resultados
+        locais = [None] * (len(funcao.escopo) - len(funcao.declaracao.parametros))
+        padrao = funcao.padrao
+
+        unico = len(funcao.declaracao.parametros) == 1
+        copysign = math.copysign
+
+        def chamar(argumentos: list):
+            if unico:  # caso mais comum, com chave_memo em linha
+                valor = argumentos[0]
+                chave = ((float, valor, copysign(1.0, valor)) if type(valor) is float
+                         else (type(valor), valor))
+            else:
+                chave = tuple(map(chave_memo, argumentos))
+            # get e não try/except KeyError: a exceção materializa os quadros
+            # da pilha, e a recursão profunda fica quadrática
+            valor = resultados.get(chave, _AUSENTE)
+            if valor is not _AUSENTE:
+                cache.acertos += 1
+                resultados.move_to_end(chave)
+                return valor
+            cache.faltas += 1
+            retorno = funcao.corpo(argumentos + locais)
+            valor = padrao if retorno is None else retorno[0]
+            resultados[chave] = valor
+            if maximo is not None and len(resultados) > maximo:
+                resultados.popitem(last=False)
+            return valor
+        return chamar
+
+    def estatisticas_memo(self) -> Dict[str, EstatisticasMemo]:
+        """Acertos e faltas do cache de cada função pura"""
+        estatisticas = {}
+        for nome, funcao in self.funcoes.items():
+            if funcao.cache_memo is not None:
+                estatisticas[nome] = funcao.cache_memo.estatisticas()
+        return estatisticas
+
+    def limpar_memo(self):
+        for funcao in self.funcoes.values():
+            if funcao.cache_memo is not None:
+                funcao.cache_memo.limpar()
+
+    # ---------- comandos ----------
+
+    def compilar_bloco(self, comandos: List[No], escopo: Escopo) -> Comando:
+        compilados = [self.compilar_comando(comando, escopo) for comando in comandos]
+        if not compilados:
+            return lambda quadro: None
+        if len(compilados) == 1:
+            return compilados[0]
+        if len(compilados) == 2:
+            primeiro, segundo = compilados
+            # (valor,) é sempre verdadeiro, então 'or' só segue sem retorne
+            return lambda quadro: primeiro(quadro) or segundo(quadro)
+
+        def bloco(quadro):
+            for comando in compilados:
+                retorno = comando(quadro)
+                if retorno is not None:
+                    return retorno
+        return bloco
+
+    def compilar_comando(self, comando, escopo: Escopo) -> Comando:
+        if isinstance(comando, DeclaracaoVariavel):
+            if comando.valor_inicial is None:
+                padrao = VALORES_PADRAO[comando.tipo]
+                return self.compilar_atribuicao(comando.nome, lambda quadro: padrao, escopo)
+            valor = self.compilar_expressao(comando.valor_inicial, escopo)
+            return self.compilar_atribuicao(comando.nome, valor, escopo)
+        if isinstance(comando, Atribuicao):
+            valor = self.compilar_expressao(comando.valor, escopo)
+            return self.compilar_atribuicao(comando.nome, valor, escopo)
+        if isinstance(comando, ComandoSe):
+            return self.compilar_se(comando, escopo)
+        if isinstance(comando, tuple) and comando[0] == 'ENQUANTO':
+            return self.compilar_enquanto(comando, escopo)
+        if isinstance(comando, tuple) and comando[0] == 'PARA':
+            return self.compilar_para(comando, escopo)
+        if isinstance(comando, ComandoEscreva):
+            return self.compilar_escreva(comando, escopo)
+        if isinstance(comando, ComandoLeia):
+            return self.compilar_leia(comando, escopo)
+        if isinstance(comando, ChamadaFuncao):
+            chamada = self.compilar_chamada(comando, escopo)
+
+            def descartar(quadro):
+                chamada(quadro)
+            return descartar
+        if isinstance(comando, Retorne):
+            if comando.valor is None:
+                return lambda quadro: (None,)
+            valor = self.compilar_expressao(comando.valor, escopo)
+            return lambda quadro: (valor(quadro),)
+        raise ErroSemantico(f"Comando não suportado: {comando!r}")
+
+    def resolver(self, nome: str, escopo: Escopo):
+        """(quadro ou None se local, slot) da variável nome"""
+        if nome in escopo.slots:
+            return None, escopo.slots[nome]
+        if nome in self.globais_escopo.slots:
+            return self.globais, self.globais_escopo.slots[nome]
+        raise ErroSemantico(f"Variável '{nome}' não declarada")
+
+    def compilar_atribuicao(self, nome: str, expressao: Expressao, escopo: Escopo) -> Comando:
+        globais, slot = self.resolver(nome, escopo)
+        if globais is None:
+            def atribuir(quadro):
+                quadro[slot] = expressao(quadro)
+        else:
+            def atribuir(quadro):
+                globais[slot] = expressao(quadro)
+        return atribuir
+
+    def compilar_se(self, comando: ComandoSe, escopo: Escopo) -> Comando:
+        condicao = self.compilar_expressao(comando.condicao, escopo)
+        entao = self.compilar_bloco(comando.bloco_se, escopo)
+        if not comando.bloco_senao:
+            def se(quadro):
+                if condicao(quadro):
+                    return entao(quadro)
+            return se
+        senao = self.compilar_bloco(comando.bloco_senao, escopo)
+
+        def se_senao(quadro):
+            if condicao(quadro):
+                return entao(quadro)
+            return senao(quadro)
+        return se_senao
+
+    def compilar_enquanto(self, comando: tuple, escopo: Escopo) -> Comando:
+        _, condicao, corpo = comando
+        condicao = self.compilar_expressao(condicao, escopo)
+        corpo = self.compilar_bloco(corpo, escopo)
+
+        def enquanto(quadro):
+            while condicao(quadro):
+                retorno = corpo(quadro)
+                if retorno is not None:
+                    return retorno
+        return enquanto
+
+    def compilar_para(self, comando: tuple, escopo: Escopo) -> Comando:
+        _, inicial, condicao, passo, corpo = comando
+        inicial = self.compilar_comando(inicial, escopo)
+        condicao = self.compilar_expressao(condicao, escopo)
+        passo = self.compilar_comando(passo, escopo)
+        corpo = self.compilar_bloco(corpo, escopo)
+
+        def para(quadro):
+            inicial(quadro)
+            while condicao(quadro):
+                retorno = corpo(quadro)
+                if retorno is not None:
+                    return retorno
+                passo(quadro)
+        return para
+
+    def compilar_escreva(self, comando: ComandoEscreva, escopo: Escopo) -> Comando:
+        expressao = self.compilar_expressao(comando.expressao, escopo)
+
+        def escreva(quadro):
+            self.saida.write(formatar_valor(expressao(quadro)) + '\n')
+        return escreva
+
+    def compilar_leia(self, comando: ComandoLeia, escopo: Escopo) -> Comando:
+        globais, slot = self.resolver(comando.variavel, escopo)
+        tipo = (escopo if globais is None else self.globais_escopo).tipos[comando.variavel]
+
+        def leia(quadro):
+            linha = self.entrada.readline()
+            if not linha:
+                raise ErroExecucao(f"Fim da entrada ao ler '{comando.variavel}'")
+            (quadro if globais is None else globais)[slot] = converter_entrada(linha, tipo)
+        return leia
+
+    # ---------- expressões ----------
+
+    def compilar_expressao(self, no: No, escopo: Escopo) -> Expressao:
+        if isinstance(no, (Numero, String, Booleano)):
+            valor = no.valor
+            return lambda quadro: valor
+        if isinstance(no, Identificador):
+            globais, slot = self.resolver(no.nome, escopo)
+            if globais is None:
+                return lambda quadro: quadro[slot]
+            return lambda quadro: globais[slot]
+        if isinstance(no, ExpressaoBinaria):
+            return self.compilar_binaria(no, escopo)
+        if isinstance(no, ExpressaoUnaria):
+            operando = self.compilar_expressao(no.operando, escopo)
+            return lambda quadro: -operando(quadro)
+        if isinstance(no, ChamadaFuncao):
+            return self.compilar_chamada(no, escopo)
+        raise ErroSemantico(f"Expressão não suportada: {no!r}")
+
+    def compilar_binaria(self, no: ExpressaoBinaria, escopo: Escopo) -> Expressao:
+        operacao = OPERADORES[no.operador]
+        esquerda = self.compilar_expressao(no.esquerda, escopo)
+        direita = no.direita
+        # Casos comuns (n - 1, i < 10, x * 2) sem a chamada do operando constante
+        if isinstance(direita, (Numero, String, Booleano)):
+            constante = direita.valor
+            if isinstance(no.esquerda, Identificador) and no.esquerda.nome in escopo.slots:
+                slot = escopo.slots[no.esquerda.nome]
+                return lambda quadro: operacao(quadro[slot], constante)
+            return lambda quadro: operacao(esquerda(quadro), constante)
+        direita = self.compilar_expressao(direita, escopo)
+        return lambda quadro: operacao(esquerda(quadro), direita(quadro))
+
+    def compilar_chamada(self, no: ChamadaFuncao, escopo: Escopo) -> Expressao:
+        funcao = self.funcoes.get(no.nome)
+        if funcao is None:
+            raise ErroSemantico(f"Função '{no.nome}' não declarada")
+        esperados = len(funcao.declaracao.parametros)
+        if len(no.argumentos) != esperados:
+            raise ErroSemantico(
+                f"Função '{no.nome}' espera {esperados} argumento(s), recebeu {len(no.argumentos)}")
+        argumentos = [self.compilar_expressao(argumento, escopo) for argumento in no.argumentos]
+        if funcao.memo is not None:
+            memo = funcao.memo
+            if len(argumentos) == 1:
+                argumento, = argumentos
+                return lambda quadro: memo([argumento(quadro)])
+            return lambda quadro: memo([argumento(quadro) for argumento in argumentos])
+        locais = [None] * (len(funcao.escopo) - esperados)
+        padrao = funcao.padrao
+
+        if len(argumentos) == 1:
+            argumento, = argumentos
+
+            def chamar(quadro):
+                retorno = funcao.corpo([argumento(quadro), *locais])
+                return padrao if retorno is None else retorno[0]
+        else:
+            def chamar(quadro):
+                retorno = funcao.corpo([argumento(quadro) for argumento in argumentos] + locais)
+                return padrao if retorno is None else retorno[0]
+        return chamar
+
+def executar(programa: Programa, saida: Optional[TextIO] = None, entrada: Optional[TextIO] = None,
+             memo: Optional[int] = TAMANHO_MEMO) -> Executor:
+    """Compila e executa programa; devolve o Executor (com as globais finais)"""
+    executor = Executor(programa, memo)
+    executor.executar(saida, entrada)
+    return executor
@@ -1,49 +1,217 @@
-from AnalisadorLexico import AnalisadorLexico
-from AnalisadorSLR import AnalisadorSLR
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Iterable, Iterator, List, Optional
+
+from AnalisadorLexico import AnalisadorLexico, TAMANHO_BLOCO
+from AnalisadorSLR import MAX_ERROS, AnalisadorSLR
 from ast_nodes import *
+from cache_ast import CacheAST
+from compilador import compilar_codigo, renderizar
+from metricas import Instrumentacao
+
+def compilar(codigo_fonte: str, mostrar_tokens: bool = True, compacto: bool = False,
+             instrumentacao: Optional[Instrumentacao] = None, max_erros: Optional[int] = MAX_ERROS,
+             cache: Optional[CacheAST] = None):
+    """Executa análise léxica e sintática e imprime o relatório
+
+    Com compacto=True os tokens ficam num TokenStream (colunas de inteiros)
+    em vez de uma lista de objetos Token. Com instrumentacao, as métricas da
+    compilação (tempos por fase, tokens por tipo, deslocamentos e reduções,
+    pilha máxima, erros) ficam em instrumentacao.metricas. Com max_erros > 1
+    (ou None, sem limite) a análise sintática se recupera dos erros em vez de
+    parar no primeiro. Com cache (e sem instrumentacao), um código já
+    compilado é carregado do cache em disco. Para compilar sem saída no
+    console, use compilador.compilar_codigo.
+    """
+    if instrumentacao is None:
+        if cache is not None:
+            resultado = cache.compilar(codigo_fonte, max_erros)
+        else:
+            resultado = compilar_codigo(codigo_fonte, compacto, max_erros=max_erros)
+        renderizar(resultado, sys.stdout, mostrar_tokens)
+        return resultado.ast if resultado.ok else None
+
+    # A instrumentação cobre também o relatório: só finaliza depois dele
+    instrumentacao.iniciar()
+    try:
+        resultado = compilar_codigo(codigo_fonte, compacto, instrumentacao, max_erros, finalizar=False)
+        renderizar(resultado, sys.stdout, mostrar_tokens, instrumentacao)
+    finally:
+        instrumentacao.finalizar()
+    return resultado.ast if resultado.ok else None
 
-def compilar(codigo_fonte: str, mostrar_tokens: bool = True):
-    """Executa análise léxica e sintática"""
+def compilar_fluxo(fonte, ao_declarar=None, tamanho_bloco: int = TAMANHO_BLOCO):
+    """Executa análise léxica e sintática em fluxo.
+
+    fonte pode ser um arquivo aberto, um mmap, bytes ou um iterável de blocos.
+    Os tokens passam do léxico ao parser sem formar uma lista; com
+    ao_declarar, cada declaração de topo é entregue ao ser reconhecida e não
+    fica retida no Programa devolvido.
+    """
     print("\n" + "="*70)
-    print("COMPILADOR - ANÁLISE LÉXICA E SINTÁTICA")
+    print("COMPILADOR - ANÁLISE LÉXICA E SINTÁTICA EM FLUXO")
     print("="*70)
-    
-    # Fase 1: Análise Léxica
-    print("\n[FASE 1] Análise Léxica...")
-    lexer = AnalisadorLexico(codigo_fonte)
-    tokens = lexer.analisar()
-    
-    print(f"✓ Total de tokens: {len(tokens) - 1}")
-    
-    if mostrar_tokens:
-        print("\nTokens encontrados:")
-        lexer.imprimir_tokens()
-    
+
+    lexer = AnalisadorLexico.de_fluxo(fonte, tamanho_bloco)
+    parser = AnalisadorSLR(lexer.gerar_tokens(), ao_declarar=ao_declarar)
+    ast = parser.analisar()
+
     if lexer.erros:
         print(f"✗ Erros léxicos encontrados: {len(lexer.erros)}")
         print("\nErros léxicos:")
         lexer.imprimir_erros()
         return None
-    
-    # Fase 2: Análise Sintática SLR
-    print("\n[FASE 2] Análise Sintática SLR...")
-    parser = AnalisadorSLR(tokens)
-    ast = parser.analisar()
-    
-    print("\nResultado da análise SLR:")
+
+    print(f"✓ Total de tokens: {parser.pos}")
     parser.imprimir_erros()
-    
+
     if parser.erros:
         print(f"✗ Erros sintáticos encontrados: {len(parser.erros)}")
         return None
-    
+
     print("✓ Análise Sintática SLR concluída com sucesso!")
-    
+
     return ast
 
+@dataclass
+class ResultadoArquivo:
+    """Resultado da compilação de um arquivo no modo em lote"""
+    caminho: str
+    tokens: int = 0
+    tamanho: int = 0  # caracteres do fonte
+    segundos: float = 0.0
+    erros: List[str] = field(default_factory=list)
+    em_cache: bool = False  # carregado do CacheAST
+
+    @property
+    def ok(self) -> bool:
+        return not self.erros
+
+def compilar_arquivo(caminho: str, codigo_fonte: Optional[str] = None,
+                     max_erros: Optional[int] = MAX_ERROS, cache: Optional[CacheAST] = None) -> ResultadoArquivo:
+    """Análise léxica e sintática de um arquivo, sem imprimir nada"""
+    resultado = ResultadoArquivo(caminho)
+    inicio = time.perf_counter()
+    try:
+        if codigo_fonte is None:
+            with open(caminho, encoding='utf-8') as arquivo:
+                codigo_fonte = arquivo.read()
+    except (OSError, UnicodeDecodeError) as e:
+        resultado.erros.append(f"Erro ao ler o arquivo: {e}")
+        return resultado
+    resultado.tamanho = len(codigo_fonte)
+
+    if cache is not None:
+        compilacao = cache.compilar(codigo_fonte, max_erros)
+        resultado.em_cache = 'cache' in compilacao.tempos
+    else:
+        compilacao = compilar_codigo(codigo_fonte, max_erros=max_erros)
+    resultado.tokens = len(compilacao.tokens) - 1
+    resultado.erros = compilacao.erros
+    resultado.segundos = time.perf_counter() - inicio
+    return resultado
+
+def _compilar_fonte(fonte, max_erros: Optional[int] = MAX_ERROS, cache: Optional[CacheAST] = None) -> ResultadoArquivo:
+    caminho, codigo_fonte = fonte
+    return compilar_arquivo(caminho, codigo_fonte, max_erros, cache)
+
+def _preparar_trabalhador():
+    """Carrega as tabelas SLR uma vez por processo do pool"""
+    AnalisadorSLR([])
+
+def expandir_fontes(argumentos: Iterable[str]) -> List[tuple]:
+    """Converte arquivos, globs e '-' (entrada padrão) em pares (caminho, código).
+
+    O código só é lido aqui para a entrada padrão; arquivos são lidos pelos
+    trabalhadores.
+    """
+    fontes = []
+    for argumento in argumentos:
+        if argumento == '-':
+            fontes.append(('<stdin>', sys.stdin.read()))
+        elif glob.has_magic(argumento):
+            fontes.extend((caminho, None) for caminho in sorted(glob.glob(argumento, recursive=True))
+                          if os.path.isfile(caminho))
+        else:
+            fontes.append((argumento, None))
+    return fontes
+
+def compilar_lote(fontes: List[tuple], jobs: int = 1, max_erros: Optional[int] = MAX_ERROS,
+                  cache: Optional[CacheAST] = None) -> Iterator[ResultadoArquivo]:
+    """Compila as fontes, em paralelo com jobs > 1, devolvendo os resultados em ordem.
+
+    Os arquivos são distribuídos em lotes (chunksize) para amortizar a troca
+    de mensagens entre processos. Com cache, os processos compartilham o
+    mesmo diretório de CacheAST.
+    """
+    compilar_fonte = partial(_compilar_fonte, max_erros=max_erros, cache=cache)
+    if jobs <= 1 or len(fontes) <= 1:
+        _preparar_trabalhador()
+        yield from map(compilar_fonte, fontes)
+        return
+    lote = max(1, min(64, len(fontes) // (jobs * 4)))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_preparar_trabalhador) as executor:
+        yield from executor.map(compilar_fonte, fontes, chunksize=lote)
+
+def principal(argumentos: Optional[List[str]] = None) -> int:
+    """Ponto de entrada da linha de comando; devolve o código de saída"""
+    parser = argparse.ArgumentParser(
+        description="Análise léxica e sintática de arquivos fonte em lote.")
+    parser.add_argument('arquivos', nargs='+',
+                        help="arquivos, padrões glob (ex.: 'src/**/*.slr') ou '-' para a entrada padrão")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="processos trabalhadores (0 = um por núcleo)")
+    parser.add_argument('-q', '--quieto', action='store_true',
+                        help="mostra só os arquivos com erro e o resumo")
+    parser.add_argument('-e', '--max-erros', type=int, default=MAX_ERROS,
+                        help="erros sintáticos por arquivo antes de desistir; acima de 1 a "
+                             "análise se recupera dos erros, e 1 para no primeiro "
+                             "(0 = sem limite; padrão: %(default)s)")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="não usa nem grava o cache de ASTs em disco "
+                             "(em $XDG_CACHE_HOME/slr ou SLR_CACHE_DIR)")
+    opcoes = parser.parse_args(argumentos)
+
+    jobs = opcoes.jobs or os.cpu_count() or 1
+    fontes = expandir_fontes(opcoes.arquivos)
+    if not fontes:
+        print("Nenhum arquivo encontrado", file=sys.stderr)
+        return 2
+
+    cache = None if opcoes.sem_cache else CacheAST()
+    inicio = time.perf_counter()
+    arquivos = falhas = tokens = tamanho = em_cache = 0
+    for resultado in compilar_lote(fontes, jobs, opcoes.max_erros or None, cache):
+        arquivos += 1
+        em_cache += resultado.em_cache
+        tokens += resultado.tokens
+        tamanho += resultado.tamanho
+        if resultado.ok:
+            if not opcoes.quieto:
+                print(f"✓ {resultado.caminho} ({resultado.tokens} tokens, {resultado.segundos * 1000:.1f} ms)")
+        else:
+            falhas += 1
+            print(f"✗ {resultado.caminho}")
+            for erro in resultado.erros:
+                print(f"  - {erro}")
+    segundos = max(time.perf_counter() - inicio, 1e-9)
+
+    print(f"\n{arquivos} arquivo(s) ({em_cache} do cache), {falhas} com erro, {tokens} tokens em {segundos:.2f} s "
+          f"({jobs} processo(s)): {tokens / segundos:,.0f} tokens/s, "
+          f"{tamanho / segundos / 1e6:.2f} MB/s")
+    return 1 if falhas else 0
+
 # ==================== EXEMPLOS DE TESTE ====================
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(principal())
     
     print("\n### EXEMPLO 1: Declarações e Atribuições ###")
     codigo1 = """
@@ -0,0 +1,398 @@
+import marshal
+import sys
+from array import array
+from dataclasses import dataclass, field
+from typing import List, Optional, TextIO
+
+from ast_nodes import *
+from executor import (LIMITE_CHAMADAS, ErroExecucao, ErroSemantico, Escopo, VALORES_PADRAO,
+                      converter_entrada, dividir, formatar_valor)
+
+# Instruções: (código, argumento), duas posições cada no vetor de bytecode;
+# endereços (saltos, entradas de funções) contam instruções, não posições.
+# A ordem de teste na máquina segue a frequência típica, não a numeração.
+CONST = 0          # empilha constantes[arg]
+CARREGAR = 1       # empilha quadro[arg]
+GUARDAR = 2        # desempilha em quadro[arg]
+CARREGAR_GLOBAL = 3
+GUARDAR_GLOBAL = 4
+SOMAR = 5
+SUBTRAIR = 6
+MULTIPLICAR = 7
+DIVIDIR = 8
+MAIOR = 9
+MENOR = 10
+MAIOR_IGUAL = 11
+MENOR_IGUAL = 12
+IGUAL = 13
+DIFERENTE = 14
+NEGAR = 15
+SALTAR = 16        # pc = arg
+SALTAR_SE_FALSO = 17
+CHAMAR = 18        # chama funcoes[arg] com os argumentos do topo da pilha
+RETORNAR = 19      # o valor de retorno fica no topo da pilha
+DESCARTAR = 20
+ESCREVER = 21
+LER = 22           # empilha a linha lida convertida para constantes[arg] (o tipo)
+PARAR = 23
+
+NOMES_INSTRUCOES = ['CONST', 'CARREGAR', 'GUARDAR', 'CARREGAR_GLOBAL', 'GUARDAR_GLOBAL',
+                    'SOMAR', 'SUBTRAIR', 'MULTIPLICAR', 'DIVIDIR', 'MAIOR', 'MENOR',
+                    'MAIOR_IGUAL', 'MENOR_IGUAL', 'IGUAL', 'DIFERENTE', 'NEGAR', 'SALTAR',
+                    'SALTAR_SE_FALSO', 'CHAMAR', 'RETORNAR', 'DESCARTAR', 'ESCREVER', 'LER', 'PARAR']
+
+INSTRUCOES_BINARIAS = {'+': SOMAR, '-': SUBTRAIR, '*': MULTIPLICAR, '/': DIVIDIR,
+                       '>': MAIOR, '<': MENOR, '>=': MAIOR_IGUAL, '<=': MENOR_IGUAL,
+                       '==': IGUAL, '!=': DIFERENTE}
+
+# Versão do formato serializado; incrementar ao mudar instruções ou campos
+VERSAO_BYTECODE = 1
+MAGICO = b'SLRB'
+
+# LIMITE_CHAMADAS (de executor) limita as chamadas aninhadas; a máquina não
+# usa a pilha do Python e por isso não precisa de executor.limite_recursao
+
+@dataclass
+class Bytecode:
+    """Programa compilado: vetor de instruções, constantes e tabela de funções.
+
+    Os blocos principais vêm primeiro e terminam em PARAR; cada função é
+    (entrada, parâmetros, locais além dos parâmetros, nome). Os blocos
+    principais usam as globais como quadro.
+    """
+    codigo: array = field(default_factory=lambda: array('i'))
+    constantes: List[object] = field(default_factory=list)
+    funcoes: List[tuple] = field(default_factory=list)
+    globais: int = 0
+
+    def para_bytes(self) -> bytes:
+        """Serializa com marshal: só ints, floats, strings, bools e None"""
+        return MAGICO + marshal.dumps(
+            (VERSAO_BYTECODE, self.codigo.tobytes(), self.constantes, self.funcoes, self.globais))
+
+    @classmethod
+    def de_bytes(cls, dados: bytes) -> 'Bytecode':
+        if not dados.startswith(MAGICO):
+            raise ValueError("Dados não são bytecode")
+        versao, codigo, constantes, funcoes, globais = marshal.loads(dados[len(MAGICO):])
+        if versao != VERSAO_BYTECODE:
+            raise ValueError(f"Bytecode na versão {versao}, esperada {VERSAO_BYTECODE}")
+        vetor = array('i')
+        vetor.frombytes(codigo)
+        return cls(vetor, list(constantes), [tuple(f) for f in funcoes], globais)
+
+    def desmontar(self) -> List[str]:
+        """Listagem legível das instruções"""
+        entradas = {funcao[0]: funcao[3] for funcao in self.funcoes}
+        linhas = []
+        for pc in range(len(self.codigo) // 2):
+            if pc in entradas:
+                linhas.append(f"{entradas[pc]}:")
+            instrucao, argumento = self.codigo[2 * pc], self.codigo[2 * pc + 1]
+            texto = f"{pc:6}  {NOMES_INSTRUCOES[instrucao]:<16}{argumento}"
+            if instrucao in (CONST, LER):
+                texto += f"  ({self.constantes[argumento]!r})"
+            elif instrucao == CHAMAR:
+                texto += f"  ({self.funcoes[argumento][3]})"
+            linhas.append(texto)
+        return linhas
+
+class CompiladorBytecode:
+    """Gera Bytecode a partir da AST, com as mesmas regras do executor.Executor"""
+
+    def __init__(self):
+        self.bytecode = Bytecode()
+        self.codigo = self.bytecode.codigo
+        self.indices_constantes = {}
+        self.globais = Escopo()
+        self.funcoes = {}  # nome -> (índice, declaração, escopo)
+
+    def compilar(self, programa: Programa) -> Bytecode:
+        blocos = []
+        for declaracao in programa.declaracoes:
+            if isinstance(declaracao, DeclaracaoFuncao):
+                if declaracao.nome in self.funcoes:
+                    raise ErroSemantico(f"Função '{declaracao.nome}' declarada mais de uma vez")
+                escopo = Escopo()
+                for tipo, nome in declaracao.parametros:
+                    escopo.declarar(nome, tipo)
+                escopo.coletar(declaracao.corpo)
+                self.funcoes[declaracao.nome] = (len(self.funcoes), declaracao, escopo)
+            else:
+                self.globais.coletar(declaracao)
+                blocos.append(declaracao)
+
+        try:
+            for bloco in blocos:
+                self.compilar_bloco(bloco, self.globais)
+            self.emitir(PARAR)
+            tabela = []
+            for _, declaracao, escopo in self.funcoes.values():
+                entrada = self.endereco()
+                self.compilar_bloco(declaracao.corpo, escopo)
+                self.emitir(CONST, self.constante(VALORES_PADRAO.get(declaracao.tipo_retorno)))
+                self.emitir(RETORNAR)
+                parametros = len(declaracao.parametros)
+                tabela.append((entrada, parametros, len(escopo) - parametros, declaracao.nome))
+        except RecursionError:
+            raise ErroSemantico("Programa aninhado demais para compilar") from None
+        self.bytecode.funcoes = tabela
+        self.bytecode.globais = len(self.globais)
+        return self.bytecode
+
+    def emitir(self, instrucao: int, argumento: int = 0) -> int:
+        """Acrescenta a instrução; devolve a posição do argumento (para remendar saltos)"""
+        self.codigo.append(instrucao)
+        self.codigo.append(argumento)
+        return len(self.codigo) - 1
+
+    def endereco(self) -> int:
+        """Endereço da próxima instrução"""
+        return len(self.codigo) // 2
+
+    def remendar(self, posicao: int):
+        """Faz o salto em posicao apontar para a próxima instrução"""
+        self.codigo[posicao] = self.endereco()
+
+    def constante(self, valor) -> int:
+        # repr separa 0.0 de -0.0 (iguais para o dicionário) e junta os nan
+        chave = (type(valor), repr(valor) if isinstance(valor, float) else valor)
+        indice = self.indices_constantes.get(chave)
+        if indice is None:
+            indice = self.indices_constantes[chave] = len(self.bytecode.constantes)
+            self.bytecode.constantes.append(valor)
+        return indice
+
+    def resolver(self, nome: str, escopo: Escopo):
+        """(é global, slot) da variável nome"""
+        if nome in escopo.slots:
+            return escopo is self.globais, escopo.slots[nome]
+        if nome in self.globais.slots:
+            return True, self.globais.slots[nome]
+        raise ErroSemantico(f"Variável '{nome}' não declarada")
+
+    def guardar(self, nome: str, escopo: Escopo):
+        # Nos blocos principais o quadro é a própria lista de globais
+        global_, slot = self.resolver(nome, escopo)
+        self.emitir(GUARDAR_GLOBAL if global_ and escopo is not self.globais else GUARDAR, slot)
+
+    def compilar_bloco(self, comandos: List[No], escopo: Escopo):
+        for comando in comandos:
+            self.compilar_comando(comando, escopo)
+
+    def compilar_comando(self, comando, escopo: Escopo):
+        if isinstance(comando, DeclaracaoVariavel):
+            if comando.valor_inicial is None:
+                self.emitir(CONST, self.constante(VALORES_PADRAO[comando.tipo]))
+            else:
+                self.compilar_expressao(comando.valor_inicial, escopo)
+            self.guardar(comando.nome, escopo)
+        elif isinstance(comando, Atribuicao):
+            self.compilar_expressao(comando.valor, escopo)
+            self.guardar(comando.nome, escopo)
+        elif isinstance(comando, ComandoSe):
+            self.compilar_expressao(comando.condicao, escopo)
+            senao = self.emitir(SALTAR_SE_FALSO)
+            self.compilar_bloco(comando.bloco_se, escopo)
+            if comando.bloco_senao:
+                fim = self.emitir(SALTAR)
+                self.remendar(senao)
+                self.compilar_bloco(comando.bloco_senao, escopo)
+                self.remendar(fim)
+            else:
+                self.remendar(senao)
+        elif isinstance(comando, tuple) and comando[0] == 'ENQUANTO':
+            _, condicao, corpo = comando
+            teste = self.endereco()
+            self.compilar_expressao(condicao, escopo)
+            saida = self.emitir(SALTAR_SE_FALSO)
+            self.compilar_bloco(corpo, escopo)
+            self.emitir(SALTAR, teste)
+            self.remendar(saida)
+        elif isinstance(comando, tuple) and comando[0] == 'PARA':
+            _, inicial, condicao, passo, corpo = comando
+            self.compilar_comando(inicial, escopo)
+            teste = self.endereco()
+            self.compilar_expressao(condicao, escopo)
+            saida = self.emitir(SALTAR_SE_FALSO)
+            self.compilar_bloco(corpo, escopo)
+            self.compilar_comando(passo, escopo)
+            self.emitir(SALTAR, teste)
+            self.remendar(saida)
+        elif isinstance(comando, ComandoEscreva):
+            self.compilar_expressao(comando.expressao, escopo)
+            self.emitir(ESCREVER)
+        elif isinstance(comando, ComandoLeia):
+            self.resolver(comando.variavel, escopo)
+            dono = escopo if comando.variavel in escopo.slots else self.globais
+            self.emitir(LER, self.constante(dono.tipos[comando.variavel]))
+            self.guardar(comando.variavel, escopo)
+        elif isinstance(comando, ChamadaFuncao):
+            self.compilar_expressao(comando, escopo)
+            self.emitir(DESCARTAR)
+        elif isinstance(comando, Retorne):
+            if escopo is self.globais:
+                self.emitir(PARAR)  # retorne num bloco principal encerra o programa
+                return
+            if comando.valor is None:
+                self.emitir(CONST, self.constante(None))
+            else:
+                self.compilar_expressao(comando.valor, escopo)
+            self.emitir(RETORNAR)
+        else:
+            raise ErroSemantico(f"Comando não suportado: {comando!r}")
+
+    def compilar_expressao(self, no: No, escopo: Escopo):
+        if isinstance(no, (Numero, String, Booleano)):
+            self.emitir(CONST, self.constante(no.valor))
+        elif isinstance(no, Identificador):
+            global_, slot = self.resolver(no.nome, escopo)
+            self.emitir(CARREGAR_GLOBAL if global_ and escopo is not self.globais else CARREGAR, slot)
+        elif isinstance(no, ExpressaoBinaria):
+            self.compilar_expressao(no.esquerda, escopo)
+            self.compilar_expressao(no.direita, escopo)
+            self.emitir(INSTRUCOES_BINARIAS[no.operador])
+        elif isinstance(no, ExpressaoUnaria):
+            self.compilar_expressao(no.operando, escopo)
+            self.emitir(NEGAR)
+        elif isinstance(no, ChamadaFuncao):
+            if no.nome not in self.funcoes:
+                raise ErroSemantico(f"Função '{no.nome}' não declarada")
+            indice, declaracao, _ = self.funcoes[no.nome]
+            if len(no.argumentos) != len(declaracao.parametros):
+                raise ErroSemantico(f"Função '{no.nome}' espera {len(declaracao.parametros)} "
+                                    f"argumento(s), recebeu {len(no.argumentos)}")
+            for argumento in no.argumentos:
+                self.compilar_expressao(argumento, escopo)
+            self.emitir(CHAMAR, indice)
+        else:
+            raise ErroSemantico(f"Expressão não suportada: {no!r}")
+
+def compilar_bytecode(programa: Programa) -> Bytecode:
+    """Compila a AST de um programa para Bytecode"""
+    return CompiladorBytecode().compilar(programa)
+
+class MaquinaVirtual:
+    """Executa Bytecode num laço de despacho com pilha de operandos explícita.
+
+    As chamadas também ficam numa pilha própria, então a recursão da
+    linguagem não consome a pilha do Python. instrucoes conta as instruções
+    executadas na última execução.
+    """
+
+    def __init__(self, bytecode: Bytecode):
+        self.bytecode = bytecode
+        self.globais: List[object] = []
+        self.instrucoes = 0
+
+    def executar(self, saida: Optional[TextIO] = None, entrada: Optional[TextIO] = None):
+        saida = saida if saida is not None else sys.stdout
+        entrada = entrada if entrada is not None else sys.stdin
+        try:
+            self._executar(saida, entrada)
+        except TypeError as e:
+            raise ErroExecucao(f"Operação inválida: {e}") from None
+
+    def _executar(self, saida: TextIO, entrada: TextIO):
+        codigo = self.bytecode.codigo
+        programa = list(zip(codigo[0::2], codigo[1::2]))  # (instrução, argumento) por endereço
+        constantes = self.bytecode.constantes
+        funcoes = [(entrada_, parametros, [None] * locais)
+                   for entrada_, parametros, locais, _ in self.bytecode.funcoes]
+        self.globais = globais = [None] * self.bytecode.globais
+        quadro = globais
+        pilha = []
+        empilhar = pilha.append
+        desempilhar = pilha.pop
+        chamadas = []
+        escrever = saida.write
+        pc = 0
+        executadas = 0
+
+        while True:
+            instrucao, argumento = programa[pc]
+            pc += 1
+            executadas += 1
+            if instrucao == CARREGAR:
+                empilhar(quadro[argumento])
+            elif instrucao == CONST:
+                empilhar(constantes[argumento])
+            elif instrucao == GUARDAR:
+                quadro[argumento] = desempilhar()
+            elif instrucao == SALTAR_SE_FALSO:
+                if not desempilhar():
+                    pc = argumento
+            elif instrucao == SOMAR:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] + direita
+            elif instrucao == SUBTRAIR:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] - direita
+            elif instrucao == MULTIPLICAR:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] * direita
+            elif instrucao == MENOR:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] < direita
+            elif instrucao == MENOR_IGUAL:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] <= direita
+            elif instrucao == SALTAR:
+                pc = argumento
+            elif instrucao == CHAMAR:
+                entrada_funcao, parametros, locais = funcoes[argumento]
+                if parametros:
+                    novo = pilha[-parametros:]
+                    del pilha[-parametros:]
+                    novo += locais
+                else:
+                    novo = locais[:]
+                if len(chamadas) >= LIMITE_CHAMADAS:
+                    raise ErroExecucao("Recursão profunda demais")
+                chamadas.append((pc, quadro))
+                quadro = novo
+                pc = entrada_funcao
+            elif instrucao == RETORNAR:
+                pc, quadro = chamadas.pop()
+            elif instrucao == CARREGAR_GLOBAL:
+                empilhar(globais[argumento])
+            elif instrucao == GUARDAR_GLOBAL:
+                globais[argumento] = desempilhar()
+            elif instrucao == MAIOR:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] > direita
+            elif instrucao == MAIOR_IGUAL:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] >= direita
+            elif instrucao == IGUAL:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] == direita
+            elif instrucao == DIFERENTE:
+                direita = desempilhar()
+                pilha[-1] = pilha[-1] != direita
+            elif instrucao == DIVIDIR:
+                direita = desempilhar()
+                pilha[-1] = dividir(pilha[-1], direita)
+            elif instrucao == NEGAR:
+                pilha[-1] = -pilha[-1]
+            elif instrucao == DESCARTAR:
+                desempilhar()
+            elif instrucao == ESCREVER:
+                escrever(formatar_valor(desempilhar()) + '\n')
+            elif instrucao == LER:
+                linha = entrada.readline()
+                if not linha:
+                    raise ErroExecucao("Fim da entrada em leia")
+                empilhar(converter_entrada(linha, constantes[argumento]))
+            elif instrucao == PARAR:
+                self.instrucoes = executadas
+                return
+            else:
+                raise ErroExecucao(f"Instrução inválida {instrucao} em {pc - 1}")
+
+def executar_bytecode(bytecode: Bytecode, saida: Optional[TextIO] = None,
+                      entrada: Optional[TextIO] = None) -> MaquinaVirtual:
+    """Executa bytecode; devolve a MaquinaVirtual (com globais e contagem de instruções)"""
+    maquina = MaquinaVirtual(bytecode)
+    maquina.executar(saida, entrada)
+    return maquina
@@ -0,0 +1,107 @@
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, Iterable, TextIO
+
+from AnalisadorLexico import TIPOS_POR_INDICE, TokenStream
+
+@dataclass
+class Metricas:
+    """Métricas de uma compilação"""
+    tempos: Dict[str, float] = field(default_factory=dict)  # segundos por fase
+    tokens_por_tipo: Dict[str, int] = field(default_factory=dict)
+    deslocamentos: int = 0
+    reducoes: int = 0
+    profundidade_maxima: int = 0  # da pilha de estados do SLR
+    erros_lexicos: int = 0
+    erros_sintaticos: int = 0
+    pico_memoria: int = 0  # bytes (tracemalloc); 0 se não medido
+
+    @property
+    def tokens(self) -> int:
+        return sum(self.tokens_por_tipo.values())
+
+    def para_dict(self) -> dict:
+        return asdict(self)
+
+# Um ouvinte recebe o nome do evento ('fase', 'lexico', 'sintatico' ou 'fim')
+# e os dados dele
+Ouvinte = Callable[[str, dict], None]
+
+class Instrumentacao:
+    """Coleta Metricas durante compilar() e repassa eventos aos ouvintes.
+
+    Sem instrumentação nada disso é executado: o analisador léxico não muda
+    e o SLR só mantém seus contadores de deslocamentos e reduções. A pilha
+    medida e o tracemalloc (memoria=True) só entram quando pedidos.
+    """
+
+    def __init__(self, ouvintes: Iterable[Ouvinte] = (), memoria: bool = False):
+        self.ouvintes = list(ouvintes)
+        self.memoria = memoria
+        self.metricas = Metricas()
+
+    def emitir(self, evento: str, dados: dict):
+        for ouvinte in self.ouvintes:
+            ouvinte(evento, dados)
+
+    @contextmanager
+    def fase(self, nome: str):
+        """Mede o tempo do bloco e o soma à fase nome"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            tempos = self.metricas.tempos
+            tempos[nome] = tempos.get(nome, 0.0) + segundos
+            self.emitir('fase', {'nome': nome, 'segundos': segundos})
+
+    def iniciar(self):
+        self.metricas = Metricas()
+        if self.memoria:
+            tracemalloc.start()
+
+    def finalizar(self) -> Metricas:
+        if self.memoria:
+            self.metricas.pico_memoria = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        self.emitir('fim', self.metricas.para_dict())
+        return self.metricas
+
+    def registrar_lexico(self, lexer):
+        """Conta os tokens por tipo (sem o EOF) e os erros do analisador léxico"""
+        tokens = lexer.tokens
+        if isinstance(tokens, TokenStream):
+            contagem = Counter(TIPOS_POR_INDICE[tipo].name for tipo in tokens.tipos)
+        else:
+            contagem = Counter(token.tipo.name for token in tokens)
+        contagem.pop('EOF', None)
+        self.metricas.tokens_por_tipo = dict(contagem)
+        self.metricas.erros_lexicos = len(lexer.erros)
+        self.emitir('lexico', {'tokens_por_tipo': self.metricas.tokens_por_tipo,
+                               'erros': self.metricas.erros_lexicos})
+
+    def preparar_parser(self, parser):
+        """Liga a medição da profundidade da pilha no AnalisadorSLR"""
+        parser.medir_pilha = True
+
+    def registrar_sintatico(self, parser):
+        metricas = self.metricas
+        metricas.deslocamentos = parser.deslocamentos
+        metricas.reducoes = parser.reducoes
+        metricas.profundidade_maxima = parser.profundidade_maxima
+        metricas.erros_sintaticos = len(parser.erros)
+        self.emitir('sintatico', {'deslocamentos': metricas.deslocamentos, 'reducoes': metricas.reducoes,
+                                  'profundidade_maxima': metricas.profundidade_maxima,
+                                  'erros': metricas.erros_sintaticos})
+
+def exportador_json(destino: TextIO) -> Ouvinte:
+    """Ouvinte que grava as métricas de cada compilação como uma linha JSON"""
+    def exportar(evento: str, dados: dict):
+        if evento == 'fim':
+            destino.write(json.dumps(dados, ensure_ascii=False) + '\n')
+    return exportar
@@ -0,0 +1,286 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ast_nodes import *
+from executor import OPERADORES, ErroExecucao, Escopo
+
+@dataclass
+class EstatisticasOtimizacao:
+    """O que a otimização fez em um Programa"""
+    nos_antes: int = 0
+    nos_depois: int = 0
+    dobras: int = 0           # expressões constantes calculadas
+    simplificacoes: int = 0   # identidades (x + 0, x * 1, --x...)
+    ramos_removidos: int = 0  # blocos de se/enquanto/para que nunca executam
+
+    @property
+    def reducao(self) -> float:
+        """Fração dos nós eliminada"""
+        return 1 - self.nos_depois / self.nos_antes if self.nos_antes else 0.0
+
+def contar_nos(raiz) -> int:
+    """Nós da AST (incluindo as tuplas ENQUANTO/PARA), sem recursão"""
+    total = 0
+    pendentes = [raiz]
+    while pendentes:
+        item = pendentes.pop()
+        if isinstance(item, list):
+            pendentes.extend(item)
+        elif isinstance(item, tuple):
+            total += 1
+            pendentes.extend(item[1:])
+        elif isinstance(item, No):
+            total += 1
+            for campo in item.__slots__:
+                valor = getattr(item, campo)
+                if isinstance(valor, (No, list, tuple)) and campo != 'parametros':
+                    pendentes.append(valor)
+    return total
+
+def _declara(comandos: list) -> bool:
+    """True se comandos declaram alguma variável (mesmo em blocos internos)"""
+    escopo = Escopo()
+    escopo.coletar(comandos)
+    return bool(escopo.slots)
+
+# Tipos estáticos de expressões: 'numero' é inteiro ou flutuante, sem saber qual
+NUMERICOS = ('inteiro', 'flutuante', 'numero')
+COMPARACOES = ('>', '<', '>=', '<=', '==', '!=')
+
+def _tipo_constante(valor) -> str:
+    if isinstance(valor, bool):
+        return 'logico'
+    if isinstance(valor, int):
+        return 'inteiro'
+    if isinstance(valor, float):
+        return 'flutuante'
+    return 'cadeia'
+
+def _literal(valor) -> No:
+    if isinstance(valor, bool):
+        return VERDADEIRO if valor else FALSO
+    if isinstance(valor, str):
+        return String(valor)
+    return Numero(valor)
+
+class Otimizador:
+    """Dobra constantes, simplifica identidades e remove ramos mortos de um Programa.
+
+    A AST original não é modificada (o parser compartilha nós de literais):
+    subárvores sem mudança são reaproveitadas e as demais são recriadas. As
+    regras seguem a semântica do executor.Executor; a divisão por zero e
+    operações inválidas ficam para a execução. Identidades como x * 1 só
+    valem quando x é comprovadamente numérico pela forma da expressão
+    (literais e aritmética); os tipos declarados de variáveis e funções não
+    contam, já que o executor não os impõe (inteiro x := verdadeiro é
+    aceito). Ramos que declaram variáveis não são removidos, para não mudar
+    o escopo.
+    """
+
+    def __init__(self):
+        self.estatisticas = EstatisticasOtimizacao()
+
+    def otimizar(self, programa: Programa) -> Programa:
+        self.estatisticas.nos_antes = contar_nos(programa)
+        declaracoes = []
+        for declaracao in programa.declaracoes:
+            if isinstance(declaracao, DeclaracaoFuncao):
+                corpo = self.bloco(declaracao.corpo)
+                if corpo is not declaracao.corpo:
+                    declaracao = DeclaracaoFuncao(declaracao.tipo_retorno, declaracao.nome,
+                                                  declaracao.parametros, corpo)
+            else:
+                declaracao = self.bloco(declaracao)
+            declaracoes.append(declaracao)
+
+        resultado = Programa(declaracoes)
+        self.estatisticas.nos_depois = contar_nos(resultado)
+        return resultado
+
+    # ---------- comandos ----------
+
+    def bloco(self, comandos: list) -> list:
+        """Otimiza um bloco; devolve a própria lista se nada mudou"""
+        novos = []
+        mudou = False
+        for comando in comandos:
+            resultado = self.comando(comando)
+            if isinstance(resultado, list):
+                # se com condição constante: o ramo escolhido entra no bloco
+                novos.extend(resultado)
+                mudou = True
+            else:
+                novos.append(resultado)
+                mudou = mudou or resultado is not comando
+        return novos if mudou else comandos
+
+    def comando(self, comando):
+        if isinstance(comando, DeclaracaoVariavel):
+            if comando.valor_inicial is None:
+                return comando
+            valor = self.expressao(comando.valor_inicial)
+            return comando if valor is comando.valor_inicial else DeclaracaoVariavel(comando.tipo, comando.nome, valor)
+        if isinstance(comando, Atribuicao):
+            valor = self.expressao(comando.valor)
+            return comando if valor is comando.valor else Atribuicao(comando.nome, valor)
+        if isinstance(comando, ComandoSe):
+            return self.se(comando)
+        if isinstance(comando, tuple) and comando[0] == 'ENQUANTO':
+            _, condicao, corpo = comando
+            condicao = self.expressao(condicao)
+            if self.constante_falsa(condicao) and not _declara(corpo):
+                self.estatisticas.ramos_removidos += 1
+                return []
+            corpo = self.bloco(corpo)
+            if condicao is comando[1] and corpo is comando[2]:
+                return comando
+            return ('ENQUANTO', condicao, corpo)
+        if isinstance(comando, tuple) and comando[0] == 'PARA':
+            _, inicial, condicao, passo, corpo = comando
+            inicial = self.comando(inicial)
+            condicao = self.expressao(condicao)
+            if self.constante_falsa(condicao) and not _declara(corpo):
+                self.estatisticas.ramos_removidos += 1
+                return [inicial]
+            passo = self.comando(passo)
+            corpo = self.bloco(corpo)
+            novo = ('PARA', inicial, condicao, passo, corpo)
+            return comando if all(a is b for a, b in zip(novo[1:], comando[1:])) else novo
+        if isinstance(comando, ComandoEscreva):
+            expressao = self.expressao(comando.expressao)
+            return comando if expressao is comando.expressao else ComandoEscreva(expressao)
+        if isinstance(comando, Retorne) and comando.valor is not None:
+            valor = self.expressao(comando.valor)
+            return comando if valor is comando.valor else Retorne(valor)
+        if isinstance(comando, ChamadaFuncao):
+            return self.expressao(comando)
+        return comando
+
+    def se(self, comando: ComandoSe):
+        condicao = self.expressao(comando.condicao)
+        if isinstance(condicao, (Numero, String, Booleano)):
+            escolhido, descartado = comando.bloco_se, comando.bloco_senao or []
+            if not condicao.valor:
+                escolhido, descartado = descartado, escolhido
+            if not _declara(descartado):
+                self.estatisticas.ramos_removidos += 1
+                return self.bloco(escolhido)[:]
+        bloco_se = self.bloco(comando.bloco_se)
+        bloco_senao = self.bloco(comando.bloco_senao) if comando.bloco_senao else comando.bloco_senao
+        if condicao is comando.condicao and bloco_se is comando.bloco_se and bloco_senao is comando.bloco_senao:
+            return comando
+        return ComandoSe(condicao, bloco_se, bloco_senao)
+
+    @staticmethod
+    def constante_falsa(no: No) -> bool:
+        return isinstance(no, (Numero, String, Booleano)) and not no.valor
+
+    # ---------- expressões ----------
+
+    def expressao(self, raiz: No) -> No:
+        """Otimiza a expressão em pós-ordem, com pilha explícita (sem limite de aninhamento)"""
+        resultados: List[Tuple[No, Optional[str]]] = []  # (nó, tipo estático ou None)
+        pendentes = [(raiz, False)]
+        while pendentes:
+            no, visitado = pendentes.pop()
+            if isinstance(no, ExpressaoBinaria):
+                if not visitado:
+                    pendentes.append((no, True))
+                    pendentes.append((no.direita, False))
+                    pendentes.append((no.esquerda, False))
+                else:
+                    direita = resultados.pop()
+                    esquerda = resultados.pop()
+                    resultados.append(self.binaria(no, esquerda, direita))
+            elif isinstance(no, ExpressaoUnaria):
+                if not visitado:
+                    pendentes.append((no, True))
+                    pendentes.append((no.operando, False))
+                else:
+                    resultados.append(self.unaria(no, resultados.pop()))
+            elif isinstance(no, ChamadaFuncao):
+                if not visitado:
+                    pendentes.append((no, True))
+                    pendentes.extend((argumento, False) for argumento in reversed(no.argumentos))
+                else:
+                    quantidade = len(no.argumentos)
+                    argumentos = [a for a, _ in resultados[len(resultados) - quantidade:]]
+                    del resultados[len(resultados) - quantidade:]
+                    if any(a is not b for a, b in zip(argumentos, no.argumentos)):
+                        no = ChamadaFuncao(no.nome, argumentos)
+                    resultados.append((no, None))
+            elif isinstance(no, (Numero, String, Booleano)):
+                resultados.append((no, _tipo_constante(no.valor)))
+            else:
+                resultados.append((no, None))
+        return resultados[0][0]
+
+    def binaria(self, no: ExpressaoBinaria, esquerda: tuple, direita: tuple) -> tuple:
+        (a, tipo_a), (b, tipo_b) = esquerda, direita
+        constantes = (Numero, String, Booleano)
+        operador = no.operador
+        if isinstance(a, constantes) and isinstance(b, constantes):
+            if not (operador == '*' and (isinstance(a.valor, str) or isinstance(b.valor, str))):
+                try:
+                    valor = OPERADORES[operador](a.valor, b.valor)
+                except (ErroExecucao, TypeError):
+                    pass  # fica para a execução reportar
+                else:
+                    self.estatisticas.dobras += 1
+                    return _literal(valor), _tipo_constante(valor)
+
+        tipo = self.tipo_binaria(operador, tipo_a, tipo_b)
+
+        # Identidades com a constante inteira 0 ou 1 do outro lado. x + 0 só
+        # vale para inteiros: -0.0 + 0 dá 0.0
+        def neutro(lado, valor):
+            return isinstance(lado, Numero) and type(lado.valor) is int and lado.valor == valor
+        if (tipo_a == 'inteiro' and operador == '+' and neutro(b, 0)) or tipo_a in NUMERICOS and (
+                (operador == '-' and neutro(b, 0)) or (operador in ('*', '/') and neutro(b, 1))):
+            self.estatisticas.simplificacoes += 1
+            return a, tipo_a
+        if (tipo_b == 'inteiro' and operador == '+' and neutro(a, 0)) or (
+                tipo_b in NUMERICOS and operador == '*' and neutro(a, 1)):
+            self.estatisticas.simplificacoes += 1
+            return b, tipo_b
+
+        if a is no.esquerda and b is no.direita:
+            return no, tipo
+        return ExpressaoBinaria(a, operador, b), tipo
+
+    @staticmethod
+    def tipo_binaria(operador: str, tipo_a: Optional[str], tipo_b: Optional[str]) -> Optional[str]:
+        """Tipo do resultado, quando a execução sem erro o garante.
+
+        - e / só dão número ou erro; + e * precisam dos dois lados numéricos
+        ou lógicos ("a" + "b" e "a" * 3 são cadeias). Lógicos viram inteiros,
+        exceto na divisão (verdadeiro / 1 é 1.0).
+        """
+        if operador in COMPARACOES:
+            return 'logico'
+        conhecidos = NUMERICOS + ('logico',)
+        if operador not in ('-', '/') and not (tipo_a in conhecidos and tipo_b in conhecidos):
+            return None
+        inteiros = ('inteiro',) if operador == '/' else ('inteiro', 'logico')
+        if tipo_a in inteiros and tipo_b in inteiros:
+            return 'inteiro'
+        if 'flutuante' in (tipo_a, tipo_b):
+            return 'flutuante'
+        return 'numero'
+
+    def unaria(self, no: ExpressaoUnaria, operando: tuple) -> tuple:
+        valor, tipo = operando
+        if isinstance(valor, (Numero, Booleano)):
+            self.estatisticas.dobras += 1
+            resultado = -valor.valor
+            return _literal(resultado), _tipo_constante(resultado)
+        if isinstance(valor, ExpressaoUnaria) and tipo in NUMERICOS:
+            self.estatisticas.simplificacoes += 1
+            return valor.operando, tipo
+        tipo = tipo if tipo in NUMERICOS else None
+        return (no if valor is no.operando else ExpressaoUnaria(no.operador, valor)), tipo
+
+def otimizar(programa: Programa) -> Tuple[Programa, EstatisticasOtimizacao]:
+    """Devolve o programa otimizado (sem alterar o original) e as estatísticas"""
+    otimizador = Otimizador()
+    return otimizador.otimizar(programa), otimizador.estatisticas
@@ -0,0 +1,278 @@
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict
+from functools import partial
+from typing import Optional
+
+from AnalisadorSLR import MAX_ERROS
+from cache_ast import TAMANHO_CACHE_AST, CacheAST
+from cliente import ENDERECO_PADRAO, analisar_endereco
+from main import ResultadoArquivo, _compilar_fonte, _preparar_trabalhador
+
+# Maior linha de requisição aceita (o código dos arquivos vai dentro dela)
+LIMITE_REQUISICAO = 64 * 1024 * 1024
+
+# Cache de ASTs de cada processo do pool (ver _iniciar_trabalhador)
+_cache_trabalhador: Optional[CacheAST] = None
+
+def _iniciar_trabalhador(diretorio_cache: Optional[str], maximo_cache: int, usar_cache: bool):
+    """Carrega as tabelas SLR e abre o cache de ASTs uma vez por processo"""
+    global _cache_trabalhador
+    _preparar_trabalhador()
+    if usar_cache:
+        _cache_trabalhador = CacheAST(diretorio_cache, maximo_cache)
+
+def _compilar(fonte: tuple, max_erros: Optional[int]) -> ResultadoArquivo:
+    return _compilar_fonte(fonte, max_erros, _cache_trabalhador)
+
+class ErroRequisicao(Exception):
+    """Requisição malformada; a mensagem volta ao cliente"""
+
+class ServidorCompilacao:
+    """Servidor de compilação de longa duração (asyncio + pool de processos).
+
+    O protocolo é de linhas JSON: cada requisição tem um id e um tipo
+    ('compilar', 'estado', 'ping' ou 'encerrar'), e a resposta leva o mesmo
+    id; respostas de uma conexão podem sair fora de ordem. Uma requisição
+    'compilar' traz uma lista de arquivos ({'caminho'} ou {'caminho',
+    'codigo'}) e recebe um ResultadoArquivo (como dict) por arquivo. Só no
+    socket Unix, criado com permissão 0600, o servidor lê arquivos pelo
+    caminho; por TCP o código tem de vir na requisição, senão qualquer um
+    que alcance a porta leria arquivos do usuário do servidor pelos
+    diagnósticos.
+
+    A compilação roda nos processos do pool, que mantêm as tabelas SLR e o
+    CacheAST carregados entre requisições. Há dois limites: no máximo
+    max_pendentes arquivos em compilação ou na fila do pool, e no máximo
+    max_por_conexao requisições em andamento por conexão. Atingido o
+    segundo, a conexão deixa de ser lida, e o cliente que envia demais é
+    freado pelo próprio socket.
+    """
+
+    def __init__(self, endereco: str = ENDERECO_PADRAO, jobs: Optional[int] = None,
+                 max_pendentes: Optional[int] = None, max_por_conexao: int = 8,
+                 usar_cache: bool = True, diretorio_cache: Optional[str] = None,
+                 maximo_cache: int = TAMANHO_CACHE_AST):
+        self.endereco = endereco
+        self.jobs = jobs or os.cpu_count() or 1
+        self.max_pendentes = max_pendentes or self.jobs * 4
+        self.max_por_conexao = max_por_conexao
+        self.argumentos_trabalhador = (diretorio_cache, maximo_cache, usar_cache)
+        self.familia, self.destino = analisar_endereco(endereco)
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.requisicoes = 0
+        self.arquivos = 0
+        self.em_cache = 0
+        self.em_andamento = 0
+        self.conexoes = 0
+        self.inicio = time.monotonic()
+
+    def _novo_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(self.jobs, initializer=_iniciar_trabalhador,
+                                   initargs=self.argumentos_trabalhador)
+
+    async def executar(self, pronto: Optional[asyncio.Event] = None):
+        """Atende até receber 'encerrar', SIGINT ou SIGTERM"""
+        loop = asyncio.get_running_loop()
+        self.vagas = asyncio.Semaphore(self.max_pendentes)
+        self.parar = asyncio.Event()
+        self.pool = self._novo_pool()
+        # Sobe os processos e carrega as tabelas antes da primeira requisição
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _preparar_trabalhador)
+                               for _ in range(self.jobs)))
+
+        familia, destino = self.familia, self.destino
+        if familia == 'unix':
+            self._liberar_socket(destino)
+            mascara = os.umask(0o177)  # socket só do usuário (0600) desde a criação
+            try:
+                servidor = await asyncio.start_unix_server(self.atender, destino, limit=LIMITE_REQUISICAO)
+            finally:
+                os.umask(mascara)
+        else:
+            servidor = await asyncio.start_server(self.atender, *destino, limit=LIMITE_REQUISICAO)
+        for sinal in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sinal, self.parar.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows ou fora da thread principal
+        try:
+            async with servidor:
+                if pronto is not None:
+                    pronto.set()
+                await self.parar.wait()
+        finally:
+            self.pool.shutdown(cancel_futures=True)
+            if familia == 'unix':
+                try:
+                    os.remove(destino)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _liberar_socket(caminho: str):
+        """Remove um socket abandonado; falha se outro servidor atende nele"""
+        if not os.path.exists(caminho):
+            return
+        teste = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            teste.connect(caminho)
+        except OSError:
+            os.remove(caminho)
+        else:
+            raise OSError(f"Já há um servidor em {caminho}")
+        finally:
+            teste.close()
+
+    # ---------- conexões ----------
+
+    async def atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        self.conexoes += 1
+        limite = asyncio.Semaphore(self.max_por_conexao)
+        trava = asyncio.Lock()  # uma resposta inteira por vez no socket
+        tarefas = set()
+        try:
+            while True:
+                await limite.acquire()
+                try:
+                    linha = await leitor.readline()
+                except ValueError:  # linha maior que LIMITE_REQUISICAO
+                    await self._enviar(escritor, trava, {'id': None, 'erro': "Requisição grande demais"})
+                    break
+                except ConnectionError:
+                    break
+                if not linha:
+                    break
+                tarefa = asyncio.create_task(self.responder(linha, limite, escritor, trava))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(tarefas.discard)
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        except asyncio.CancelledError:
+            pass  # servidor encerrando com a conexão aberta
+        finally:
+            self.conexoes -= 1
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+
+    async def responder(self, linha: bytes, limite: asyncio.Semaphore,
+                        escritor: asyncio.StreamWriter, trava: asyncio.Lock):
+        try:
+            identificador = None
+            try:
+                try:
+                    requisicao = json.loads(linha)
+                except ValueError:
+                    raise ErroRequisicao("JSON inválido") from None
+                if not isinstance(requisicao, dict):
+                    raise ErroRequisicao("A requisição deve ser um objeto JSON")
+                identificador = requisicao.get('id')
+                resposta = await self.processar(requisicao)
+            except ErroRequisicao as e:
+                resposta = {'erro': str(e)}
+            except BrokenProcessPool:
+                self.pool = self._novo_pool()
+                resposta = {'erro': "Um processo trabalhador terminou inesperadamente"}
+            except Exception as e:  # o cliente espera uma resposta para cada id
+                print(f"✗ Erro ao atender requisição: {e!r}", file=sys.stderr)
+                resposta = {'erro': f"Erro interno do servidor: {e}"}
+            resposta['id'] = identificador
+            await self._enviar(escritor, trava, resposta)
+        finally:
+            limite.release()
+
+    @staticmethod
+    async def _enviar(escritor: asyncio.StreamWriter, trava: asyncio.Lock, resposta: dict):
+        # ASCII: diagnósticos podem repetir caracteres que não codificam em
+        # UTF-8 (surrogates sozinhos); escapados, continuam JSON válido
+        dados = json.dumps(resposta).encode('ascii') + b'\n'
+        async with trava:
+            try:
+                escritor.write(dados)
+                await escritor.drain()
+            except ConnectionError:
+                pass  # cliente desconectou
+
+    # ---------- requisições ----------
+
+    async def processar(self, requisicao: dict) -> dict:
+        self.requisicoes += 1
+        tipo = requisicao.get('tipo', 'compilar')
+        if tipo == 'compilar':
+            arquivos = requisicao.get('arquivos')
+            max_erros = requisicao.get('max_erros', MAX_ERROS)
+            if not isinstance(arquivos, list) or not all(
+                    isinstance(item, dict) and isinstance(item.get('caminho'), str)
+                    and isinstance(item.get('codigo', ''), str) for item in arquivos):
+                raise ErroRequisicao("'arquivos' deve ser uma lista de {'caminho', 'codigo'?}")
+            if self.familia != 'unix' and not all('codigo' in item for item in arquivos):
+                raise ErroRequisicao("Por TCP, cada arquivo deve trazer 'codigo'; "
+                                     "o servidor só lê caminhos pelo socket Unix")
+            if max_erros is not None and (not isinstance(max_erros, int) or max_erros < 1):
+                raise ErroRequisicao("'max_erros' deve ser um inteiro positivo ou null")
+            resultados = await asyncio.gather(
+                *(self.compilar((item['caminho'], item.get('codigo')), max_erros) for item in arquivos))
+            return {'resultados': [{**asdict(resultado), 'ok': resultado.ok} for resultado in resultados]}
+        if tipo == 'estado':
+            return {'jobs': self.jobs, 'conexoes': self.conexoes, 'requisicoes': self.requisicoes,
+                    'arquivos': self.arquivos, 'em_cache': self.em_cache,
+                    'em_andamento': self.em_andamento, 'max_pendentes': self.max_pendentes,
+                    'segundos': time.monotonic() - self.inicio}
+        if tipo == 'ping':
+            return {}
+        if tipo == 'encerrar':
+            self.parar.set()
+            return {}
+        raise ErroRequisicao(f"Tipo de requisição desconhecido: {tipo!r}")
+
+    async def compilar(self, fonte: tuple, max_erros: Optional[int]) -> ResultadoArquivo:
+        """Compila um arquivo no pool, esperando vaga se houver max_pendentes em andamento"""
+        async with self.vagas:
+            self.em_andamento += 1
+            try:
+                loop = asyncio.get_running_loop()
+                resultado = await loop.run_in_executor(self.pool, partial(_compilar, fonte, max_erros))
+            finally:
+                self.em_andamento -= 1
+        self.arquivos += 1
+        self.em_cache += resultado.em_cache
+        return resultado
+
+def principal(argumentos=None) -> int:
+    parser = argparse.ArgumentParser(description="Servidor de compilação de longa duração.")
+    parser.add_argument('--endereco', default=ENDERECO_PADRAO,
+                        help="unix:caminho, host:porta ou :porta (só 127.0.0.1) (padrão: %(default)s)")
+    parser.add_argument('-j', '--jobs', type=int, default=0,
+                        help="processos trabalhadores (0 = um por núcleo)")
+    parser.add_argument('--max-pendentes', type=int, default=0,
+                        help="arquivos em compilação ou na fila do pool (0 = 4 por processo)")
+    parser.add_argument('--max-por-conexao', type=int, default=8,
+                        help="requisições em andamento por conexão")
+    parser.add_argument('--sem-cache', action='store_true',
+                        help="não usa nem grava o cache de ASTs em disco "
+                             "(em $XDG_CACHE_HOME/slr ou SLR_CACHE_DIR)")
+    opcoes = parser.parse_args(argumentos)
+
+    servidor = ServidorCompilacao(opcoes.endereco, opcoes.jobs or None, opcoes.max_pendentes or None,
+                                  opcoes.max_por_conexao, not opcoes.sem_cache)
+    print(f"Servidor de compilação em {opcoes.endereco} ({servidor.jobs} processo(s))", file=sys.stderr)
+    try:
+        asyncio.run(servidor.executar())
+    except OSError as e:
+        print(f"✗ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(principal())
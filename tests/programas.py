@@ -0,0 +1,42 @@
+"""Geração de programas aleatórios e execução para os testes diferenciais"""
+import io
+import random
+
+from executor import ErroExecucao, ErroSemantico
+
+VALORES = ['0', '1', '2', '-3', '0.0', '-0.0', '2.5', 'verdadeiro', 'falso', '"a"', '""']
+TIPOS = ['inteiro', 'flutuante', 'logico', 'cadeia']
+
+def saida_de(executar) -> str:
+    """Texto escrito por executar(saida), seguido do erro, se houver"""
+    saida = io.StringIO()
+    try:
+        executar(saida)
+    except (ErroSemantico, ErroExecucao) as e:
+        return saida.getvalue() + f"{type(e).__name__}: {e}"
+    return saida.getvalue()
+
+def expressao(gerador: random.Random, profundidade: int) -> str:
+    if profundidade == 0 or gerador.random() < 0.3:
+        return gerador.choice(VALORES + ['x', 'y', 'z', 'f(x)'])
+    if gerador.random() < 0.15:
+        return f"-({expressao(gerador, profundidade - 1)})"
+    operador = gerador.choice(['+', '-', '*', '/', '+', '-', '*', '<', '=='])
+    return f"({expressao(gerador, profundidade - 1)} {operador} {expressao(gerador, profundidade - 1)})"
+
+def comando(gerador: random.Random) -> str:
+    sorteio = gerador.random()
+    if sorteio < 0.15:
+        return (f"se {expressao(gerador, 2)} inicio escreva({expressao(gerador, 3)}) fim "
+                f"senao inicio {gerador.choice('xyz')} := {expressao(gerador, 2)} fim")
+    if sorteio < 0.25:
+        return f"para i := 0 faca i < 3 faca i := i + 1 faca inicio escreva({expressao(gerador, 3)}) fim"
+    return f"escreva({expressao(gerador, 4)})"
+
+def programa_aleatorio(semente: int) -> str:
+    """Programa com variáveis de tipos declarados e valores sorteados (o executor não impõe tipos)"""
+    gerador = random.Random(semente)
+    declaracoes = ' '.join(f"{gerador.choice(TIPOS)} {nome} := {gerador.choice(VALORES)}" for nome in 'xyz')
+    comandos = ' '.join(comando(gerador) for _ in range(5))
+    return (f"funcao inteiro f(inteiro n) inicio retorne n * 1 + 0 fim "
+            f"inicio inteiro i {declaracoes} {comandos} fim")
@@ -0,0 +1,80 @@
+import pytest
+
+from AnalisadorLexico import AnalisadorLexico
+from AnalisadorSLR import AnalisadorSLR
+from ast_arena import ArenaAST
+from ast_nodes import *
+from compilador import compilar_codigo
+from programas import programa_aleatorio
+
+ESPERADO_EXPRESSAO = "esperado um de: (, CONST_BOOL, CONST_FLOAT, CONST_INTEIRO, CONST_STRING, IDENTIFICADOR, -"
+
+def test_programa_valido():
+    codigo = '''
+    funcao inteiro dobro(inteiro n) inicio retorne n * 2 fim
+    inicio
+        inteiro x := 1 - 2 - 3
+        se x < 0 inicio escreva(dobro(1 + 2 * x)) fim senao inicio leia(x) fim
+    fim
+    '''
+    resultado = compilar_codigo(codigo)
+    assert resultado.ok, resultado.erros
+    assert resultado.ast == Programa([
+        DeclaracaoFuncao('inteiro', 'dobro', [('inteiro', 'n')],
+                         [Retorne(ExpressaoBinaria(Identificador('n'), '*', Numero(2)))]),
+        [DeclaracaoVariavel('inteiro', 'x',
+                            ExpressaoBinaria(ExpressaoBinaria(Numero(1), '-', Numero(2)), '-', Numero(3))),
+         ComandoSe(ExpressaoBinaria(Identificador('x'), '<', Numero(0)),
+                   [ComandoEscreva(ChamadaFuncao('dobro', [
+                       ExpressaoBinaria(Numero(1), '+', ExpressaoBinaria(Numero(2), '*', Identificador('x')))]))],
+                   [ComandoLeia('x')])],
+    ])
+
+def test_programa_vazio():
+    resultado = compilar_codigo('')
+    assert resultado.ok and resultado.ast == Programa([])
+
+@pytest.mark.parametrize('semente', range(20))
+def test_arena_e_fluxo_dao_a_mesma_ast(semente):
+    codigo = programa_aleatorio(semente)
+    tokens = AnalisadorLexico(codigo).analisar()
+    ast = AnalisadorSLR(tokens).analisar()
+    assert ast is not None
+    arena = ArenaAST()
+    assert arena.para_ast(AnalisadorSLR(tokens, arena=arena).analisar()) == ast
+    assert AnalisadorSLR(AnalisadorLexico(codigo).gerar_tokens()).analisar() == ast
+
+def test_literais_compartilhados_sao_imutaveis():
+    ast = compilar_codigo('inicio escreva(7) escreva(7) fim').ast
+    primeiro, segundo = (comando.expressao for comando in ast.declaracoes[0])
+    assert primeiro is segundo
+    with pytest.raises(AttributeError):
+        primeiro.valor = 8
+
+@pytest.mark.parametrize('codigo, erro', [
+    ('inicio', "Erro sintático na linha 1: encontrado 'EOF', esperado um de: cadeia, enquanto, escreva, "
+               "fim, flutuante, IDENTIFICADOR, inteiro, leia, logico, para, retorne, se"),
+    ('inicio escreva(1) fim\nfim', "Erro sintático na linha 2: encontrado 'fim', esperado um de: EOF, funcao, inicio"),
+    ('inicio escreva(1 +) fim', f"Erro sintático na linha 1: encontrado ')', {ESPERADO_EXPRESSAO}"),
+])
+def test_programa_invalido(codigo, erro):
+    resultado = compilar_codigo(codigo)
+    assert not resultado.ok and resultado.ast is None
+    assert resultado.erros_sintaticos == [erro]
+
+ERROS_EM_TRES_LINHAS = 'inicio escreva(1 +) fim\ninicio x := fim\ninicio y := fim'
+
+def test_recuperacao_reporta_varios_erros():
+    resultado = compilar_codigo(ERROS_EM_TRES_LINHAS)
+    assert resultado.erros_sintaticos == [
+        f"Erro sintático na linha 1: encontrado ')', {ESPERADO_EXPRESSAO}",
+        f"Erro sintático na linha 2: encontrado 'fim', {ESPERADO_EXPRESSAO}",
+        f"Erro sintático na linha 3: encontrado 'fim', {ESPERADO_EXPRESSAO}",
+    ]
+    assert not resultado.interrompida
+
+@pytest.mark.parametrize('max_erros', [1, 2])
+def test_max_erros_interrompe_a_analise(max_erros):
+    resultado = compilar_codigo(ERROS_EM_TRES_LINHAS, max_erros=max_erros)
+    assert len(resultado.erros_sintaticos) == max_erros
+    assert resultado.interrompida
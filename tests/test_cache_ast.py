@@ -0,0 +1,61 @@
+import os
+
+import pytest
+
+from AnalisadorSLR import MAX_ERROS
+from ast_nodes import FALSO, VERDADEIRO, Booleano, percorrer
+from cache_ast import CacheAST, diretorio_cache_usuario
+from compilador import compilar_codigo
+from programas import programa_aleatorio
+
+def _igual(a, b) -> bool:
+    return (a.ast == b.ast and a.erros == b.erros and a.interrompida == b.interrompida
+            and [str(token) for token in a.tokens] == [str(token) for token in b.tokens])
+
+@pytest.mark.parametrize('codigo', [
+    programa_aleatorio(0),
+    'inicio logico b := verdadeiro escreva(b) fim',
+    'inicio x := fim inicio y := fim',
+    'inicio inteiro x := 1 $ fim',
+])
+def test_acerto_devolve_a_mesma_compilacao(tmp_path, codigo):
+    cache = CacheAST(str(tmp_path))
+    esperado = compilar_codigo(codigo, compacto=True)
+    falta = cache.compilar(codigo)
+    acerto = cache.compilar(codigo)
+    assert (cache.faltas, cache.acertos) == (1, 1)
+    assert 'cache' not in falta.tempos and 'cache' in acerto.tempos
+    assert _igual(falta, esperado) and _igual(acerto, esperado)
+
+def test_acerto_preserva_os_literais_logicos_compartilhados(tmp_path):
+    cache = CacheAST(str(tmp_path))
+    codigo = 'inicio escreva(verdadeiro) escreva(falso) fim'
+    cache.compilar(codigo)
+    booleanos = [no for no in percorrer(cache.compilar(codigo).ast) if isinstance(no, Booleano)]
+    assert booleanos == [VERDADEIRO, FALSO]
+    assert booleanos[0] is VERDADEIRO and booleanos[1] is FALSO
+
+def test_max_erros_faz_parte_da_chave(tmp_path):
+    cache = CacheAST(str(tmp_path))
+    codigo = 'inicio x := fim inicio y := fim'
+    assert len(cache.compilar(codigo, 1).erros) == 1
+    assert len(cache.compilar(codigo).erros) == 2
+    assert cache.faltas == 2
+
+def test_entrada_corrompida_e_falta(tmp_path):
+    cache = CacheAST(str(tmp_path))
+    codigo = programa_aleatorio(1)
+    cache.compilar(codigo)
+    caminho = cache.caminho(cache.chave(codigo, MAX_ERROS))
+    with open(caminho, 'r+b') as arquivo:
+        arquivo.truncate(os.path.getsize(caminho) // 2)
+    resultado = cache.compilar(codigo)
+    assert cache.faltas == 2 and 'cache' not in resultado.tempos
+    assert _igual(resultado, compilar_codigo(codigo, compacto=True))
+
+def test_diretorio_padrao_fora_do_codigo(monkeypatch, tmp_path):
+    monkeypatch.delenv('SLR_CACHE_DIR', raising=False)
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert CacheAST().diretorio == os.path.join(str(tmp_path), 'slr', 'ast')
+    monkeypatch.setenv('SLR_CACHE_DIR', '')
+    assert diretorio_cache_usuario('ast') is None and CacheAST().diretorio is None
@@ -0,0 +1,88 @@
+import io
+import sys
+import threading
+
+import pytest
+
+from compilador import compilar_codigo
+from executor import TAMANHO_MEMO, ErroExecucao, Executor, executar, limite_recursao
+from maquina import MaquinaVirtual, compilar_bytecode
+from transpilador import ProgramaPython, compilar_python
+
+SOMA = '''
+funcao inteiro soma(inteiro n) inicio
+    se n <= 0 inicio retorne 0 fim
+    retorne n + soma(n - 1)
+fim
+inicio escreva(soma({n})) fim
+'''
+
+def _executar(codigo: str, memo=0) -> str:
+    saida = io.StringIO()
+    executar(compilar_codigo(codigo).ast, saida, memo=memo)
+    return saida.getvalue()
+
+def test_recursao_profunda_como_na_maquina_virtual():
+    codigo = SOMA.format(n=50000)
+    saida = io.StringIO()
+    MaquinaVirtual(compilar_bytecode(compilar_codigo(codigo).ast)).executar(saida)
+    assert _executar(codigo) == saida.getvalue() == f"{50000 * 50001 // 2}\n"
+
+@pytest.mark.parametrize('memo', [0, TAMANHO_MEMO])
+def test_memo_nao_reduz_a_profundidade_alcancada(memo):
+    assert _executar(SOMA.format(n=50000), memo) == f"{50000 * 50001 // 2}\n"
+
+def test_memo_ligado_por_padrao():
+    executor = executar(compilar_codigo(SOMA.format(n=10)).ast, io.StringIO())
+    assert executor.estatisticas_memo()['soma'].faltas == 11
+
+def test_memo_separa_zero_de_menos_zero():
+    codigo = '''
+    funcao flutuante f(flutuante x) inicio retorne x fim
+    inicio escreva(f(0.0)) escreva(f(-0.0)) escreva(f(0.0)) escreva(f(0.0 * -1.0)) fim
+    '''
+    executor = Executor(compilar_codigo(codigo).ast, memo=TAMANHO_MEMO)
+    saida = io.StringIO()
+    executor.executar(saida)
+    assert saida.getvalue() == _executar(codigo) == "0.0\n-0.0\n0.0\n-0.0\n"
+    estatisticas = executor.estatisticas_memo()['f']
+    assert (estatisticas.acertos, estatisticas.faltas, estatisticas.tamanho) == (2, 2, 2)
+
+def test_recursao_infinita_e_erro_de_execucao_e_restaura_o_limite():
+    limite = sys.getrecursionlimit()
+    with pytest.raises(ErroExecucao, match="Recursão profunda demais"):
+        _executar('funcao inteiro f(inteiro n) inicio retorne f(n + 1) fim inicio escreva(f(0)) fim')
+    assert sys.getrecursionlimit() == limite
+
+def test_limite_recursao_com_threads_restaura_o_limite_no_fim():
+    limite = sys.getrecursionlimit()
+    codigo = SOMA.format(n=3000)
+    saidas = []
+    threads = [threading.Thread(target=lambda: saidas.append(_executar(codigo))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert saidas == [f"{3000 * 3001 // 2}\n"] * 4
+    assert sys.getrecursionlimit() == limite
+
+def test_limite_recursao_aninhado():
+    limite = sys.getrecursionlimit()
+    with limite_recursao(limite + 1000):
+        with limite_recursao(limite + 10):
+            assert sys.getrecursionlimit() == limite + 1000
+        assert sys.getrecursionlimit() == limite + 1000
+    assert sys.getrecursionlimit() == limite
+
+def test_recursao_profunda_no_codigo_transpilado():
+    codigo = SOMA.format(n=50000)
+    saida = io.StringIO()
+    ProgramaPython(compilar_python(compilar_codigo(codigo).ast)).executar(saida)
+    assert saida.getvalue() == _executar(codigo) == f"{50000 * 50001 // 2}\n"
+
+def test_recursao_infinita_no_codigo_transpilado():
+    limite = sys.getrecursionlimit()
+    programa = compilar_codigo('funcao inteiro f(inteiro n) inicio retorne f(n + 1) fim inicio escreva(f(0)) fim')
+    with pytest.raises(ErroExecucao, match="Recursão profunda demais"):
+        ProgramaPython(compilar_python(programa.ast)).executar(io.StringIO())
+    assert sys.getrecursionlimit() == limite
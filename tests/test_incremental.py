@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from AnalisadorIncremental import AnalisadorIncremental
+from AnalisadorLexico import AnalisadorLexico
+from compilador import compilar_codigo
+from programas import programa_aleatorio
+
+TRECHOS = ['inicio', 'fim', ' ', '\n', 'funcao inteiro g() inicio retorne 1 fim ', 'escreva(1)',
+           'x := 2 ', '(', ')', '"s"', '$', 'se', '+ 3', '']
+
+def _tokens(tokens) -> list:
+    return [(token.tipo, token.lexema, token.inicio) for token in tokens]
+
+def _conferir(analisador: AnalisadorIncremental, ast):
+    """O resultado da edição é o de compilar o código inteiro de novo"""
+    resultado = compilar_codigo(analisador.codigo, max_erros=1)
+    assert ast == (resultado.ast if resultado.ok else None)
+    assert analisador.erros_lexicos == resultado.erros_lexicos
+    assert analisador.erros_sintaticos == resultado.erros_sintaticos
+    assert _tokens(analisador.tokens) == _tokens(AnalisadorLexico(analisador.codigo).analisar())
+
+@pytest.mark.parametrize('semente', range(30))
+def test_edicoes_equivalem_a_analise_completa(semente):
+    gerador = random.Random(semente)
+    analisador = AnalisadorIncremental(programa_aleatorio(semente))
+    _conferir(analisador, analisador.ast)
+    for _ in range(15):
+        tamanho = len(analisador.codigo)
+        offset = gerador.randrange(tamanho + 1)
+        removidos = gerador.randrange(min(8, tamanho - offset) + 1)
+        _conferir(analisador, analisador.editar(offset, removidos, gerador.choice(TRECHOS)))
+
+def test_edicao_no_fim_reanalisa_so_o_ultimo_segmento():
+    codigo = ''.join(f"funcao inteiro f{i}() inicio retorne {i} fim\n" for i in range(50))
+    analisador = AnalisadorIncremental(codigo + 'inicio escreva(f1()) fim')
+    analisador.editar(len(analisador.codigo) - 4, 0, ' escreva(f2())')
+    _conferir(analisador, analisador.ast)
+    assert analisador.segmentos_reanalisados == 1
+
+def test_erro_lexico_invalida_a_ast():
+    analisador = AnalisadorIncremental('inicio escreva(1) fim')
+    assert analisador.editar(7, 0, '$ ') is None
+    assert analisador.erros_lexicos == compilar_codigo(analisador.codigo).erros_lexicos
+    assert analisador.erros_sintaticos == []
+    assert analisador.editar(7, 2, '') == compilar_codigo(analisador.codigo).ast
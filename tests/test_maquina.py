@@ -0,0 +1,30 @@
+import io
+
+import pytest
+
+from compilador import compilar_codigo
+from executor import executar
+from maquina import Bytecode, MaquinaVirtual, compilar_bytecode
+from programas import programa_aleatorio, saida_de
+
+def _comparar(codigo: str):
+    resultado = compilar_codigo(codigo)
+    assert resultado.ok, resultado.erros
+    bytecode = compilar_bytecode(resultado.ast)
+    esperado = saida_de(lambda saida: executar(resultado.ast, saida, io.StringIO()))
+    assert saida_de(lambda saida: MaquinaVirtual(bytecode).executar(saida, io.StringIO())) == esperado
+    # e depois de serializado
+    copia = Bytecode.de_bytes(bytecode.para_bytes())
+    assert saida_de(lambda saida: MaquinaVirtual(copia).executar(saida, io.StringIO())) == esperado
+
+@pytest.mark.parametrize('codigo', [
+    'inicio escreva(0.0) escreva(-0.0) escreva(0) escreva(falso) fim',
+    'inicio escreva(1) escreva(1.0) escreva(verdadeiro) escreva("1") fim',
+    'inicio flutuante x := -0.0 escreva(x) escreva(0.0 - x) fim',
+])
+def test_constantes_iguais_de_tipos_ou_sinais_diferentes(codigo):
+    _comparar(codigo)
+
+@pytest.mark.parametrize('semente', range(60))
+def test_programas_aleatorios(semente):
+    _comparar(programa_aleatorio(semente))
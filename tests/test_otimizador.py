@@ -0,0 +1,39 @@
+import io
+
+import pytest
+
+from compilador import compilar_codigo
+from executor import executar
+from otimizador import otimizar
+from programas import programa_aleatorio, saida_de
+
+def _saida(programa) -> str:
+    return saida_de(lambda saida: executar(programa, saida, io.StringIO()))
+
+def _comparar(codigo: str):
+    resultado = compilar_codigo(codigo)
+    assert resultado.ok, resultado.erros
+    otimizado, _ = otimizar(resultado.ast)
+    assert _saida(otimizado) == _saida(resultado.ast)
+
+# Tipos declarados não são impostos pelo executor: identidades não podem confiar neles
+@pytest.mark.parametrize('codigo', [
+    'inicio inteiro x := verdadeiro escreva(x * 1) escreva(1 * x) escreva(x / 1) escreva(-(-x)) fim',
+    'funcao inteiro f(inteiro n) inicio retorne n * 1 fim inicio escreva(f(falso)) fim',
+    'inicio inteiro s := "abc" escreva(s + 0) fim',
+    'inicio inteiro s := "abc" escreva(0 + s) fim',
+    'inicio flutuante z := -0.0 escreva(z + 0) escreva((z - 0) + 0) escreva((z * 1) - 0) fim',
+    'inicio logico b := verdadeiro escreva((b - 0) * 1) escreva((b + b) + 0) escreva(b / 1 + 0) fim',
+])
+def test_identidades_mantem_a_saida(codigo):
+    _comparar(codigo)
+
+def test_identidades_simplificam_expressoes_numericas():
+    resultado = compilar_codigo('inicio inteiro x := 3 escreva((x - 1) * 1 - 0) escreva(-(-(x - 1))) fim')
+    otimizado, estatisticas = otimizar(resultado.ast)
+    assert estatisticas.simplificacoes == 3
+    assert _saida(otimizado) == _saida(resultado.ast) == '2\n2\n'
+
+@pytest.mark.parametrize('semente', range(40))
+def test_programas_aleatorios(semente):
+    _comparar(programa_aleatorio(semente))
@@ -0,0 +1,37 @@
+import pytest
+
+from AnalisadorLexico import AnalisadorLexico
+from AnalisadorParalelo import AnalisadorParalelo
+from AnalisadorSLR import AnalisadorSLR
+from compilador import compilar_codigo
+from programas import programa_aleatorio
+
+CODIGO = '\n'.join(programa_aleatorio(semente) for semente in range(20))
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_mesma_ast_que_o_analisador_slr(jobs):
+    paralelo = AnalisadorParalelo(CODIGO, jobs=jobs, tokens_por_tarefa=200)
+    assert len(paralelo.dividir_tarefas(AnalisadorLexico(CODIGO).analisar_compacto())) > 1
+    assert paralelo.analisar() == AnalisadorSLR(AnalisadorLexico(CODIGO).analisar()).analisar()
+    assert paralelo.erros == []
+
+# Um erro por declaração: a recuperação do AnalisadorSLR acha os mesmos
+@pytest.mark.parametrize('codigo', [
+    'inicio escreva(1) fim inicio escreva(1 +) fim funcao inteiro g() inicio retorne fim',
+    'inicio escreva(1 +) fim\ninicio x := fim\ninicio y := fim',
+    'inicio escreva(1) fim fim',
+    'inicio',
+    'inicio $ fim',
+])
+def test_mesmos_erros_que_o_analisador_slr(codigo, capsys):
+    paralelo = AnalisadorParalelo(codigo, jobs=1, tokens_por_tarefa=3)
+    assert paralelo.analisar() is None
+    resultado = compilar_codigo(codigo)
+    assert paralelo.erros == resultado.erros
+    if not resultado.erros_lexicos:
+        paralelo.imprimir_erros()
+        saida_paralelo = capsys.readouterr().out
+        parser = AnalisadorSLR(AnalisadorLexico(codigo).analisar())
+        parser.analisar()
+        parser.imprimir_erros()
+        assert saida_paralelo == capsys.readouterr().out
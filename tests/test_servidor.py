@@ -0,0 +1,50 @@
+import asyncio
+import threading
+
+import pytest
+
+from cliente import Cliente, ErroCliente
+from servidor import ServidorCompilacao
+
+@pytest.fixture
+def endereco(tmp_path):
+    """Servidor num socket Unix, atendendo numa thread durante o teste"""
+    endereco = f'unix:{tmp_path}/s'
+    servidor = ServidorCompilacao(endereco, jobs=1, usar_cache=False)
+    pronto = threading.Event()
+
+    async def atender():
+        evento = asyncio.Event()
+        tarefa = asyncio.create_task(servidor.executar(evento))
+        await evento.wait()
+        pronto.set()
+        await tarefa
+
+    thread = threading.Thread(target=asyncio.run, args=(atender(),))
+    thread.start()
+    assert pronto.wait(60)
+    try:
+        yield endereco
+    finally:
+        with Cliente(endereco, tempo_limite=10) as cliente:
+            cliente.requisitar({'tipo': 'encerrar'})
+        thread.join(10)
+
+def test_ping_e_estado(endereco):
+    with Cliente(endereco, tempo_limite=10) as cliente:
+        assert cliente.requisitar({'tipo': 'ping'}) == {'id': 1}
+        assert cliente.estado()['jobs'] == 1
+        with pytest.raises(ErroCliente, match="desconhecido"):
+            cliente.requisitar({'tipo': 'outro'})
+
+def test_compilar(endereco, tmp_path):
+    caminho = tmp_path / 'programa.slr'
+    caminho.write_text('inicio escreva(1) fim')
+    invalido = 'inicio escreva(1 +) fim\ninicio x := fim'
+    with Cliente(endereco, tempo_limite=60) as cliente:
+        valido, com_erros = cliente.compilar([str(caminho), ('erros.slr', invalido)])
+        um_erro, = cliente.compilar([('erros.slr', invalido)], max_erros=1)
+    assert valido['ok'] and valido['caminho'] == str(caminho) and valido['erros'] == []
+    assert valido['tokens'] == 6
+    assert not com_erros['ok'] and len(com_erros['erros']) == 2
+    assert um_erro['erros'] == com_erros['erros'][:1]
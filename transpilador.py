@@ -0,0 +1,321 @@
+import hashlib
+import marshal
+import math
+import os
+import sys
+from collections import OrderedDict
+from types import CodeType
+from typing import Dict, List, Optional, Set, TextIO
+
+import executor as modulo_executor
+from ast_nodes import *
+from cache_ast import CacheDisco, diretorio_cache_usuario, hash_modulos, versao_compilador
+from compilador import compilar_codigo
+from executor import (ErroExecucao, ErroSemantico, Escopo, VALORES_PADRAO, converter_entrada,
+                      dividir, formatar_valor, limite_recursao)
+
+# Versão do código gerado; incrementar ao mudar a tradução (invalida o cache)
+VERSAO_TRANSPILADOR = 2
+MAGICO = b'SLRP'
+
+# Tamanho total padrão dos objetos de código em disco
+TAMANHO_CACHE_TRANSPILACAO = 32 * 1024 * 1024
+
+def _literal(valor) -> str:
+    """Expressão Python do valor; inf e nan não têm literal (repr dá um nome solto)"""
+    if isinstance(valor, float) and not math.isfinite(valor):
+        return f"float({repr(valor)!r})"
+    return repr(valor)
+
+class Transpilador:
+    """Traduz um Programa em código-fonte Python equivalente ao executor.Executor.
+
+    Variáveis viram nomes com prefixo v_ e funções f_, o que evita colisão
+    com palavras reservadas e builtins. Os blocos principais formam a função
+    _principal; só as variáveis globais usadas por alguma função ficam no
+    módulo, as demais são locais de _principal (acesso mais rápido). Divisão,
+    escreva e leia chamam os ganchos _dividir, _escreva e _leia.
+    """
+
+    def __init__(self):
+        self.linhas: List[str] = []
+        self.globais = Escopo()
+        self.funcoes: Dict[str, DeclaracaoFuncao] = {}
+
+    def transpilar(self, programa: Programa) -> str:
+        blocos = []
+        for declaracao in programa.declaracoes:
+            if isinstance(declaracao, DeclaracaoFuncao):
+                if declaracao.nome in self.funcoes:
+                    raise ErroSemantico(f"Função '{declaracao.nome}' declarada mais de uma vez")
+                self.funcoes[declaracao.nome] = declaracao
+            else:
+                self.globais.coletar(declaracao)
+                blocos.append(declaracao)
+
+        try:
+            compartilhadas = set()
+            for declaracao in self.funcoes.values():
+                compartilhadas |= self.funcao(declaracao)
+            self.principal(blocos, compartilhadas)
+        except RecursionError:
+            raise ErroSemantico("Programa aninhado demais para compilar") from None
+        return '\n'.join(self.linhas) + '\n'
+
+    def funcao(self, declaracao: DeclaracaoFuncao) -> Set[str]:
+        """Emite o def da função; devolve as globais que ela usa"""
+        escopo = Escopo()
+        for tipo, nome in declaracao.parametros:
+            escopo.declarar(nome, tipo)
+        escopo.coletar(declaracao.corpo)
+        usadas = set()
+        corpo = []
+        self.bloco(declaracao.corpo, escopo, usadas, corpo, 1, dentro_funcao=True)
+        corpo.append(f"    return {VALORES_PADRAO.get(declaracao.tipo_retorno)!r}")
+
+        parametros = ', '.join('v_' + nome for _, nome in declaracao.parametros)
+        self.linhas.append(f"def f_{declaracao.nome}({parametros}):")
+        if usadas:
+            self.linhas.append(f"    global {', '.join('v_' + nome for nome in sorted(usadas))}")
+        locais = list(escopo.slots)[len(declaracao.parametros):]
+        if locais:
+            self.linhas.append(f"    {' = '.join('v_' + nome for nome in locais)} = None")
+        self.linhas.extend(corpo)
+        self.linhas.append('')
+        return usadas
+
+    def principal(self, blocos: List[list], compartilhadas: Set[str]):
+        corpo = []
+        for bloco in blocos:
+            self.bloco(bloco, self.globais, set(), corpo, 1, dentro_funcao=False)
+        self.linhas.append("def _principal():")
+        if compartilhadas:
+            self.linhas.append(f"    global {', '.join('v_' + nome for nome in sorted(compartilhadas))}")
+        if self.globais.slots:
+            self.linhas.append(f"    {' = '.join('v_' + nome for nome in self.globais.slots)} = None")
+        self.linhas.extend(corpo or ["    pass"])
+
+    def nome(self, nome: str, escopo: Escopo, usadas: Set[str]) -> str:
+        if nome in escopo.slots:
+            return 'v_' + nome
+        if nome in self.globais.slots:
+            usadas.add(nome)
+            return 'v_' + nome
+        raise ErroSemantico(f"Variável '{nome}' não declarada")
+
+    def bloco(self, comandos: list, escopo: Escopo, usadas: Set[str], saida: List[str],
+              nivel: int, dentro_funcao: bool):
+        recuo = '    ' * nivel
+        if not comandos:
+            saida.append(recuo + 'pass')
+        for comando in comandos:
+            if isinstance(comando, (DeclaracaoVariavel, Atribuicao)):
+                valor = comando.valor_inicial if isinstance(comando, DeclaracaoVariavel) else comando.valor
+                if valor is None:
+                    texto = repr(VALORES_PADRAO[comando.tipo])
+                else:
+                    texto = self.expressao(valor, escopo, usadas)
+                saida.append(f"{recuo}{self.nome(comando.nome, escopo, usadas)} = {texto}")
+            elif isinstance(comando, ComandoSe):
+                saida.append(f"{recuo}if {self.expressao(comando.condicao, escopo, usadas)}:")
+                self.bloco(comando.bloco_se, escopo, usadas, saida, nivel + 1, dentro_funcao)
+                if comando.bloco_senao:
+                    saida.append(recuo + 'else:')
+                    self.bloco(comando.bloco_senao, escopo, usadas, saida, nivel + 1, dentro_funcao)
+            elif isinstance(comando, tuple) and comando[0] == 'ENQUANTO':
+                _, condicao, corpo = comando
+                saida.append(f"{recuo}while {self.expressao(condicao, escopo, usadas)}:")
+                self.bloco(corpo, escopo, usadas, saida, nivel + 1, dentro_funcao)
+            elif isinstance(comando, tuple) and comando[0] == 'PARA':
+                _, inicial, condicao, passo, corpo = comando
+                self.bloco([inicial], escopo, usadas, saida, nivel, dentro_funcao)
+                saida.append(f"{recuo}while {self.expressao(condicao, escopo, usadas)}:")
+                self.bloco(corpo + [passo], escopo, usadas, saida, nivel + 1, dentro_funcao)
+            elif isinstance(comando, ComandoEscreva):
+                saida.append(f"{recuo}_escreva({self.expressao(comando.expressao, escopo, usadas)})")
+            elif isinstance(comando, ComandoLeia):
+                nome = self.nome(comando.variavel, escopo, usadas)
+                tipo = (escopo if comando.variavel in escopo.slots else self.globais).tipos[comando.variavel]
+                saida.append(f"{recuo}{nome} = _leia({tipo!r}, {comando.variavel!r})")
+            elif isinstance(comando, ChamadaFuncao):
+                saida.append(recuo + self.expressao(comando, escopo, usadas))
+            elif isinstance(comando, Retorne):
+                if not dentro_funcao or comando.valor is None:
+                    saida.append(recuo + 'return None')
+                else:
+                    saida.append(f"{recuo}return {self.expressao(comando.valor, escopo, usadas)}")
+            else:
+                raise ErroSemantico(f"Comando não suportado: {comando!r}")
+
+    def expressao(self, no: No, escopo: Escopo, usadas: Set[str]) -> str:
+        if isinstance(no, (Numero, String, Booleano)):
+            return _literal(no.valor)
+        if isinstance(no, Identificador):
+            return self.nome(no.nome, escopo, usadas)
+        if isinstance(no, ExpressaoBinaria):
+            esquerda = self.expressao(no.esquerda, escopo, usadas)
+            direita = self.expressao(no.direita, escopo, usadas)
+            if no.operador == '/':
+                return f"_dividir({esquerda}, {direita})"
+            return f"({esquerda} {no.operador} {direita})"
+        if isinstance(no, ExpressaoUnaria):
+            return f"(-{self.expressao(no.operando, escopo, usadas)})"
+        if isinstance(no, ChamadaFuncao):
+            declaracao = self.funcoes.get(no.nome)
+            if declaracao is None:
+                raise ErroSemantico(f"Função '{no.nome}' não declarada")
+            if len(no.argumentos) != len(declaracao.parametros):
+                raise ErroSemantico(f"Função '{no.nome}' espera {len(declaracao.parametros)} "
+                                    f"argumento(s), recebeu {len(no.argumentos)}")
+            argumentos = ', '.join(self.expressao(a, escopo, usadas) for a in no.argumentos)
+            return f"f_{no.nome}({argumentos})"
+        raise ErroSemantico(f"Expressão não suportada: {no!r}")
+
+def transpilar(programa: Programa) -> str:
+    """Código-fonte Python de programa (ver Transpilador)"""
+    return Transpilador().transpilar(programa)
+
+def compilar_python(programa: Programa, nome_arquivo: str = '<transpilado>') -> CodeType:
+    """Transpila e compila com compile(); erros de compilação viram ErroSemantico"""
+    fonte = transpilar(programa)
+    try:
+        return compile(fonte, nome_arquivo, 'exec')
+    except (SyntaxError, RecursionError, MemoryError) as e:
+        raise ErroSemantico(f"Programa não pôde ser compilado para Python: {e}") from None
+
+class ProgramaPython:
+    """Código transpilado e compilado, pronto para ser executado várias vezes"""
+
+    def __init__(self, codigo: CodeType):
+        self.codigo = codigo
+
+    def executar(self, saida: Optional[TextIO] = None, entrada: Optional[TextIO] = None) -> dict:
+        """Executa o programa; devolve o namespace do módulo gerado"""
+        saida = saida if saida is not None else sys.stdout
+        entrada = entrada if entrada is not None else sys.stdin
+        escrever = saida.write
+
+        def escreva(valor):
+            escrever(formatar_valor(valor) + '\n')
+
+        def leia(tipo, nome):
+            linha = entrada.readline()
+            if not linha:
+                raise ErroExecucao(f"Fim da entrada ao ler '{nome}'")
+            return converter_entrada(linha, tipo)
+
+        namespace = {'_dividir': dividir, '_escreva': escreva, '_leia': leia}
+        try:
+            exec(self.codigo, namespace)
+            with limite_recursao():
+                namespace['_principal']()
+        except RecursionError:
+            raise ErroExecucao("Recursão profunda demais") from None
+        except TypeError as e:
+            raise ErroExecucao(f"Operação inválida: {e}") from None
+        except NameError as e:  # não deveria acontecer: o transpilador resolve todos os nomes
+            raise ErroExecucao(f"Nome indefinido no código gerado: {e}") from None
+        return namespace
+
+_versao_transpilador: Optional[str] = None
+
+def versao_transpilador() -> str:
+    """Hash da versão do compilador (ver cache_ast.versao_compilador) e do código
+    do transpilador e do executor, cujos valores padrão entram no código gerado"""
+    global _versao_transpilador
+    if _versao_transpilador is None:
+        hash_ = hashlib.sha256(f"{VERSAO_TRANSPILADOR}\0{versao_compilador()}".encode())
+        hash_modulos(hash_, (sys.modules[__name__], modulo_executor))
+        _versao_transpilador = hash_.hexdigest()
+    return _versao_transpilador
+
+class CacheTranspilacao(CacheDisco):
+    """Cache de objetos de código por hash do código-fonte da linguagem.
+
+    Em memória guarda os maximo mais recentes (LRU); em disco, cada código
+    fica num arquivo marshal cujo nome inclui a tag da versão do Python, já
+    que o formato do marshal muda entre versões, e os arquivos somam no
+    máximo maximo_disco bytes (ver cache_ast.CacheDisco). A chave inclui
+    versao_transpilador(), o que invalida o cache quando muda a gramática,
+    o frontend ou a tradução. Um acerto pula o léxico, o SLR, a transpilação
+    e o compile().
+    """
+    prefixo = 'transpilado-'
+
+    def __init__(self, diretorio: Optional[str] = None, maximo: int = 256,
+                 maximo_disco: int = TAMANHO_CACHE_TRANSPILACAO):
+        super().__init__(diretorio_cache_usuario('transpilado') if diretorio is None else diretorio, maximo_disco)
+        self.maximo = maximo
+        self.memoria: 'OrderedDict[str, CodeType]' = OrderedDict()
+        self.acertos_memoria = 0
+        self.acertos_disco = 0
+        self.faltas = 0
+
+    @staticmethod
+    def chave(codigo_fonte: str) -> str:
+        conteudo = f"{versao_transpilador()}\0{codigo_fonte}"
+        return hashlib.sha256(conteudo.encode('utf-8', 'surrogatepass')).hexdigest()
+
+    def caminho(self, chave: str) -> Optional[str]:
+        if not self.diretorio:
+            return None
+        return os.path.join(self.diretorio, f'transpilado-{chave[:32]}.{sys.implementation.cache_tag}.bin')
+
+    def obter(self, codigo_fonte: str) -> ProgramaPython:
+        """ProgramaPython de codigo_fonte, compilando só se não estiver em cache.
+
+        Erros léxicos ou sintáticos viram ErroSemantico com o primeiro erro.
+        """
+        chave = self.chave(codigo_fonte)
+        codigo = self.memoria.get(chave)
+        if codigo is not None:
+            self.memoria.move_to_end(chave)
+            self.acertos_memoria += 1
+            return ProgramaPython(codigo)
+
+        caminho = self.caminho(chave)
+        codigo = self._ler(caminho, chave) if caminho else None
+        if codigo is not None:
+            self.acertos_disco += 1
+            self._usar(caminho)
+        else:
+            self.faltas += 1
+            resultado = compilar_codigo(codigo_fonte)
+            if not resultado.ok:
+                raise ErroSemantico(resultado.erros[0])
+            codigo = compilar_python(resultado.ast)
+            if caminho:
+                self._gravar(caminho, chave, codigo)
+
+        self.memoria[chave] = codigo
+        if len(self.memoria) > self.maximo:
+            self.memoria.popitem(last=False)
+        return ProgramaPython(codigo)
+
+    @staticmethod
+    def _ler(caminho: str, chave: str) -> Optional[CodeType]:
+        """Código do disco; None se ausente, corrompido ou de outra chave"""
+        try:
+            with open(caminho, 'rb') as arquivo:
+                dados = arquivo.read()
+        except OSError:
+            return None
+        cabecalho = MAGICO + chave.encode('ascii')
+        if not dados.startswith(cabecalho):
+            return None
+        try:
+            codigo = marshal.loads(dados[len(cabecalho):])
+        except (EOFError, ValueError, TypeError):
+            return None
+        return codigo if isinstance(codigo, CodeType) else None
+
+    def _gravar(self, caminho: str, chave: str, codigo: CodeType):
+        self._gravar_arquivo(caminho, MAGICO + chave.encode('ascii') + marshal.dumps(codigo))
+
+# Cache padrão do processo
+cache = CacheTranspilacao()
+
+def executar_python(codigo_fonte: str, saida: Optional[TextIO] = None,
+                    entrada: Optional[TextIO] = None) -> dict:
+    """Executa codigo_fonte pelo caminho transpilado, usando o cache padrão"""
+    return cache.obter(codigo_fonte).executar(saida, entrada)
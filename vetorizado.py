@@ -0,0 +1,433 @@
+import io
+import operator
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+from ast_nodes import *
+from executor import VALORES_PADRAO, ErroExecucao, Escopo, Executor, converter_entrada, dividir
+
+try:
+    import numpy as np
+except ImportError:  # todo lote é executado linha a linha
+    np = None
+
+# Maior inteiro que cabe em int64 sem estouro; acima disso as contas vão
+# para arrays de objetos (inteiros do Python, sem limite)
+LIMITE_INT64 = 2 ** 63 - 1
+
+ARITMETICOS = {'+': operator.add, '-': operator.sub, '*': operator.mul}
+COMPARACOES = {'>': operator.gt, '<': operator.lt, '>=': operator.ge, '<=': operator.le,
+               '==': operator.eq, '!=': operator.ne}
+
+class _NaoVetorizavel(Exception):
+    """O lote precisa ser refeito linha a linha (operação inválida em alguma linha...)"""
+
+@dataclass
+class ResultadoLote:
+    """Saída de um programa executado sobre um lote de registros.
+
+    saidas[k][i] é o k-ésimo valor escrito pela linha i e presentes[k][i]
+    diz se a linha i chegou a escrevê-lo (onde é falso o valor é indefinido).
+    Com NumPy as colunas são arrays; sem ele, listas.
+    """
+    linhas: int
+    saidas: list = field(default_factory=list)
+    presentes: list = field(default_factory=list)
+    erros: Dict[int, str] = field(default_factory=dict)  # linha -> ErroExecucao que a interrompeu
+    vetorizado: bool = True
+    motivo: Optional[str] = None  # por que foi executado linha a linha
+
+    def linha(self, i: int) -> list:
+        """Valores escritos pela linha i, em ordem"""
+        return [saida[i] for saida, presente in zip(self.saidas, self.presentes) if presente[i]]
+
+def _texto(valor) -> str:
+    """Campo de entrada como a linha que leia receberia"""
+    if valor is True:
+        return 'verdadeiro'
+    if valor is False:
+        return 'falso'
+    return str(valor)
+
+def motivo_sequencial(programa: Programa) -> Optional[str]:
+    """Por que programa não pode ser vetorizado (laços, recursão), ou None"""
+    chamadas: Dict[str, set] = {}
+    for declaracao in programa.declaracoes:
+        corpo = declaracao.corpo if isinstance(declaracao, DeclaracaoFuncao) else declaracao
+        nomes = set()
+        for no in percorrer(corpo):
+            if isinstance(no, tuple):
+                return f"laço {no[0].lower()}"
+            if isinstance(no, ChamadaFuncao):
+                nomes.add(no.nome)
+        if isinstance(declaracao, DeclaracaoFuncao):
+            chamadas[declaracao.nome] = nomes
+
+    # Recursão: ciclo no grafo de chamadas
+    visitadas = set()
+    for inicio in chamadas:
+        pendentes = [(inicio, iter(chamadas[inicio]))]
+        no_caminho = {inicio}
+        while pendentes:
+            nome, proximas = pendentes[-1]
+            chamada = next(proximas, None)
+            if chamada is None:
+                pendentes.pop()
+                no_caminho.discard(nome)
+                visitadas.add(nome)
+            elif chamada in no_caminho:
+                return f"recursão em '{chamada}'"
+            elif chamada in chamadas and chamada not in visitadas:
+                no_caminho.add(chamada)
+                pendentes.append((chamada, iter(chamadas[chamada])))
+    return None
+
+class _ExecutorLinha(Executor):
+    """Executor que guarda os valores escritos em vez de formatá-los"""
+
+    def __init__(self, programa: Programa):
+        self.valores: list = []
+        super().__init__(programa)
+
+    def compilar_escreva(self, comando: ComandoEscreva, escopo: Escopo):
+        expressao = self.compilar_expressao(comando.expressao, escopo)
+
+        def escreva(quadro):
+            self.valores.append(expressao(quadro))
+        return escreva
+
+def _vetor(valores: list):
+    """Array com o tipo natural dos valores; cadeias e misturas ficam como objetos"""
+    tipos = set(map(type, valores))
+    if len(tipos) == 1 and tipos <= {int, float, bool}:
+        return np.array(valores)
+    vetor = np.empty(len(valores), dtype=object)
+    vetor[:] = valores
+    return vetor
+
+def _array(valor):
+    """Resultado de uma operação como array; objetos do Python não viram '<U'"""
+    if isinstance(valor, np.ndarray):
+        return valor
+    if isinstance(valor, np.generic):
+        return np.asarray(valor)
+    return np.array(valor, dtype=object)
+
+def _constante(valor):
+    return np.array(valor, dtype=object) if isinstance(valor, str) or valor is None else np.asarray(valor)
+
+def _magnitude(vetor) -> int:
+    if vetor.size == 0:
+        return 0
+    return max(abs(int(vetor.max())), abs(int(vetor.min())))
+
+def _inteiros(*vetores) -> bool:
+    return all(vetor.dtype.kind in 'iu' for vetor in vetores)
+
+class _Quadro:
+    __slots__ = ('escopo', 'variaveis', 'retorno')
+
+    def __init__(self, escopo: Escopo, retorno=None):
+        self.escopo = escopo
+        self.variaveis: Dict[str, object] = {}
+        self.retorno = retorno
+
+class _Lote:
+    """Uma execução vetorizada: cada variável é uma coluna com um valor por linha.
+
+    Os comandos recebem a máscara das linhas que os executam e devolvem a das
+    que seguem adiante (sem retorne nem erro); se divide a máscara entre os
+    dois ramos e atribuições dentro deles mesclam com np.where. Linhas com
+    ErroExecucao saem do lote e ficam em erros.
+    """
+
+    def __init__(self, executor: _ExecutorLinha, campos: list, linhas: int):
+        self.executor = executor
+        self.campos = campos
+        self.n = linhas
+        self.falhas = np.zeros(linhas, dtype=bool)
+        self.erros: Dict[int, str] = {}
+        self.lidos = np.zeros(linhas, dtype=np.int64)
+        self.escritos = np.zeros(linhas, dtype=np.int64)
+        self.saidas: list = []
+        self.presentes: list = []
+        self.convertidos: Dict[tuple, tuple] = {}
+        self.globais = _Quadro(executor.globais_escopo)
+
+    def executar(self, blocos: list):
+        ativas = np.ones(self.n, dtype=bool)
+        for bloco in blocos:
+            ativas = self.bloco(bloco, ativas, self.globais)
+
+    def falhar(self, linhas, mensagem: str):
+        novas = linhas & ~self.falhas
+        for i in np.flatnonzero(novas).tolist():
+            self.erros[i] = mensagem
+        self.falhas |= novas
+
+    # ---------- variáveis ----------
+
+    def quadro_de(self, nome: str, quadro: _Quadro) -> _Quadro:
+        return quadro if nome in quadro.escopo.slots else self.globais
+
+    def ler_variavel(self, nome: str, quadro: _Quadro):
+        quadro = self.quadro_de(nome, quadro)
+        valor = quadro.variaveis.get(nome)
+        return valor if valor is not None else _constante(None)
+
+    def atribuir(self, nome: str, valor, linhas, quadro: _Quadro):
+        quadro = self.quadro_de(nome, quadro)
+        quadro.variaveis[nome] = self.mesclar(linhas, valor, quadro.variaveis.get(nome))
+
+    def mesclar(self, linhas, novo, antigo):
+        """novo nas linhas marcadas, antigo nas demais, sem trocar o tipo de nenhuma linha"""
+        if antigo is None:
+            antigo = _constante(None)
+        if (linhas | self.falhas).all():  # linhas com erro não voltam a executar
+            return novo
+        if novo.dtype != antigo.dtype:
+            # int e float na mesma coluna: objetos, para cada linha manter seu tipo
+            novo, antigo = novo.astype(object), antigo.astype(object)
+        return np.where(linhas, novo, antigo)
+
+    # ---------- comandos ----------
+
+    def bloco(self, comandos: list, ativas, quadro: _Quadro):
+        for comando in comandos:
+            if not ativas.any():
+                break
+            ativas = self.comando(comando, ativas, quadro) & ~self.falhas
+        return ativas
+
+    def comando(self, comando, ativas, quadro: _Quadro):
+        if isinstance(comando, DeclaracaoVariavel):
+            if comando.valor_inicial is None:
+                valor = _constante(VALORES_PADRAO[comando.tipo])
+            else:
+                valor = self.expressao(comando.valor_inicial, ativas, quadro)
+            self.atribuir(comando.nome, valor, ativas & ~self.falhas, quadro)
+        elif isinstance(comando, Atribuicao):
+            valor = self.expressao(comando.valor, ativas, quadro)
+            self.atribuir(comando.nome, valor, ativas & ~self.falhas, quadro)
+        elif isinstance(comando, ComandoSe):
+            condicao = self.expressao(comando.condicao, ativas, quadro).astype(bool)
+            ativas = ativas & ~self.falhas
+            entao = self.bloco(comando.bloco_se, ativas & condicao, quadro)
+            senao = ativas & ~condicao
+            if comando.bloco_senao:
+                senao = self.bloco(comando.bloco_senao, senao, quadro)
+            return entao | senao
+        elif isinstance(comando, ComandoEscreva):
+            valor = self.expressao(comando.expressao, ativas, quadro)
+            self.escrever(valor, ativas & ~self.falhas)
+        elif isinstance(comando, ComandoLeia):
+            self.ler(comando.variavel, ativas, quadro)
+        elif isinstance(comando, ChamadaFuncao):
+            self.expressao(comando, ativas, quadro)
+        elif isinstance(comando, Retorne):
+            valor = _constante(None) if comando.valor is None else self.expressao(comando.valor, ativas, quadro)
+            if quadro.retorno is not None:
+                quadro.retorno = self.mesclar(ativas & ~self.falhas, valor, quadro.retorno)
+            return np.zeros(self.n, dtype=bool)
+        else:
+            raise _NaoVetorizavel(f"comando {comando!r}")
+        return ativas
+
+    def escrever(self, valor, linhas):
+        valor = np.broadcast_to(valor, (self.n,))
+        contagens = self.escritos[linhas]
+        # Linhas que passaram por ramos diferentes podem estar em colunas diferentes
+        for k in np.unique(contagens).tolist():
+            grupo = linhas.copy()
+            grupo[linhas] = contagens == k
+            if k == len(self.saidas):
+                if grupo.all():
+                    self.saidas.append(np.array(valor))
+                    self.presentes.append(np.ones(self.n, dtype=bool))
+                    continue
+                self.saidas.append(np.zeros(self.n, dtype=valor.dtype) if valor.dtype != object
+                                   else np.empty(self.n, dtype=object))
+                self.presentes.append(np.zeros(self.n, dtype=bool))
+            coluna = self.saidas[k]
+            valores = valor
+            if coluna.dtype != valor.dtype:
+                coluna = self.saidas[k] = coluna.astype(object)
+                valores = valor.astype(object)
+            coluna[grupo] = valores[grupo]
+            self.presentes[k][grupo] = True
+        self.escritos[linhas] += 1
+
+    def ler(self, nome: str, ativas, quadro: _Quadro):
+        tipo = self.quadro_de(nome, quadro).escopo.tipos[nome]
+        contagens = self.lidos[ativas]
+        for k in np.unique(contagens).tolist():
+            grupo = ativas.copy()
+            grupo[ativas] = contagens == k
+            if k >= len(self.campos):
+                self.falhar(grupo, f"Fim da entrada ao ler '{nome}'")
+                continue
+            valores, invalidas = self.converter(k, tipo)
+            for i, mensagem in invalidas.items():
+                if grupo[i] and not self.falhas[i]:
+                    self.erros[i] = mensagem
+                    self.falhas[i] = True
+            self.atribuir(nome, valores, grupo & ~self.falhas, quadro)
+        self.lidos[ativas] += 1
+
+    def converter(self, k: int, tipo: str) -> tuple:
+        """(valores do campo k convertidos para tipo, {linha: erro}), calculado uma vez"""
+        chave = (k, tipo)
+        if chave not in self.convertidos:
+            coluna = self.campos[k]
+            tipo_coluna = coluna.dtype
+            if tipo == 'inteiro' and (tipo_coluna.kind == 'i' or (tipo_coluna.kind == 'u' and tipo_coluna.itemsize < 8)):
+                resultado = coluna.astype(np.int64), {}
+            elif tipo == 'flutuante' and tipo_coluna.kind in 'iuf':
+                resultado = coluna.astype(np.float64), {}
+            elif tipo == 'logico' and tipo_coluna.kind == 'b':
+                resultado = coluna, {}
+            else:
+                valores, invalidas = [], {}
+                padrao = VALORES_PADRAO[tipo]
+                for i, campo in enumerate(coluna.tolist()):
+                    try:
+                        valores.append(converter_entrada(_texto(campo), tipo))
+                    except ErroExecucao as e:
+                        valores.append(padrao)
+                        invalidas[i] = str(e)
+                resultado = _vetor(valores), invalidas
+            self.convertidos[chave] = resultado
+        return self.convertidos[chave]
+
+    # ---------- expressões ----------
+
+    def expressao(self, no: No, ativas, quadro: _Quadro):
+        if isinstance(no, (Numero, String, Booleano)):
+            return _constante(no.valor)
+        if isinstance(no, Identificador):
+            return self.ler_variavel(no.nome, quadro)
+        if isinstance(no, ExpressaoBinaria):
+            esquerda = self.expressao(no.esquerda, ativas, quadro)
+            direita = self.expressao(no.direita, ativas, quadro)
+            if no.operador == '/':
+                return self.dividir(esquerda, direita, ativas)
+            if no.operador in COMPARACOES:
+                return _array(COMPARACOES[no.operador](esquerda, direita)).astype(bool)
+            return self.aritmetica(ARITMETICOS[no.operador], esquerda, direita)
+        if isinstance(no, ExpressaoUnaria):
+            operando = self.expressao(no.operando, ativas, quadro)
+            if operando.dtype == bool:
+                operando = operando.astype(np.int64)
+            if _inteiros(operando) and _magnitude(operando) > LIMITE_INT64:
+                operando = operando.astype(object)
+            return _array(-operando)
+        if isinstance(no, ChamadaFuncao):
+            return self.chamar(no, ativas, quadro)
+        raise _NaoVetorizavel(f"expressão {no!r}")
+
+    def aritmetica(self, operacao, a, b):
+        # True + True é 2 na linguagem, não True como em NumPy
+        if a.dtype == bool:
+            a = a.astype(np.int64)
+        if b.dtype == bool:
+            b = b.astype(np.int64)
+        if _inteiros(a, b):
+            limite = _magnitude(a) * _magnitude(b) if operacao is operator.mul else _magnitude(a) + _magnitude(b)
+            if limite > LIMITE_INT64:
+                a, b = a.astype(object), b.astype(object)
+        elif a.dtype == object or b.dtype == object:
+            a, b = a.astype(object), b.astype(object)
+        return _array(operacao(a, b))
+
+    def dividir(self, a, b, ativas):
+        zero = _array(b == 0).astype(bool)
+        self.falhar(ativas & zero, "Divisão por zero")
+        if a.dtype == object or b.dtype == object:
+            dividir_linha = np.frompyfunc(lambda x, y: None if y == 0 else dividir(x, y), 2, 1)
+            return _array(dividir_linha(a, b))
+        seguro = np.where(zero, 1, b)
+        if _inteiros(a, b):
+            if _magnitude(a) == LIMITE_INT64 + 1:
+                return self.dividir(a.astype(object), b.astype(object), ativas)
+            quociente = a // seguro
+            return quociente + ((quociente < 0) & (quociente * seguro != a))
+        return _array(a.astype(np.float64) / seguro)
+
+    def chamar(self, no: ChamadaFuncao, ativas, quadro: _Quadro):
+        funcao = self.executor.funcoes[no.nome]
+        argumentos = [self.expressao(argumento, ativas, quadro) for argumento in no.argumentos]
+        chamada = _Quadro(funcao.escopo, retorno=_constante(funcao.padrao))
+        for (_, nome), valor in zip(funcao.declaracao.parametros, argumentos):
+            chamada.variaveis[nome] = valor
+        self.bloco(funcao.declaracao.corpo, ativas & ~self.falhas, chamada)
+        return chamada.retorno
+
+class ExecutorLote:
+    """Executa um programa sobre um lote de registros, um campo por leia.
+
+    Cada linha do lote é uma execução independente do programa: o k-ésimo
+    leia de uma linha recebe o seu k-ésimo campo. Programas sem laços nem
+    recursão rodam vetorizados em colunas NumPy (inteiros em int64, que
+    passam a objetos quando a conta pode estourar); os demais, ou lotes em
+    que alguma linha faz uma operação inválida, rodam linha a linha no
+    executor.Executor, com o mesmo resultado.
+    """
+
+    def __init__(self, programa: Programa):
+        self.executor = _ExecutorLinha(programa)  # valida o programa (ErroSemantico)
+        self.blocos = [declaracao for declaracao in programa.declaracoes
+                       if not isinstance(declaracao, DeclaracaoFuncao)]
+        self.motivo = motivo_sequencial(programa) if np is not None else "NumPy não está instalado"
+
+    def executar(self, campos: Sequence[Sequence]) -> ResultadoLote:
+        """Executa o programa para cada linha de campos (uma coluna por leia)"""
+        tamanhos = {len(campo) for campo in campos}
+        if len(tamanhos) > 1:
+            raise ValueError(f"Campos com tamanhos diferentes: {sorted(tamanhos)}")
+        linhas = tamanhos.pop() if tamanhos else 0
+
+        motivo = self.motivo
+        if motivo is None:
+            # Colunas numéricas ficam como estão; o resto vira array de objetos
+            colunas = [campo if isinstance(campo, np.ndarray) and campo.dtype.kind in 'biuf'
+                       else _vetor(campo.tolist() if isinstance(campo, np.ndarray) else list(campo))
+                       for campo in campos]
+            lote = _Lote(self.executor, colunas, linhas)
+            try:
+                with np.errstate(all='ignore'):  # estouro de float vira inf, como no Python
+                    lote.executar(self.blocos)
+            except (_NaoVetorizavel, TypeError, OverflowError, RecursionError) as e:
+                motivo = f"operação não vetorizável: {e}"
+            else:
+                return ResultadoLote(linhas, lote.saidas, lote.presentes, lote.erros)
+        return self.executar_linhas(campos, linhas, motivo)
+
+    def executar_linhas(self, campos: Sequence[Sequence], linhas: int, motivo: Optional[str]) -> ResultadoLote:
+        """Uma execução do executor por linha"""
+        campos = [campo.tolist() if np is not None and isinstance(campo, np.ndarray) else list(campo)
+                  for campo in campos]
+        resultado = ResultadoLote(linhas, vetorizado=False, motivo=motivo)
+        escritos: List[list] = []
+        executor = self.executor
+        for i in range(linhas):
+            executor.valores = []
+            entrada = io.StringIO(''.join(_texto(campo[i]) + '\n' for campo in campos))
+            try:
+                executor.executar(entrada=entrada)
+            except ErroExecucao as e:
+                resultado.erros[i] = str(e)
+            escritos.append(executor.valores)
+
+        for k in range(max(map(len, escritos), default=0)):
+            presentes = [k < len(valores) for valores in escritos]
+            coluna = [valores[k] if k < len(valores) else None for valores in escritos]
+            if np is not None:
+                coluna = _vetor(coluna)
+                presentes = np.array(presentes, dtype=bool)
+            resultado.saidas.append(coluna)
+            resultado.presentes.append(presentes)
+        return resultado
+
+def executar_lote(programa: Programa, campos: Sequence[Sequence]) -> ResultadoLote:
+    """Executa programa sobre cada linha de campos; veja ExecutorLote"""
+    return ExecutorLote(programa).executar(campos)